@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+렌더링·MIME 구성 핫패스 벤치마크
+
+markdown_to_html, generate_terms_section, create_email_content, optimize_html과
+EmailSender의 MIME 메시지 구성(_build_message)·직렬화(as_bytes)와
+사전 인코딩 템플릿의 수신자별 조립(MessageTemplate.render)을
+data/curriculum.json 전체 일차와 10배로 늘린 합성 커리큘럼에 대해 실행하고,
+호출당 시간과 메모리 할당(tracemalloc 최대 사용량)을 측정합니다.
+결과는 저장된 기준값(benchmarks/baseline.json)과 비교해 허용 범위를
+넘으면 종료 코드 1로 실패합니다.
+
+    python benchmarks/bench_hotpaths.py            # 측정 후 기준값과 비교
+    python benchmarks/bench_hotpaths.py --update   # 기준값 갱신
+"""
+
+import argparse
+import copy
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from curriculum import Curriculum, get_topic_for_day, load_curriculum  # noqa: E402
+from email_sender import EmailSender  # noqa: E402
+from html_optimizer import optimize_html  # noqa: E402
+from main import create_email_content, generate_terms_section, markdown_to_html  # noqa: E402
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+
+def synthetic_curriculum(curriculum: dict, factor: int = 10) -> Curriculum:
+    """모듈·토픽을 factor번 반복해 일차를 이어 붙인 합성 커리큘럼"""
+    program_info = dict(curriculum["program_info"])
+    max_days = program_info.get("duration_days", 90)
+    program_info["duration_days"] = max_days * factor
+
+    modules = []
+    for k in range(factor):
+        for module in curriculum["modules"]:
+            module = copy.deepcopy(module)
+            module["module_id"] = len(modules) + 1
+            module["start_day"] = module.get("start_day", 1) + k * max_days
+            for topic in module.get("topics", []):
+                topic["day"] += k * max_days
+            modules.append(module)
+    return Curriculum({"program_info": program_info, "modules": modules})
+
+
+def build_cases(curriculum: dict, label: str) -> dict:
+    """벤치마크 이름 → 인자 없는 호출 목록 (커리큘럼의 모든 일차)"""
+    sender = EmailSender("bench@example.com", "unused")
+    max_days = curriculum["program_info"].get("duration_days", 90)
+    topics = [(day, get_topic_for_day(curriculum, day)) for day in range(1, max_days + 1)]
+    topics = [(day, topic_data) for day, topic_data in topics if topic_data]
+
+    markdown, terms, pages, optimized, builds, messages, renders = [], [], [], [], [], [], []
+    for day, topic_data in topics:
+        topic = topic_data["topic"]
+        for text in (topic.get("detailed_explanation"), topic.get("exercises")):
+            if text:
+                markdown.append(lambda text=text: markdown_to_html(text))
+        terms.append(lambda t=topic.get("technical_terms", {}): generate_terms_section(t))
+        pages.append(lambda day=day, topic_data=topic_data:
+                     create_email_content(curriculum, day, topic_data))
+
+        html = create_email_content(curriculum, day, topic_data)
+        optimized.append(lambda html=html: optimize_html(html))
+        subject = f"[SWRO 학습] Day {day}: {topic['title']}"
+        builds.append(lambda subject=subject, html=html:
+                      sender._build_message("reader@example.com", subject, html))
+        message = sender._build_message("reader@example.com", subject, html)
+        messages.append(message.as_bytes)
+        template = sender.build_template(subject, html)
+        renders.append(lambda template=template: template.render("reader@example.com"))
+
+    return {
+        f"markdown_to_html{label}": markdown,
+        f"generate_terms_section{label}": terms,
+        f"create_email_content{label}": pages,
+        f"optimize_html{label}": optimized,
+        f"mime_build{label}": builds,
+        f"mime_serialize{label}": messages,
+        f"mime_template_render{label}": renders,
+    }
+
+
+def measure(calls: list, repeat: int) -> dict:
+    """
+    호출 목록 전체를 repeat번 실행해 호출당 시간·할당량 측정
+
+    Returns:
+        dict: us_per_call (반복 중 최솟값 기준), kib_per_call (호출당 tracemalloc 최대 사용량 평균)
+    """
+    def run_all():
+        for call in calls:
+            call()
+
+    # 짧은 호출이 타이머 잡음에 묻히지 않도록 한 번 측정이 0.2초 이상 되게 반복 수 결정
+    timer = timeit.Timer(run_all)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(number=number, repeat=repeat)) / number
+
+    tracemalloc.start()
+    peaks = 0
+    for call in calls:
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        call()
+        peaks += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+
+    return {
+        "calls": len(calls),
+        "us_per_call": round(best / len(calls) * 1e6, 2),
+        "kib_per_call": round(peaks / len(calls) / 1024, 2),
+    }
+
+
+def compare(results: dict, baseline: dict, time_tolerance: float, alloc_tolerance: float) -> list:
+    """기준값 대비 허용 범위를 넘은 항목 목록"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for key, tolerance in (("us_per_call", time_tolerance), ("kib_per_call", alloc_tolerance)):
+            if base[key] and result[key] > base[key] * (1 + tolerance):
+                regressions.append(
+                    f"{name} {key}: {base[key]} → {result[key]} (+{(result[key] / base[key] - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="렌더링·MIME 핫패스 벤치마크")
+    parser.add_argument("--update", action="store_true", help="측정 결과를 기준값으로 저장")
+    parser.add_argument("--repeat", type=int, default=5, help="시간 측정 반복 횟수")
+    parser.add_argument("--scale", type=int, default=10, help="합성 커리큘럼 배율")
+    parser.add_argument("--time-tolerance", type=float, default=0.30, help="허용 시간 증가율")
+    parser.add_argument("--alloc-tolerance", type=float, default=0.10, help="허용 할당량 증가율")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="기준값 파일")
+    args = parser.parse_args(argv)
+
+    curriculum = load_curriculum(use_snapshot=False)
+    cases = build_cases(curriculum, "")
+    if args.scale > 1:
+        cases.update(build_cases(synthetic_curriculum(curriculum, args.scale), f"@{args.scale}x"))
+
+    results = {}
+    print(f"{'benchmark':<32}{'calls':>7}{'µs/call':>11}{'KiB/call':>11}")
+    for name, calls in cases.items():
+        results[name] = measure(calls, args.repeat)
+        r = results[name]
+        print(f"{name:<32}{r['calls']:>7}{r['us_per_call']:>11.2f}{r['kib_per_call']:>11.2f}")
+
+    baseline_path = Path(args.baseline)
+    if args.update:
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "results": results}, f, indent=2)
+            f.write("\n")
+        print(f"💾 기준값 저장: {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print("⚠️ 기준값이 없습니다. --update로 먼저 저장하세요.")
+        return 0
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("python") != platform.python_version():
+        print(f"⚠️ 기준값 Python {baseline.get('python')} / 현재 {platform.python_version()}")
+
+    regressions = compare(results, baseline["results"], args.time_tolerance, args.alloc_tolerance)
+    if regressions:
+        print("❌ 성능 회귀:")
+        for line in regressions:
+            print(f"   {line}")
+        return 1
+    print("✅ 기준값 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+템플릿 렌더링 마이크로 벤치마크
+
+페이지 골격·스타일시트를 매번 f-string으로 보간하던 이전 구현과
+컴파일된 템플릿(templates.PAGE)을 쓰는 현재 create_email_content의
+호출당 렌더링 시간을 전체 커리큘럼 일차에 대해 비교합니다.
+
+    python benchmarks/bench_template.py
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from main import (create_email_content, generate_ai_section,  # noqa: E402
+                  generate_terms_section, get_topic_for_day, load_curriculum,
+                  markdown_to_html)
+
+
+def legacy_create_email_content(curriculum: dict, day: int, topic_data: dict,
+                         ai_content: dict = None) -> str:
+    """템플릿 계층 도입 이전의 f-string 구현 (비교 기준)"""
+    program_info = curriculum["program_info"]
+    max_days = program_info.get("duration_days", 90)
+
+    if not topic_data:
+        return f"<html><body><h1>Day {day} 콘텐츠 준비 중</h1></body></html>"
+
+    module = topic_data["module"]
+    topic = topic_data["topic"]
+    progress_percent = (day / max_days) * 100
+
+    # 확장 콘텐츠 섹션 생성
+    detailed_section = ""
+    if topic.get("detailed_explanation"):
+        detailed_section = f'''
+        <div class="section detailed">
+            <h2>📖 상세 학습 내용</h2>
+            <div class="detailed-content">
+                {markdown_to_html(topic["detailed_explanation"])}
+            </div>
+        </div>'''
+
+    exercises_section = ""
+    if topic.get("exercises"):
+        exercises_section = f'''
+        <div class="section exercises">
+            <h2>✏️ 연습 문제</h2>
+            <div class="exercises-content">
+                {markdown_to_html(topic["exercises"])}
+            </div>
+        </div>'''
+
+    quiz_section = ""
+    if topic.get("quiz"):
+        quiz_items = ""
+        for i, q in enumerate(topic["quiz"], 1):
+            if isinstance(q, dict):
+                quiz_items += f'''
+                <div class="quiz-item">
+                    <p><strong>Q{i}.</strong> {q.get("q", q.get("question", ""))}</p>
+                    <p class="quiz-answer">💡 정답: {q.get("a", q.get("answer", ""))}</p>
+                </div>'''
+        if quiz_items:
+            quiz_section = f'''
+            <div class="section quiz">
+                <h2>🧠 오늘의 퀴즈</h2>
+                {quiz_items}
+            </div>'''
+
+    html_content = f'''<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>SWRO 학습 Day {day}</title>
+    <style>
+        body {{ font-family: 'Malgun Gothic', 'Apple SD Gothic Neo', sans-serif; line-height: 1.9; color: #333; max-width: 900px; margin: 0 auto; padding: 15px; background: #f0f4f8; }}
+        .container {{ background: white; padding: 25px; border-radius: 12px; box-shadow: 0 4px 20px rgba(0,0,0,0.1); }}
+        .header {{ background: linear-gradient(135deg, #0d47a1 0%, #1976d2 100%); color: white; padding: 30px; border-radius: 12px; margin-bottom: 25px; }}
+        .header h1 {{ margin: 0 0 10px 0; font-size: 26px; }}
+        .header .meta {{ opacity: 0.9; font-size: 15px; }}
+        .level-badge {{ display: inline-block; background: rgba(255,255,255,0.25); padding: 6px 16px; border-radius: 20px; margin-top: 12px; font-size: 13px; }}
+        .module-info {{ background: #e3f2fd; padding: 18px; border-radius: 10px; margin-bottom: 25px; border-left: 5px solid #1976d2; font-size: 15px; }}
+        .section {{ margin-bottom: 30px; padding: 20px; background: #fafafa; border-radius: 10px; }}
+        .section h2 {{ color: #0d47a1; font-size: 20px; margin: 0 0 18px 0; padding-bottom: 12px; border-bottom: 2px solid #1976d2; }}
+        .section h3 {{ color: #1565c0; font-size: 17px; margin: 20px 0 12px 0; }}
+        .section h4 {{ color: #1976d2; font-size: 15px; margin: 15px 0 10px 0; }}
+        .key-points {{ background: #fff; padding: 18px 22px; border-radius: 8px; border: 1px solid #e0e0e0; }}
+        .key-points ul {{ margin: 0; padding-left: 22px; }}
+        .key-points li {{ margin-bottom: 10px; }}
+        .terms {{ display: grid; gap: 12px; }}
+        .term {{ background: #fff8e1; padding: 14px 18px; border-radius: 8px; border-left: 4px solid #ffc107; }}
+        .term strong {{ color: #f57c00; }}
+        .formula {{ background: #e8f5e9; padding: 18px; border-radius: 8px; font-family: 'Consolas', 'Monaco', monospace; white-space: pre-wrap; border-left: 4px solid #4caf50; font-size: 14px; overflow-x: auto; }}
+        .tip {{ background: #e1f5fe; padding: 18px; border-radius: 8px; border-left: 4px solid #03a9f4; }}
+        .detailed-content {{ background: #fff; padding: 20px; border-radius: 8px; border: 1px solid #e0e0e0; }}
+        .detailed-content h3 {{ color: #1565c0; border-bottom: 1px solid #e0e0e0; padding-bottom: 8px; }}
+        .detailed-content h4 {{ color: #1976d2; }}
+        .detailed-content pre {{ background: #263238; color: #aed581; padding: 15px; border-radius: 6px; overflow-x: auto; }}
+        .exercises-content {{ background: #fff3e0; padding: 20px; border-radius: 8px; }}
+        .quiz-item {{ background: #fff; padding: 15px; border-radius: 8px; margin-bottom: 12px; border: 1px solid #e0e0e0; }}
+        .ai-supplement {{ background: #f3e5f5; padding: 18px; border-radius: 8px; border-left: 4px solid #8e24aa; margin-bottom: 12px; }}
+        .quiz-answer {{ color: #2e7d32; font-weight: 500; margin-top: 8px; }}
+        .code-block {{ background: #263238; color: #aed581; padding: 12px; border-radius: 6px; display: block; margin: 10px 0; }}
+        code {{ background: #eceff1; padding: 2px 6px; border-radius: 4px; font-size: 13px; }}
+        .progress {{ margin-top: 25px; }}
+        .progress-bar {{ background: #e0e0e0; border-radius: 10px; height: 24px; overflow: hidden; }}
+        .progress-fill {{ background: linear-gradient(90deg, #4caf50, #8bc34a); height: 100%; display: flex; align-items: center; justify-content: center; color: white; font-size: 12px; font-weight: bold; }}
+        .footer {{ margin-top: 30px; padding-top: 20px; border-top: 1px solid #e0e0e0; text-align: center; color: #757575; font-size: 13px; }}
+        table {{ width: 100%; border-collapse: collapse; margin: 15px 0; }}
+        th, td {{ border: 1px solid #e0e0e0; padding: 10px; text-align: left; }}
+        th {{ background: #f5f5f5; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>{topic['title']}</h1>
+            <div class="meta">Day {day} / {max_days} | 3개월 전문가 속성 과정</div>
+            <span class="level-badge">📚 {module['level']}</span>
+        </div>
+
+        <div class="module-info">
+            <strong>모듈 {module['module_id']}:</strong> {module['title']} ({module['duration_days']}일)
+        </div>
+
+        <div class="section">
+            <h2>🎯 오늘의 학습 목표</h2>
+            <p style="font-size: 16px; color: #424242;">{topic['content']}</p>
+        </div>
+
+        <div class="section">
+            <h2>📌 핵심 포인트</h2>
+            <div class="key-points">
+                <ul>
+                    {"".join(f'<li>{point}</li>' for point in topic['key_points'])}
+                </ul>
+            </div>
+        </div>
+
+        {generate_terms_section(topic.get('technical_terms', {}))}
+
+        {"<div class='section'><h2>📐 공식 및 계산</h2><div class='formula'>" + topic['formula'] + "</div></div>" if topic.get('formula') else ""}
+
+        {"<div class='section'><h2>💡 실무 팁</h2><div class='tip'>" + topic['practical_tip'] + "</div></div>" if topic.get('practical_tip') else ""}
+
+        {detailed_section}
+        {exercises_section}
+        {quiz_section}
+        {generate_ai_section(ai_content)}
+
+        <div class="progress">
+            <p><strong>전체 진행률</strong> (Day {day}/{max_days})</p>
+            <div class="progress-bar">
+                <div class="progress-fill" style="width: {progress_percent:.1f}%;">{progress_percent:.1f}%</div>
+            </div>
+        </div>
+
+        <div class="footer">
+            <p><strong>{program_info['title']}</strong></p>
+            <p>📧 매일 아침 발송되는 전문가 학습 메일</p>
+        </div>
+    </div>
+</body>
+</html>'''
+
+    return html_content
+
+
+def bench(fn, curriculum: dict, days: list, repeat: int = 5, number: int = 20) -> float:
+    """전체 일차를 한 바퀴 렌더링하는 데 걸리는 호출당 평균 시간(초)"""
+    topics = [(day, get_topic_for_day(curriculum, day)) for day in days]
+
+    def run():
+        for day, topic_data in topics:
+            fn(curriculum, day, topic_data)
+
+    return min(timeit.repeat(run, number=number, repeat=repeat)) / (number * len(topics))
+
+
+def main() -> int:
+    curriculum = load_curriculum(use_snapshot=False)
+    days = list(range(1, curriculum["program_info"].get("duration_days", 90) + 1))
+
+    legacy = bench(legacy_create_email_content, curriculum, days)
+    current = bench(create_email_content, curriculum, days)
+    print(f"f-string (이전): {legacy * 1e6:8.1f} µs/render")
+    print(f"template (현재): {current * 1e6:8.1f} µs/render  ({(current / legacy - 1) * 100:+.0f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+전체 발송 파이프라인 부하 테스트
+
+load_curriculum → get_current_day(group_by_day) → create_email_content(build_messages)
+→ EmailSender 발송 전 과정을 프로세스 내 SMTP 서버(smtp_sink.SMTPSink)에 대해 실행하고
+처리량(건/초), 메시지당 발송 지연 p50/p99, 오류율을 보고합니다.
+Gmail 없이 동시성·연결 풀 설정을 정하는 데 사용합니다.
+
+    python benchmarks/load_test.py --recipients 1000 10000 --mode async --concurrency 20
+    python benchmarks/load_test.py --recipients 5000 --latency 0.01 --error-rate 0.01 --error-code 451
+    python benchmarks/load_test.py --recipients 1000 --starttls   # openssl로 자체 서명 인증서 생성
+    python benchmarks/load_test.py --recipients 5000 --personalize --render-workers 1 2 4  # 개인화 병렬 렌더링
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import ssl
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from async_delivery import AsyncDeliveryEngine  # noqa: E402
+from curriculum import load_curriculum  # noqa: E402
+from email_sender import EmailSender  # noqa: E402
+from main import build_messages, build_personal_messages, group_by_day  # noqa: E402
+from smtp_sink import SMTPSink, make_self_signed_cert  # noqa: E402
+
+
+class TimedEmailSender(EmailSender):
+    """메시지별 발송 지연(직렬화 + SMTP 왕복)을 기록하는 EmailSender"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+        self._lock = threading.Lock()
+
+    def _send_pooled(self, pool, message: dict) -> dict:
+        started = time.perf_counter()
+        try:
+            return super()._send_pooled(pool, message)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.latencies.append(elapsed)
+
+
+def synthetic_roster(count: int, max_days: int) -> list:
+    """학습 일차가 고르게 분포된 가상 수신자 명단"""
+    today = datetime.now()
+    return [
+        {"email": f"user{i:06d}@example.com", "name": f"수신자{i:06d}",
+         "start_date": (today - timedelta(days=i % max_days)).strftime("%Y-%m-%d")}
+        for i in range(count)
+    ]
+
+
+def percentile(values: list, p: float) -> float:
+    """정렬된 값 목록의 p 분위수 (최근접 순위)"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(round(p * (len(values) - 1))))]
+
+
+def run(count: int, args, tls: tuple = None, render_workers: int = None) -> dict:
+    """수신자 count명에 대해 파이프라인 1회 실행 (render_workers: 개인화 렌더링 워커 수)"""
+    timings = {}
+
+    started = time.perf_counter()
+    curriculum = load_curriculum(use_snapshot=False)
+    timings["load_curriculum"] = time.perf_counter() - started
+
+    max_days = curriculum["program_info"].get("duration_days", 90)
+    roster = synthetic_roster(count, max_days)
+
+    started = time.perf_counter()
+    groups = group_by_day(roster)
+    timings["group_by_day"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if args.personalize:
+            os.environ["RENDER_WORKERS"] = str(render_workers or os.cpu_count() or 1)
+            profiles = {r["email"]: {"name": r["name"], "progress_percent": (i % 100) + 0.5}
+                        for i, r in enumerate(roster)}
+            messages = list(build_personal_messages(curriculum, groups, profiles, "loadtest@example.com"))
+        else:
+            messages = build_messages(curriculum, groups)
+    timings["build_messages"] = time.perf_counter() - started
+
+    certfile, keyfile = tls or (None, None)
+    with SMTPSink(latency=args.latency, error_rate=args.error_rate, error_code=args.error_code,
+                  inject_at=args.inject_at, certfile=certfile, keyfile=keyfile, seed=args.seed) as sink:
+        ssl_context = None
+        if tls:
+            ssl_context = ssl.create_default_context(cafile=certfile)
+            ssl_context.check_hostname = False
+        sender = TimedEmailSender("loadtest@example.com", "password", sink.host, sink.port,
+                                  starttls=bool(tls), ssl_context=ssl_context)
+
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            if args.mode == "async":
+                engine = AsyncDeliveryEngine(sender, concurrency=args.concurrency,
+                                             max_retries=args.retries, base_delay=args.retry_delay,
+                                             max_delay=args.retry_delay * 8)
+                results = engine.run(messages)
+            else:
+                results = sender.send_batch(messages, pool_size=args.concurrency,
+                                            max_messages_per_connection=args.max_messages)
+        timings["deliver"] = time.perf_counter() - started
+        stats = dict(sink.stats)
+
+    latencies = sorted(sender.latencies)
+    failed = [r for r in results if not r["success"]]
+    total = sum(timings.values())
+    return {
+        "recipients": count,
+        "days": len(groups),
+        "render_workers": render_workers if args.personalize else None,
+        "timings": timings,
+        "throughput": len(results) / timings["deliver"] if timings["deliver"] else 0.0,
+        "end_to_end": len(results) / total if total else 0.0,
+        "p50": percentile(latencies, 0.50),
+        "p99": percentile(latencies, 0.99),
+        "max": latencies[-1] if latencies else 0.0,
+        "error_rate": len(failed) / len(results) if results else 0.0,
+        "temporary_errors": sum(1 for r in failed if r["temporary"]),
+        "permanent_errors": sum(1 for r in failed if not r["temporary"]),
+        "sink": stats,
+    }
+
+
+def report(result: dict):
+    t = result["timings"]
+    sink = result["sink"]
+    workers = f", 개인화 렌더링 워커 {result['render_workers']}개" if result["render_workers"] else ""
+    print(f"\n📊 수신자 {result['recipients']:,}명 (일차 {result['days']}종{workers})")
+    print(f"   렌더링 처리량: {result['recipients'] / t['build_messages']:,.0f}건/초")
+    print(f"   단계별 시간: load {t['load_curriculum'] * 1000:.1f}ms | group {t['group_by_day'] * 1000:.1f}ms"
+          f" | render {t['build_messages'] * 1000:.1f}ms | deliver {t['deliver']:.2f}s")
+    print(f"   처리량: 발송 {result['throughput']:,.0f}건/초 | 전체 파이프라인 {result['end_to_end']:,.0f}건/초")
+    print(f"   발송 지연: p50 {result['p50'] * 1000:.2f}ms | p99 {result['p99'] * 1000:.2f}ms"
+          f" | max {result['max'] * 1000:.2f}ms")
+    print(f"   오류율: {result['error_rate'] * 100:.2f}% (일시 {result['temporary_errors']},"
+          f" 영구 {result['permanent_errors']})")
+    print(f"   SMTP 서버: 연결 {sink.get('connections', 0)}개, 수신 {sink.get('messages', 0):,}건,"
+          f" {sink.get('bytes', 0) / 1e6:.1f}MB")
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="로컬 SMTP 서버 대상 발송 파이프라인 부하 테스트")
+    parser.add_argument("--recipients", type=int, nargs="+", default=[1000, 10000], help="가상 수신자 수")
+    parser.add_argument("--mode", choices=["sync", "async"], default="sync", help="발송 방식")
+    parser.add_argument("--concurrency", type=int, default=10, help="동시 SMTP 연결 수")
+    parser.add_argument("--max-messages", type=int, default=100, help="연결당 최대 발송 건수 (sync)")
+    parser.add_argument("--retries", type=int, default=2, help="일시 오류 재시도 횟수 (async)")
+    parser.add_argument("--retry-delay", type=float, default=0.05, help="재시도 초기 대기 시간(초, async)")
+    parser.add_argument("--latency", type=float, default=0.0, help="SMTP 서버 DATA 응답 지연(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="오류 주입 확률")
+    parser.add_argument("--error-code", type=int, default=451, help="주입할 SMTP 응답 코드")
+    parser.add_argument("--inject-at", choices=["rcpt", "data"], default="data", help="오류 주입 단계")
+    parser.add_argument("--starttls", action="store_true", help="STARTTLS 사용 (자체 서명 인증서)")
+    parser.add_argument("--seed", type=int, default=1, help="오류 주입 난수 시드")
+    parser.add_argument("--personalize", action="store_true", help="수신자별 개인화 본문을 프로세스 풀로 렌더링")
+    parser.add_argument("--render-workers", type=int, nargs="+", default=[None],
+                        help="개인화 렌더링 워커 수 (여러 값이면 각각 실행, 기본: CPU 수)")
+    args = parser.parse_args(argv)
+
+    tls = make_self_signed_cert() if args.starttls else None
+    print(f"🚀 부하 테스트: mode={args.mode}, concurrency={args.concurrency}, latency={args.latency}s,"
+          f" error_rate={args.error_rate} ({args.error_code}@{args.inject_at}), starttls={args.starttls}")
+    for count in args.recipients:
+        for render_workers in (args.render_workers if args.personalize else [None]):
+            report(run(count, args, tls, render_workers))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
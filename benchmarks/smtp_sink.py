@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+부하 테스트용 프로세스 내 SMTP 서버
+
+받은 메시지를 저장하지 않고 버리는 최소 SMTP 서버입니다.
+EHLO/HELO, STARTTLS(인증서 지정 시), AUTH PLAIN/LOGIN, MAIL, RCPT, DATA,
+RSET, NOOP, QUIT만 처리하며, 응답 지연과 오류 주입을 설정할 수 있습니다.
+
+    with SMTPSink(latency=0.005, error_rate=0.01, error_code=451) as sink:
+        sender = EmailSender("a@example.com", "pw", "127.0.0.1", sink.port, starttls=False)
+"""
+
+import random
+import socketserver
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+_MESSAGES = {
+    421: "Service not available, closing channel",
+    450: "Mailbox unavailable, try again later",
+    451: "Local error in processing, try again later",
+    452: "Insufficient system storage",
+    550: "Mailbox unavailable",
+    552: "Message size exceeds limit",
+    554: "Transaction failed",
+}
+
+
+def make_self_signed_cert(directory: Path = None) -> Tuple[str, str]:
+    """
+    STARTTLS용 자체 서명 인증서 생성 (openssl 명령 필요)
+
+    Returns:
+        tuple: (인증서 경로, 개인 키 경로)
+    """
+    directory = Path(directory or tempfile.mkdtemp(prefix="smtp-sink-"))
+    certfile, keyfile = directory / "cert.pem", directory / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=localhost", "-keyout", str(keyfile), "-out", str(certfile)],
+        check=True, capture_output=True,
+    )
+    return str(certfile), str(keyfile)
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """연결 하나의 SMTP 대화 처리"""
+
+    def _reply(self, line: str):
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+        self.wfile.flush()
+
+    def _readline(self) -> Optional[str]:
+        line = self.rfile.readline(65536)
+        if not line:
+            return None
+        return line.decode("utf-8", "replace").rstrip("\r\n")
+
+    def _read_data(self) -> int:
+        """DATA 본문을 "." 줄까지 읽어 버리고 바이트 수 반환"""
+        size = 0
+        while True:
+            line = self.rfile.readline(1 << 20)
+            if not line or line in (b".\r\n", b".\n"):
+                return size
+            size += len(line)
+
+    def _inject(self) -> Optional[int]:
+        """오류 주입 확률에 따라 응답할 오류 코드 (없으면 None)"""
+        sink = self.server.sink
+        if sink.error_rate and sink.random() < sink.error_rate:
+            return sink.error_code
+        return None
+
+    def handle(self):
+        sink = self.server.sink
+        sink._count("connections")
+        self._reply("220 localhost SMTP sink ready")
+        tls = False
+
+        while True:
+            line = self._readline()
+            if line is None:
+                return
+            verb, _, arg = line.partition(" ")
+            verb = verb.upper()
+
+            if verb in ("EHLO", "HELO"):
+                if verb == "HELO":
+                    self._reply("250 localhost")
+                    continue
+                features = ["localhost", "8BITMIME", "AUTH PLAIN LOGIN"]
+                if sink.tls_context is not None and not tls:
+                    features.append("STARTTLS")
+                for feature in features[:-1]:
+                    self._reply(f"250-{feature}")
+                self._reply(f"250 {features[-1]}")
+            elif verb == "STARTTLS":
+                if sink.tls_context is None or tls:
+                    self._reply("454 TLS not available")
+                    continue
+                self._reply("220 Ready to start TLS")
+                self.request = sink.tls_context.wrap_socket(self.request, server_side=True)
+                self.rfile = self.request.makefile("rb")
+                self.wfile = self.request.makefile("wb")
+                tls = True
+            elif verb == "AUTH":
+                mechanism, _, initial = arg.partition(" ")
+                if mechanism.upper() == "LOGIN":
+                    if not initial:
+                        self._reply("334 VXNlcm5hbWU6")
+                        self._readline()
+                    self._reply("334 UGFzc3dvcmQ6")
+                    self._readline()
+                elif not initial:
+                    self._reply("334 ")
+                    self._readline()
+                self._reply("235 Authentication successful")
+            elif verb == "MAIL":
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                code = self._inject() if sink.inject_at == "rcpt" else None
+                if code:
+                    sink._count(f"error_{code}")
+                    self._reply(f"{code} {_MESSAGES.get(code, 'Injected error')}")
+                    if code == 421:
+                        return
+                else:
+                    self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                size = self._read_data()
+                if sink.latency:
+                    time.sleep(sink.latency)
+                code = self._inject() if sink.inject_at == "data" else None
+                if code:
+                    sink._count(f"error_{code}")
+                    self._reply(f"{code} {_MESSAGES.get(code, 'Injected error')}")
+                    if code == 421:
+                        return
+                else:
+                    sink._count("messages")
+                    sink._count("bytes", size)
+                    self._reply("250 OK queued")
+            elif verb in ("RSET", "NOOP"):
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class SMTPSink:
+    """백그라운드 스레드에서 실행되는 SMTP 수신 서버"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 error_rate: float = 0.0, error_code: int = 451, inject_at: str = "data",
+                 certfile: str = None, keyfile: str = None, seed: int = None):
+        """
+        Args:
+            host: 바인딩 주소
+            port: 포트 (0이면 빈 포트 자동 선택)
+            latency: DATA 처리 후 응답 전 지연 시간(초)
+            error_rate: 오류를 주입할 확률 (0~1)
+            error_code: 주입할 SMTP 응답 코드 (예: 421, 451, 550)
+            inject_at: 오류를 주입할 단계 ("rcpt" 또는 "data")
+            certfile: STARTTLS 인증서 (없으면 STARTTLS 미지원)
+            keyfile: STARTTLS 개인 키
+            seed: 오류 주입 난수 시드
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.inject_at = inject_at
+        self.tls_context = None
+        if certfile:
+            self.tls_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            self.tls_context.load_cert_chain(certfile, keyfile)
+
+        self.stats = {}
+        self._stats_lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+
+        self._server = _Server((host, port), _SMTPHandler)
+        self._server.sink = self
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def random(self) -> float:
+        with self._random_lock:
+            return self._random.random()
+
+    def _count(self, key: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[key] = self.stats.get(key, 0) + amount
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
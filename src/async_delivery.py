@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+asyncio 기반 대량 발송 엔진
+
+동시 발송 수 제한, 발송 업체 쿼터(분당/일일)에 맞춘 토큰 버킷,
+421/450 계열 일시 오류에 대한 지수 백오프를 제공합니다.
+SMTP 입출력은 EmailSender의 연결 풀을 스레드에서 실행합니다.
+"""
+
+import asyncio
+import random
+import smtplib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Callable, List, Optional
+
+from email_sender import AUTH_ERROR, EmailSender, SMTPConnectionPool, is_temporary_error
+
+
+class DailyQuotaExceeded(Exception):
+    """일일 발송 쿼터 소진"""
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 capacity개까지 쌓이는 토큰 버킷"""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: 초당 보충되는 토큰 수
+            capacity: 버킷 최대 용량 (순간 최대 발송량)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = None
+        self._loop = None
+
+    def _loop_lock(self) -> asyncio.Lock:
+        """실행 중인 이벤트 루프의 잠금 (엔진을 재사용하면 run마다 루프가 바뀜)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """토큰 1개를 얻을 때까지 대기"""
+        async with self._loop_lock():
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class RateLimiter:
+    """분당 토큰 버킷 + 일일 발송 한도"""
+
+    def __init__(self, per_minute: Optional[int] = None, per_day: Optional[int] = None,
+                 sent_today: int = 0):
+        """
+        Args:
+            per_minute: 분당 최대 발송 수 (None이면 제한 없음)
+            per_day: 일일 최대 발송 수 (None이면 제한 없음)
+            sent_today: 오늘 이미 발송한 수 (이전 실행분, 발송함에서 집계)
+        """
+        self.per_day = per_day
+        self.day = date.today()
+        self.sent_today = sent_today
+        self._reserved = 0  # 허가를 받고 결과를 기다리는 발송 수
+        self._minute = TokenBucket(per_minute / 60.0, per_minute) if per_minute else None
+
+    def _rollover(self):
+        today = date.today()
+        if today != self.day:
+            self.day = today
+            self.sent_today = 0
+
+    async def acquire(self):
+        """발송 1건에 대한 허가 획득 (일일 한도 초과 시 DailyQuotaExceeded)"""
+        self._rollover()
+        if self.per_day is not None and self.sent_today + self._reserved >= self.per_day:
+            raise DailyQuotaExceeded(f"일일 발송 한도 {self.per_day}건 소진")
+        self._reserved += 1
+        if self._minute is not None:
+            try:
+                await self._minute.acquire()
+            except BaseException:
+                # 취소 등으로 허가를 받지 못했으면 예약을 되돌림
+                self._reserved -= 1
+                raise
+
+    def release(self, sent: bool):
+        """acquire한 발송 1건의 결과 반영 (성공한 발송만 일일 한도에 계산)"""
+        self._reserved -= 1
+        if sent:
+            self._rollover()
+            self.sent_today += 1
+
+    @property
+    def exhausted(self) -> bool:
+        """오늘 일일 한도를 모두 썼는지"""
+        self._rollover()
+        return self.per_day is not None and self.sent_today >= self.per_day
+
+
+class AsyncDeliveryEngine:
+    """동시성·쿼터·백오프를 관리하는 비동기 발송기"""
+
+    def __init__(self, sender: EmailSender, concurrency: int = 10,
+                 per_minute: Optional[int] = None, per_day: Optional[int] = None,
+                 max_retries: int = 4, base_delay: float = 2.0, max_delay: float = 60.0,
+                 sent_today: int = 0):
+        """
+        일일 쿼터는 엔진에 보관하므로 같은 엔진으로 여러 번 deliver해도 날짜가 바뀌기 전까지 누적됩니다.
+
+        Args:
+            sender: 메시지 구성과 SMTP 연결에 사용할 EmailSender
+            concurrency: 동시에 진행할 최대 발송 수 (= SMTP 연결 수)
+            per_minute: 분당 발송 쿼터
+            per_day: 일일 발송 쿼터
+            max_retries: 일시 오류 시 최대 재시도 횟수
+            base_delay: 백오프 초기 대기 시간(초)
+            max_delay: 백오프 최대 대기 시간(초)
+            sent_today: 오늘 이미 발송한 수 (이전 실행분)
+        """
+        self.sender = sender
+        self.concurrency = max(1, concurrency)
+        self.per_minute = per_minute
+        self.per_day = per_day
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.limiter = RateLimiter(per_minute, per_day, sent_today)
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _deliver_one(self, message: dict, pool: SMTPConnectionPool,
+                           limiter: RateLimiter, semaphore: asyncio.Semaphore,
+                           executor: ThreadPoolExecutor, auth_failed: asyncio.Event) -> dict:
+        to_email = message["to_email"]
+        loop = asyncio.get_running_loop()
+
+        async with semaphore:
+            for attempt in range(self.max_retries + 1):
+                if auth_failed.is_set():
+                    # 인증 실패 후에는 남은 메시지를 시도하지 않음
+                    return {"to_email": to_email, "success": False, "error": AUTH_ERROR,
+                            "temporary": False, "auth": True}
+                try:
+                    await limiter.acquire()
+                except DailyQuotaExceeded as e:
+                    # 재시도 대상이 아님: 발송함은 시도 횟수를 늘리지 않고 다음 날까지 남겨 둠
+                    return {"to_email": to_email, "success": False, "error": str(e),
+                            "temporary": False, "quota": True}
+
+                try:
+                    result = await loop.run_in_executor(
+                        executor, self.sender._send_pooled, pool, message
+                    )
+                    limiter.release(result["success"])
+                    return result
+                except smtplib.SMTPAuthenticationError:
+                    limiter.release(False)
+                    if not auth_failed.is_set():
+                        auth_failed.set()
+                        print(f"❌ {AUTH_ERROR} 남은 발송을 중단합니다.")
+                    return {"to_email": to_email, "success": False, "error": AUTH_ERROR,
+                            "temporary": False, "auth": True}
+                except Exception as e:
+                    limiter.release(False)
+                    if not is_temporary_error(e) or attempt == self.max_retries:
+                        return {"to_email": to_email, "success": False,
+                                "error": str(e), "temporary": is_temporary_error(e)}
+                    delay = self._backoff(attempt)
+                    print(f"⏳ 일시 오류, {delay:.1f}초 후 재시도 ({to_email}): {e}")
+                    await asyncio.sleep(delay)
+
+    async def deliver(self, messages: List[dict],
+                      on_result: Optional[Callable[[dict], None]] = None) -> List[dict]:
+        """
+        메시지 목록을 비동기로 발송
+
+        Args:
+            messages: EmailSender.send_batch와 같은 형식의 dict 목록
+            on_result: 메시지마다 발송 직후 결과 dict로 호출되는 콜백 (선택)
+
+        Returns:
+            list: 수신자별 결과 dict (to_email, success, error, temporary), 입력 순서 유지
+        """
+        if not messages:
+            return []
+
+        concurrency = min(self.concurrency, len(messages))
+        limiter = self.limiter
+        semaphore = asyncio.Semaphore(concurrency)
+        auth_failed = asyncio.Event()
+
+        async def deliver_one(message: dict) -> dict:
+            result = await self._deliver_one(message, pool, limiter, semaphore, executor, auth_failed)
+            if on_result is not None:
+                on_result(result)
+            return result
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor, \
+                self.sender.connection_pool(concurrency) as pool:
+            results = await asyncio.gather(*(deliver_one(message) for message in messages))
+
+        sent = sum(1 for r in results if r["success"])
+        print(f"📧 비동기 발송 완료: {sent}/{len(results)}건 성공")
+        for r in results:
+            if not r["success"]:
+                print(f"❌ 발송 실패 ({r['to_email']}): {r['error']}")
+        return list(results)
+
+    def run(self, messages: List[dict],
+            on_result: Optional[Callable[[dict], None]] = None) -> List[dict]:
+        """동기 코드에서 deliver 실행"""
+        return asyncio.run(self.deliver(messages, on_result))
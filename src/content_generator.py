@@ -1,31 +1,172 @@
 #!/usr/bin/env python3
 """
 OpenAI API를 이용한 AI 콘텐츠 생성 모듈
+
+동기 클라이언트(ContentGenerator)는 AI_TIMEOUT초 요청 제한을 두고,
+발송 경로의 즉시 생성은 AsyncContentGenerator가 호출마다 마감 시간(AI_DEADLINE)을 두고
+응답이 최근 p95보다 늦으면 같은 요청을 한 번 더 보내(hedging) 먼저 온 응답을 씁니다.
+마감을 넘기면 AI 섹션 없이 커리큘럼의 정적 내용으로 대체합니다.
 """
 
+import asyncio
+import collections
+import json
 import os
-from typing import Optional
+import threading
+import time
+from html import escape
+from typing import Callable, Dict, List, Optional
+
+from curriculum import get_module_for_day
+from llm_cache import LLMCache
+from templates import AI_PAGE
+import metrics
+
+QUIZ_SYSTEM_PROMPT = "SWRO 기술 퀴즈 출제자"
+QUIZ_OPTION_LETTERS = ("A", "B", "C", "D")
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(api_key: str):
+    """
+    API 키별로 공유되는 OpenAI 클라이언트 반환
+
+    클라이언트는 내부 HTTP 연결 풀을 가지므로 프로세스 전체에서 재사용합니다.
+    OPENAI_STUB=true이면 네트워크를 쓰지 않는 로컬 스텁을 반환합니다.
+    """
+    stub = os.environ.get("OPENAI_STUB", "false").lower() == "true"
+    key = "__stub__" if stub else api_key
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            if stub:
+                from openai_stub import StubOpenAIClient
+                client = StubOpenAIClient()
+            else:
+                # openai는 무거운 패키지이므로 AI 경로가 실제로 쓰일 때만 import
+                try:
+                    import openai
+                except ImportError:
+                    raise ImportError("openai 패키지가 설치되지 않았습니다. pip install openai") from None
+                client = openai.OpenAI(api_key=api_key, timeout=ai_timeout())
+            _clients[key] = client
+        return client
+
+
+def ai_timeout() -> float:
+    """동기 요청 1건의 제한 시간(초, AI_TIMEOUT, 기본 30)"""
+    return float(os.environ.get("AI_TIMEOUT", "30"))
+
+
+def create_async_client(api_key: str):
+    """
+    openai.AsyncOpenAI 클라이언트 생성 (OPENAI_STUB=true이면 비동기 스텁)
+
+    비동기 클라이언트의 연결 풀은 이벤트 루프에 묶이므로 공유하지 않고
+    asyncio.run 한 번마다 새로 만들어 close합니다. 재시도는 hedging이 대신합니다.
+    """
+    if os.environ.get("OPENAI_STUB", "false").lower() == "true":
+        from openai_stub import AsyncStubOpenAIClient
+        return AsyncStubOpenAIClient(latency=float(os.environ.get("OPENAI_STUB_LATENCY", "0")))
+    try:
+        import openai
+    except ImportError:
+        raise ImportError("openai 패키지가 설치되지 않았습니다. pip install openai") from None
+    return openai.AsyncOpenAI(api_key=api_key, max_retries=0)
+
+
+def _supplement_messages(topic: dict) -> list:
+    """토픽 보충 설명 요청 메시지"""
+    prompt = f"""당신은 SWRO(해수역삼투) 해수담수화 플랜트 전문가입니다.
+다음 학습 주제에 대해 실무 엔지니어에게 도움이 되는 보충 설명을 작성해 주세요.
+
+주제: {topic['title']}
+내용: {topic['content']}
+핵심 포인트: {', '.join(topic['key_points'])}
+
+다음 내용을 포함해 주세요:
+1. 실제 현장에서 겪을 수 있는 상황 예시
+2. 자주 하는 실수와 주의사항
+3. 관련 산업 표준이나 가이드라인 (있다면)
 
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+형식: 간결한 HTML (p, ul, li 태그 사용). 200자 내외로 작성해 주세요."""
+    return [
+        {"role": "system", "content": "SWRO 해수담수화 플랜트 전문 기술 컨설턴트"},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _daily_content_messages(day: int, module: dict) -> list:
+    """커리큘럼에 없는 일차의 전체 학습 콘텐츠 요청 메시지"""
+    prompt = f"""당신은 SWRO 해수담수화 플랜트 전문가 교육자입니다.
+'{module['title']}' 모듈의 Day {day} 학습 콘텐츠를 생성해 주세요.
+
+레벨: {module['level']}
+모듈 설명: {module['title']}
+
+다음 구조로 작성해 주세요:
+1. 오늘의 학습 주제 (제목)
+2. 학습 목표 (3-4개 bullet points)
+3. 핵심 개념 설명
+4. 관련 수식이나 계산 (있다면)
+5. 실무 적용 팁
+
+HTML 형식으로 깔끔하게 작성해 주세요."""
+    return [
+        {"role": "system", "content": "SWRO 해수담수화 플랜트 교육 전문가"},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _day_module(day: int, curriculum: dict) -> dict:
+    """일차가 속한 모듈 (없으면 마지막 모듈)"""
+    module = get_module_for_day(curriculum, day)
+    return module if module is not None else curriculum["modules"][-1]
+
+
+def static_module_section(module: dict) -> str:
+    """AI 생성 실패·마감 초과 시 대신 넣을 모듈 개요 (커리큘럼 정적 내용)"""
+    items = "".join(f"<li>Day {t['day']}: {escape(t['title'])}</li>" for t in module.get("topics", []))
+    section = f"<p>오늘은 <strong>{escape(module['title'])}</strong> 모듈({escape(str(module.get('level', '')))})을 복습합니다.</p>"
+    if items:
+        section += f"<p>이 모듈에서 다룬 주제를 다시 살펴보세요.</p><ul>{items}</ul>"
+    return section
+
+
+def _daily_page(day: int, curriculum: dict, module: dict, content: str) -> str:
+    """AI 생성 메일 페이지 (content: AI 응답 또는 정적 모듈 개요)"""
+    max_days = curriculum["program_info"].get("duration_days", 90)
+    return AI_PAGE.render(
+        title=f"SWRO 학습 Day {day}",
+        day=day,
+        max_days=max_days,
+        module_title=module["title"],
+        ai_content=content,
+        percent=min(day / max_days, 1) * 100,
+        program_title=curriculum["program_info"]["title"],
+        footer_note="📧 매일 아침 발송되는 학습 메일입니다.",
+    )
 
 
 class ContentGenerator:
     """OpenAI API를 이용한 학습 콘텐츠 생성"""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache: Optional[LLMCache] = None):
         """
         Args:
             api_key: OpenAI API 키
+            cache: LLM 응답 캐시 (선택)
         """
-        if not OPENAI_AVAILABLE:
-            raise ImportError("openai 패키지가 설치되지 않았습니다. pip install openai")
+        self.client = get_client(api_key)
+        self.cache = cache
 
-        self.client = openai.OpenAI(api_key=api_key)
+    def _chat(self, messages: list, model: str = "gpt-4o-mini", **params) -> str:
+        """chat.completions 호출 (캐시가 있으면 캐시 우선)"""
+        return cached_chat(self.client, self.cache, messages, model, **params)
 
+    @metrics.timed("ai.supplement")
     def generate_supplement(self, topic: dict) -> Optional[str]:
         """
         기존 토픽에 대한 AI 보충 설명 생성
@@ -36,36 +177,13 @@ class ContentGenerator:
         Returns:
             str: AI가 생성한 보충 설명 (HTML 형식)
         """
-        prompt = f"""당신은 SWRO(해수역삼투) 해수담수화 플랜트 전문가입니다.
-다음 학습 주제에 대해 실무 엔지니어에게 도움이 되는 보충 설명을 작성해 주세요.
-
-주제: {topic['title']}
-내용: {topic['content']}
-핵심 포인트: {', '.join(topic['key_points'])}
-
-다음 내용을 포함해 주세요:
-1. 실제 현장에서 겪을 수 있는 상황 예시
-2. 자주 하는 실수와 주의사항
-3. 관련 산업 표준이나 가이드라인 (있다면)
-
-형식: 간결한 HTML (p, ul, li 태그 사용). 200자 내외로 작성해 주세요."""
-
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "SWRO 해수담수화 플랜트 전문 기술 컨설턴트"},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=500,
-                temperature=0.7
-            )
-            return response.choices[0].message.content
-
+            return self._chat(messages=_supplement_messages(topic), max_tokens=500, temperature=0.7)
         except Exception as e:
             print(f"AI 콘텐츠 생성 실패: {e}")
             return None
 
+    @metrics.timed("ai.daily_content")
     def generate_daily_content(self, day: int, curriculum: dict) -> str:
         """
         특정 일차에 대한 전체 학습 콘텐츠 생성 (커리큘럼에 없는 날)
@@ -77,178 +195,97 @@ class ContentGenerator:
         Returns:
             str: 전체 이메일 HTML 콘텐츠
         """
-        # 해당 일차가 속한 모듈 찾기
-        current_module = None
-        for module in curriculum["modules"]:
-            if module["start_day"] <= day < module["start_day"] + module["duration_days"]:
-                current_module = module
-                break
-
-        if current_module is None:
-            # 마지막 모듈 사용
-            current_module = curriculum["modules"][-1]
-
-        prompt = f"""당신은 SWRO 해수담수화 플랜트 전문가 교육자입니다.
-'{current_module['title']}' 모듈의 Day {day} 학습 콘텐츠를 생성해 주세요.
+        module = _day_module(day, curriculum)
+        try:
+            content = self._chat(messages=_daily_content_messages(day, module), max_tokens=1500, temperature=0.7)
+        except Exception as e:
+            # 오류 내용은 로그에만 남기고 메일에는 정적 모듈 개요를 넣음
+            print(f"AI 콘텐츠 생성 실패, 정적 내용으로 대체: {e}")
+            content = None
+        return _daily_page(day, curriculum, module, content or static_module_section(module))
 
-레벨: {current_module['level']}
-모듈 설명: {current_module['title']}
 
-다음 구조로 작성해 주세요:
-1. 오늘의 학습 주제 (제목)
-2. 학습 목표 (3-4개 bullet points)
-3. 핵심 개념 설명
-4. 관련 수식이나 계산 (있다면)
-5. 실무 적용 팁
+def cached_chat(client, cache: Optional[LLMCache], messages: list,
+                model: str = "gpt-4o-mini", validate: Callable[[str], bool] = None,
+                **params) -> str:
+    """
+    chat.completions 호출 결과를 캐시를 거쳐 반환
 
-HTML 형식으로 깔끔하게 작성해 주세요."""
+    Args:
+        client: openai.OpenAI 클라이언트
+        cache: LLM 응답 캐시 (None이면 항상 API 호출)
+        messages: 대화 메시지
+        model: 모델 이름
+        validate: 응답 검증 함수 (False인 응답은 캐시에 저장하지 않음)
+        **params: max_tokens, temperature 등 API 파라미터
 
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "SWRO 해수담수화 플랜트 교육 전문가"},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1500,
-                temperature=0.7
-            )
+    Returns:
+        str: 응답 텍스트
+    """
+    key = None
+    if cache is not None:
+        key = LLMCache.make_key(model, messages, params)
+        cached = cache.get(key)
+        if cached is not None:
+            metrics.count("llm_cache_hits")
+            return cached
 
-            ai_content = response.choices[0].message.content
-            progress_percent = (day / 365) * 100
-
-            return f"""
-<!DOCTYPE html>
-<html lang="ko">
-<head>
-    <meta charset="UTF-8">
-    <title>SWRO 학습 Day {day}</title>
-    <style>
-        body {{
-            font-family: 'Noto Sans KR', 'Malgun Gothic', sans-serif;
-            line-height: 1.8;
-            color: #333;
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }}
-        .container {{
-            background-color: white;
-            padding: 30px;
-            border-radius: 10px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        .header {{
-            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-            color: white;
-            padding: 25px;
-            border-radius: 10px;
-            margin-bottom: 25px;
-        }}
-        .header h1 {{
-            margin: 0;
-            font-size: 24px;
-        }}
-        .ai-badge {{
-            display: inline-block;
-            background-color: #007bff;
-            color: white;
-            padding: 3px 10px;
-            border-radius: 3px;
-            font-size: 12px;
-            margin-bottom: 10px;
-        }}
-        .content {{
-            padding: 20px;
-        }}
-        .progress-bar {{
-            background-color: #e9ecef;
-            border-radius: 10px;
-            height: 20px;
-            overflow: hidden;
-            margin-top: 20px;
-        }}
-        .progress-fill {{
-            background: linear-gradient(90deg, #28a745, #20c997);
-            height: 100%;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            color: white;
-            font-size: 12px;
-            font-weight: bold;
-        }}
-        .footer {{
-            margin-top: 30px;
-            padding-top: 20px;
-            border-top: 1px solid #ddd;
-            text-align: center;
-            color: #666;
-            font-size: 14px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>Day {day} - {current_module['title']}</h1>
-            <span class="ai-badge">AI Generated Content</span>
-        </div>
-
-        <div class="content">
-            {ai_content}
-        </div>
-
-        <div class="progress-bar">
-            <div class="progress-fill" style="width: {progress_percent:.1f}%;">
-                {progress_percent:.1f}%
-            </div>
-        </div>
-
-        <div class="footer">
-            <p>{curriculum['program_info']['title']}</p>
-            <p>📧 매일 아침 발송되는 학습 메일입니다.</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+    with metrics.span("ai.request"):
+        response = client.chat.completions.create(model=model, messages=messages, **params)
+    content = response.choices[0].message.content
+    metrics.count("llm_requests")
 
-        except Exception as e:
-            print(f"AI 콘텐츠 생성 실패: {e}")
-            return f"""
-<!DOCTYPE html>
-<html lang="ko">
-<head>
-    <meta charset="UTF-8">
-    <title>SWRO 학습 Day {day}</title>
-</head>
-<body>
-    <h1>Day {day} 학습</h1>
-    <p>AI 콘텐츠 생성 중 오류가 발생했습니다.</p>
-    <p>오류: {str(e)}</p>
-</body>
-</html>
-"""
+    if cache is not None and content and (validate is None or validate(content)):
+        cache.put(key, content)
+    return content
 
 
-def generate_quiz(topic: dict, api_key: str) -> Optional[dict]:
+def validate_quiz(quiz) -> Optional[dict]:
     """
-    학습 주제에 대한 퀴즈 생성
-
-    Args:
-        topic: 학습 주제 데이터
-        api_key: OpenAI API 키
+    퀴즈 dict 형식 검증
 
     Returns:
-        dict: 퀴즈 데이터 (질문, 선택지, 정답, 해설)
+        dict: question/options/correct/explanation만 남긴 퀴즈 (형식 오류면 None)
     """
-    if not OPENAI_AVAILABLE or not api_key:
+    if not isinstance(quiz, dict):
+        return None
+    question = quiz.get("question")
+    options = quiz.get("options")
+    correct = quiz.get("correct")
+    if not isinstance(question, str) or not question.strip():
+        return None
+    if not isinstance(options, list) or len(options) != len(QUIZ_OPTION_LETTERS):
+        return None
+    if not all(isinstance(option, str) and option.strip() for option in options):
+        return None
+    if not isinstance(correct, str) or correct.strip()[:1].upper() not in QUIZ_OPTION_LETTERS:
         return None
+    return {
+        "question": question,
+        "options": options,
+        "correct": correct.strip()[:1].upper(),
+        "explanation": str(quiz.get("explanation", "")),
+    }
 
-    client = openai.OpenAI(api_key=api_key)
 
+def _parse_quizzes(content: str, days: List[int]) -> Dict[int, Optional[dict]]:
+    """다중 토픽 응답({"quizzes": [...]})을 일차별로 검증"""
+    results = {day: None for day in days}
+    try:
+        items = json.loads(content).get("quizzes", [])
+    except (ValueError, AttributeError):
+        return results
+    for item in items if isinstance(items, list) else []:
+        day = item.get("day") if isinstance(item, dict) else None
+        if isinstance(day, str) and day.isdigit():
+            day = int(day)
+        if day in results and results[day] is None:
+            results[day] = validate_quiz(item)
+    return results
+
+
+def _single_quiz_messages(topic: dict) -> list:
+    """토픽 1개의 퀴즈 요청 메시지"""
     prompt = f"""다음 SWRO 학습 주제에 대한 객관식 퀴즈 1문제를 생성해 주세요.
 
 주제: {topic['title']}
@@ -261,22 +298,427 @@ JSON 형식으로 응답해 주세요:
     "correct": "A",
     "explanation": "정답 해설"
 }}"""
+    return [
+        {"role": "system", "content": QUIZ_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
 
+def _parse_quiz(content: str) -> Optional[dict]:
+    """단일 퀴즈 응답 파싱·검증"""
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "SWRO 기술 퀴즈 출제자"},
-                {"role": "user", "content": prompt}
-            ],
+        return validate_quiz(json.loads(content))
+    except ValueError:
+        return None
+
+
+def _quiz_messages(topics: List[dict]) -> list:
+    """여러 토픽의 퀴즈를 한 번에 요청하는 메시지 구성"""
+    listing = "\n".join(
+        f"[Day {topic['day']}] 주제: {topic['title']} / 내용: {topic['content']}" for topic in topics
+    )
+    prompt = f"""다음 SWRO 학습 주제 각각에 대해 객관식 퀴즈 1문제씩 생성해 주세요.
+
+{listing}
+
+JSON 형식으로 응답해 주세요 (주제마다 하나씩, day는 위의 Day 번호):
+{{
+    "quizzes": [
+        {{
+            "day": 1,
+            "question": "질문 내용",
+            "options": ["A. 선택지1", "B. 선택지2", "C. 선택지3", "D. 선택지4"],
+            "correct": "A",
+            "explanation": "정답 해설"
+        }}
+    ]
+}}"""
+    return [
+        {"role": "system", "content": QUIZ_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+
+@metrics.timed("ai.quizzes")
+def generate_quizzes(topics: List[dict], api_key: str, cache: Optional[LLMCache] = None,
+                     chunk_size: int = 10) -> Dict[int, Optional[dict]]:
+    """
+    여러 학습 주제의 퀴즈를 묶음 요청으로 생성
+
+    chunk_size개 토픽을 한 번의 구조화된(JSON) 요청으로 보내고
+    토픽별로 응답을 검증합니다.
+
+    Args:
+        topics: 커리큘럼 토픽 목록
+        api_key: OpenAI API 키
+        cache: LLM 응답 캐시 (선택)
+        chunk_size: 요청 하나에 담을 토픽 수
+
+    Returns:
+        dict: {day: 퀴즈 dict 또는 None(생성·검증 실패)}
+    """
+    results = {topic["day"]: None for topic in topics}
+    if not topics or not api_key:
+        return results
+
+    client = get_client(api_key)
+    for start in range(0, len(topics), chunk_size):
+        chunk = topics[start:start + chunk_size]
+        days = [topic["day"] for topic in chunk]
+        try:
+            content = cached_chat(
+                client, cache,
+                messages=_quiz_messages(chunk),
+                validate=lambda text, days=days: all(_parse_quizzes(text, days).values()),
+                max_tokens=400 * len(chunk),
+                temperature=0.7,
+                response_format={"type": "json_object"}
+            )
+            results.update(_parse_quizzes(content, days))
+        except Exception as e:
+            print(f"퀴즈 일괄 생성 실패 (Day {days[0]}~{days[-1]}): {e}")
+
+    failed = [day for day, quiz in results.items() if quiz is None]
+    if failed:
+        print(f"⚠️ 퀴즈 검증 실패 {len(failed)}건: Day {failed}")
+    return results
+
+
+@metrics.timed("ai.batch_submit")
+def submit_quiz_batch(topics: List[dict], api_key: str, model: str = "gpt-4o-mini",
+                      chunk_size: int = 10) -> str:
+    """
+    퀴즈 생성을 OpenAI 오프라인 Batch API로 제출
+
+    결과는 최대 24시간 뒤 collect_quiz_batch로 수집합니다.
+
+    Returns:
+        str: 배치 ID
+    """
+    client = get_client(api_key)
+    lines = []
+    for start in range(0, len(topics), chunk_size):
+        chunk = topics[start:start + chunk_size]
+        lines.append(json.dumps({
+            "custom_id": "quiz-" + "-".join(str(topic["day"]) for topic in chunk),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                "messages": _quiz_messages(chunk),
+                "max_tokens": 400 * len(chunk),
+                "temperature": 0.7,
+                "response_format": {"type": "json_object"},
+            },
+        }, ensure_ascii=False))
+
+    batch_file = client.files.create(
+        file=("quiz_batch.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id, endpoint="/v1/chat/completions", completion_window="24h"
+    )
+    return batch.id
+
+
+@metrics.timed("ai.batch_collect")
+def collect_quiz_batch(batch_id: str, api_key: str) -> Optional[Dict[int, Optional[dict]]]:
+    """
+    완료된 퀴즈 배치 결과 수집
+
+    Returns:
+        dict: {day: 퀴즈 dict 또는 None}, 배치가 아직 끝나지 않았으면 None
+    """
+    client = get_client(api_key)
+    batch = client.batches.retrieve(batch_id)
+    if batch.status != "completed":
+        print(f"⏳ 퀴즈 배치 {batch_id} 상태: {batch.status}")
+        return None
+
+    results = {}
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        days = [int(day) for day in record["custom_id"].split("-")[1:]]
+        response = record.get("response") or {}
+        if response.get("status_code") != 200:
+            results.update({day: None for day in days})
+            continue
+        content = response["body"]["choices"][0]["message"]["content"]
+        results.update(_parse_quizzes(content, days))
+    return results
+
+
+@metrics.timed("ai.quiz")
+def generate_quiz(topic: dict, api_key: str, cache: Optional[LLMCache] = None) -> Optional[dict]:
+    """
+    학습 주제에 대한 퀴즈 생성
+
+    Args:
+        topic: 학습 주제 데이터
+        api_key: OpenAI API 키
+        cache: LLM 응답 캐시 (선택)
+
+    Returns:
+        dict: 퀴즈 데이터 (질문, 선택지, 정답, 해설)
+    """
+    if not api_key:
+        return None
+
+    try:
+        content = cached_chat(
+            get_client(api_key), cache,
+            messages=_single_quiz_messages(topic),
+            validate=lambda text: _parse_quiz(text) is not None,
             max_tokens=500,
             temperature=0.7,
             response_format={"type": "json_object"}
         )
-
-        import json
-        return json.loads(response.choices[0].message.content)
+        return _parse_quiz(content)
 
     except Exception as e:
         print(f"퀴즈 생성 실패: {e}")
         return None
+
+
+class LatencyTracker:
+    """최근 응답 시간으로 hedge 요청 시점(p95)을 계산"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        """
+        Args:
+            window: 유지할 최근 응답 시간 수
+            min_samples: p95를 쓰기 시작할 최소 표본 수 (그 전에는 기본 hedge 시점 사용)
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self.label = None
+        self.store = None  # 응답 시간을 함께 저장할 LLMCache (선택)
+        self._samples = collections.deque(maxlen=window)
+
+    def record(self, seconds: float):
+        """응답 시간 1건 기록 (저장소가 있으면 함께 저장)"""
+        self._samples.append(seconds)
+        if self.store is not None:
+            self.store.record_latency(self.label, seconds, self.window)
+
+    def p95(self) -> Optional[float]:
+        """최근 응답 시간의 p95 (표본이 부족하면 None)"""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+_trackers = {}
+
+
+def latency_tracker(label: str, cache: Optional[LLMCache] = None) -> LatencyTracker:
+    """
+    요청 종류별로 프로세스 전체에서 공유하는 LatencyTracker
+
+    cache가 있으면 처음 만들 때 저장된 최근 응답 시간으로 채우고, 이후 기록을 그 캐시에 저장합니다
+    (cron처럼 매번 새로 시작하는 실행도 이전 실행의 p95를 씀).
+    """
+    tracker = _trackers.get(label)
+    if tracker is None:
+        tracker = _trackers[label] = LatencyTracker()
+        tracker.label = label
+        if cache is not None:
+            tracker._samples.extend(cache.latencies(label, tracker.window))
+    tracker.store = cache
+    return tracker
+
+
+async def _request(client, model: str, messages: list, stream: bool, tracker: LatencyTracker,
+                   params: dict) -> str:
+    """비동기 chat.completions 1회 호출 (stream이면 조각을 이어 붙임)"""
+    started = time.perf_counter()
+    if stream:
+        response = await client.chat.completions.create(model=model, messages=messages, stream=True, **params)
+        parts = []
+        try:
+            async for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+        finally:
+            await response.close()
+        content = "".join(parts)
+    else:
+        response = await client.chat.completions.create(model=model, messages=messages, **params)
+        content = response.choices[0].message.content
+    elapsed = time.perf_counter() - started
+    tracker.record(elapsed)
+    metrics.count("llm_requests")
+    metrics.observe("llm_request_seconds", elapsed)
+    return content
+
+
+async def hedged_chat(client, cache: Optional[LLMCache], messages: list, model: str = "gpt-4o-mini",
+                      deadline: float = 20.0, hedge_after: float = None, label: str = "chat",
+                      stream: bool = False, validate: Callable[[str], bool] = None, **params) -> str:
+    """
+    마감 시간이 있는 비동기 chat.completions 호출 (캐시 → 요청 → 필요 시 hedge 요청)
+
+    첫 요청이 label 종류의 최근 p95(표본이 부족하면 hedge_after, 없으면 마감의 절반)보다
+    늦어지거나 실패하면 같은 요청을 한 번 더 보내고 먼저 성공한 응답을 씁니다.
+    남은 요청은 취소합니다.
+
+    Args:
+        client: openai.AsyncOpenAI 클라이언트
+        cache: LLM 응답 캐시 (None이면 항상 API 호출)
+        messages: 대화 메시지
+        model: 모델 이름
+        deadline: 전체 마감 시간(초, hedge 요청 포함)
+        hedge_after: p95 표본이 부족할 때의 hedge 시점(초)
+        label: 응답 시간 통계를 나눌 요청 종류
+        stream: 응답을 스트리밍으로 받기 (긴 응답)
+        validate: 응답 검증 함수 (False인 응답은 캐시에 저장하지 않음)
+        **params: max_tokens, temperature 등 API 파라미터
+
+    Returns:
+        str: 응답 텍스트
+
+    Raises:
+        asyncio.TimeoutError: 마감 시간 안에 응답이 없을 때
+    """
+    key = None
+    if cache is not None:
+        key = LLMCache.make_key(model, messages, params)
+        cached = cache.get(key)
+        if cached is not None:
+            metrics.count("llm_cache_hits")
+            return cached
+
+    tracker = latency_tracker(label, cache)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    end = started + deadline
+    hedge_at = started + (tracker.p95() or hedge_after or deadline / 2)
+
+    def launch():
+        return asyncio.ensure_future(_request(client, model, messages, stream, tracker, params))
+
+    pending = {launch()}
+    hedged = False
+    winner = None
+    error = None
+    try:
+        while pending:
+            wait = (end if hedged else min(end, hedge_at)) - loop.time()
+            done, pending = await asyncio.wait(pending, timeout=max(wait, 0),
+                                               return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    winner = task
+                    break
+                error = task.exception()
+            if winner is not None or loop.time() >= end:
+                break
+            if not hedged and (not pending or loop.time() >= hedge_at):
+                hedged = True
+                metrics.count("llm_hedged")
+                pending.add(launch())
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    if winner is None:
+        if pending or error is None:
+            metrics.count("llm_deadline_misses")
+            # 응답하지 못한 요청도 p95에 반영되도록 마감 시간을 표본으로 기록
+            tracker.record(deadline)
+            raise asyncio.TimeoutError(f"AI 응답 마감 {deadline:g}초 초과")
+        raise error
+
+    content = winner.result()
+    if cache is not None and content and (validate is None or validate(content)):
+        cache.put(key, content)
+    return content
+
+
+class AsyncContentGenerator:
+    """
+    마감 시간·hedging이 적용된 비동기 AI 콘텐츠 생성
+
+    한 이벤트 루프 안에서 쓰고 끝나면 close를 await합니다.
+    생성이 실패하거나 마감을 넘기면 예외 대신 None(또는 정적 내용)을 반환합니다.
+    """
+
+    def __init__(self, api_key: str, cache: Optional[LLMCache] = None, deadline: float = None,
+                 client=None):
+        """
+        Args:
+            api_key: OpenAI API 키
+            cache: LLM 응답 캐시 (선택)
+            deadline: 호출당 마감 시간(초, 기본: AI_DEADLINE 또는 20)
+            client: 비동기 클라이언트 (기본: create_async_client)
+        """
+        self.client = client or create_async_client(api_key)
+        self.cache = cache
+        self.deadline = deadline if deadline is not None else float(os.environ.get("AI_DEADLINE", "20"))
+        hedge_after = os.environ.get("AI_HEDGE_AFTER")
+        self.hedge_after = float(hedge_after) if hedge_after else None
+
+    async def _chat(self, label: str, messages: list, **params) -> str:
+        return await hedged_chat(self.client, self.cache, messages, deadline=self.deadline,
+                                 hedge_after=self.hedge_after, label=label, **params)
+
+    async def generate_supplement(self, topic: dict) -> Optional[str]:
+        """토픽 AI 보충 설명 (실패·마감 초과 시 None)"""
+        try:
+            with metrics.span("ai.supplement"):
+                return await self._chat("supplement", _supplement_messages(topic), max_tokens=500, temperature=0.7)
+        except Exception as e:
+            print(f"AI 보충 설명 생성 실패: {type(e).__name__}: {e}")
+            return None
+
+    async def generate_quiz(self, topic: dict) -> Optional[dict]:
+        """토픽 퀴즈 (실패·마감 초과·형식 오류 시 None)"""
+        try:
+            with metrics.span("ai.quiz"):
+                content = await self._chat(
+                    "quiz", _single_quiz_messages(topic),
+                    validate=lambda text: _parse_quiz(text) is not None,
+                    max_tokens=500, temperature=0.7, response_format={"type": "json_object"},
+                )
+            return _parse_quiz(content)
+        except Exception as e:
+            print(f"퀴즈 생성 실패: {type(e).__name__}: {e}")
+            return None
+
+    async def generate_day(self, topic: dict) -> dict:
+        """
+        보충 설명과 퀴즈를 동시에 생성
+
+        Returns:
+            dict: {"supplement": str|None, "quiz": dict|None}
+        """
+        supplement, quiz = await asyncio.gather(self.generate_supplement(topic), self.generate_quiz(topic))
+        return {"supplement": supplement, "quiz": quiz}
+
+    async def generate_daily_content(self, day: int, curriculum: dict) -> str:
+        """
+        커리큘럼에 없는 일차의 전체 학습 메일 (응답은 스트리밍으로 수신)
+
+        마감 안에 응답이 없거나 실패하면 모듈 개요(정적 내용)로 대체합니다.
+
+        Returns:
+            str: 전체 이메일 HTML
+        """
+        module = _day_module(day, curriculum)
+        try:
+            with metrics.span("ai.daily_content"):
+                content = await self._chat("daily_content", _daily_content_messages(day, module),
+                                           stream=True, max_tokens=1500, temperature=0.7)
+        except Exception as e:
+            print(f"AI 콘텐츠 생성 실패, 정적 내용으로 대체: {type(e).__name__}: {e}")
+            content = None
+        return _daily_page(day, curriculum, module, content or static_module_section(module))
+
+    async def close(self):
+        """클라이언트 연결 종료"""
+        await self.client.close()
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+커리큘럼 로더 및 일차 인덱스
+
+로드 시 day → (module, topic) 인덱스와 모듈 시작일 목록을 만들어
+일차 조회를 O(1), 모듈 범위 조회를 O(log n)으로 처리합니다.
+파싱 결과는 컴파일된 스냅샷(pickle)으로 저장해 다음 실행 시 JSON 파싱을 생략합니다.
+
+대형 과정은 모듈당 파일 하나와 작은 manifest.json으로 나눈 샤드 형식을 지원합니다.
+샤드 형식은 manifest만 읽고, 요청된 일차가 속한 모듈 파일만 필요할 때 엽니다.
+
+로드 시 용어 → 일차 역색인(term_index.TermIndex)도 함께 만들어 스냅샷에 저장하며,
+원본이 바뀌면 이전 스냅샷의 색인을 가져와 바뀐 일차만 다시 색인합니다.
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from term_index import TermIndex
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+CURRICULUM_PATH = DATA_DIR / "curriculum.json"
+SNAPSHOT_PATH = Path(__file__).parent.parent / ".cache" / "curriculum.pickle"
+MANIFEST_NAME = "manifest.json"
+
+# 샤드 manifest 형식 버전
+SHARD_FORMAT = 1
+
+# Curriculum 구조나 스냅샷 형식이 바뀌면 올려서 기존 스냅샷을 무효화
+SNAPSHOT_VERSION = 2
+
+
+class Curriculum(dict):
+    """일차 인덱스를 가진 커리큘럼 dict (JSON 구조 그대로 접근 가능)"""
+
+    def __init__(self, data: dict, term_index: TermIndex = None):
+        """
+        Args:
+            data: curriculum.json 내용
+            term_index: 이전 버전의 용어 색인 (있으면 바뀐 일차만 다시 색인)
+        """
+        super().__init__(data)
+        self.build_index(term_index)
+
+    def build_index(self, term_index: TermIndex = None):
+        """day → (module, topic) 인덱스, 모듈 시작일 목록, 용어 색인 생성"""
+        self._day_index = {}
+        modules = sorted(self.get("modules", []), key=lambda m: m["start_day"])
+        for module in modules:
+            for topic in module.get("topics", []):
+                self._day_index.setdefault(topic["day"], (module, topic))
+        self._module_starts = [m["start_day"] for m in modules]
+        self._modules = modules
+
+        self.term_index = term_index or TermIndex()
+        self.term_index.update({day: topic for day, (_, topic) in self._day_index.items()})
+
+    def topic_for_day(self, day: int) -> Optional[dict]:
+        """특정 일차의 {"module", "topic"} (없으면 None)"""
+        entry = self._day_index.get(day)
+        if entry is None:
+            return None
+        return {"module": entry[0], "topic": entry[1]}
+
+    def module_for_day(self, day: int) -> Optional[dict]:
+        """일차가 속한 모듈 (start_day ≤ day < start_day + duration_days)"""
+        i = bisect.bisect_right(self._module_starts, day) - 1
+        if i < 0:
+            return None
+        module = self._modules[i]
+        if day < module["start_day"] + module["duration_days"]:
+            return module
+        return None
+
+
+class ShardedCurriculum(Curriculum):
+    """
+    모듈별 샤드 파일을 필요할 때만 읽는 커리큘럼
+
+    manifest의 모듈 범위로 일차가 속한 샤드를 찾고, 최근 사용한 샤드만
+    메모리에 유지합니다(스레드 간 공유 가능). curriculum["modules"]에 접근하면 모든 샤드를 읽습니다.
+    """
+
+    def __init__(self, directory: Path, max_loaded_shards: int = 4):
+        """
+        Args:
+            directory: manifest.json이 있는 샤드 디렉터리
+            max_loaded_shards: 메모리에 유지할 최대 샤드 수
+        """
+        self.directory = Path(directory)
+        with open(self.directory / MANIFEST_NAME, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != SHARD_FORMAT:
+            raise ValueError(f"지원하지 않는 샤드 형식: {manifest.get('format')}")
+
+        dict.__init__(self, program_info=manifest["program_info"])
+        self.max_loaded_shards = max_loaded_shards
+        self._shards = OrderedDict()
+        self._shards_lock = threading.Lock()
+
+        entries = sorted(manifest["modules"], key=lambda m: m["day_range"][0])
+        self._entries = entries
+        self._range_starts = [m["day_range"][0] for m in entries]
+        self._modules = [{k: v for k, v in m.items() if k not in ("shard", "day_range")}
+                         for m in entries]
+        self._module_starts = [m["start_day"] for m in self._modules]
+        self.term_index = TermIndex.from_manifest(manifest.get("term_index"))
+
+    def __missing__(self, key):
+        if key != "modules":
+            raise KeyError(key)
+        modules = [self._load_shard(entry)[0] for entry in self._entries]
+        self["modules"] = modules
+        return modules
+
+    def _load_shard(self, entry: dict) -> tuple:
+        """샤드 파일을 읽어 (module, {day: topic}) 반환 (LRU 유지)"""
+        name = entry["shard"]
+        # AI 사전 생성 스레드 풀 등에서 동시에 불려도 LRU 순서가 깨지지 않도록 잠금 안에서 처리
+        with self._shards_lock:
+            if name in self._shards:
+                self._shards.move_to_end(name)
+                return self._shards[name]
+
+            with open(self.directory / name, "r", encoding="utf-8") as f:
+                module = json.load(f)
+            shard = (module, {topic["day"]: topic for topic in module.get("topics", [])})
+
+            self._shards[name] = shard
+            if len(self._shards) > self.max_loaded_shards:
+                self._shards.popitem(last=False)
+            return shard
+
+    def topic_for_day(self, day: int) -> Optional[dict]:
+        """특정 일차의 {"module", "topic"} (해당 샤드만 읽음)"""
+        i = bisect.bisect_right(self._range_starts, day) - 1
+        if i < 0 or day > self._entries[i]["day_range"][1]:
+            return None
+        module, topics = self._load_shard(self._entries[i])
+        topic = topics.get(day)
+        if topic is None:
+            return None
+        return {"module": module, "topic": topic}
+
+
+def write_shards(curriculum: dict, directory: Path) -> Path:
+    """
+    커리큘럼을 모듈별 샤드 파일과 manifest.json으로 저장
+
+    manifest에는 조회용 용어 색인도 넣어, 관련 이전 학습을 찾을 때 샤드를 열지 않습니다.
+
+    Args:
+        curriculum: 커리큘럼 데이터
+        directory: 출력 디렉터리
+
+    Returns:
+        Path: manifest 경로
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    entries = []
+    for module in curriculum["modules"]:
+        days = [topic["day"] for topic in module.get("topics", [])]
+        if not days:
+            continue
+        name = f"module_{module['module_id']:03d}.json"
+        _write_json(directory / name, module)
+        entry = {k: v for k, v in module.items() if k != "topics"}
+        entry.update(shard=name, day_range=[min(days), max(days)])
+        entries.append(entry)
+
+    for stale in directory.glob("module_*.json"):
+        if stale.name not in {entry["shard"] for entry in entries}:
+            stale.unlink()
+
+    term_index = getattr(curriculum, "term_index", None) or Curriculum(curriculum).term_index
+    manifest = {"format": SHARD_FORMAT, "program_info": curriculum["program_info"], "modules": entries,
+                "term_index": term_index.to_manifest()}
+    manifest_path = directory / MANIFEST_NAME
+    _write_json(manifest_path, manifest)
+    return manifest_path
+
+
+def _write_json(path: Path, data):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def get_topic_for_day(curriculum: dict, day: int) -> dict:
+    """특정 일차의 학습 주제 가져오기"""
+    if isinstance(curriculum, Curriculum):
+        return curriculum.topic_for_day(day)
+    for module in curriculum["modules"]:
+        for topic in module.get("topics", []):
+            if topic["day"] == day:
+                return {"module": module, "topic": topic}
+    return None
+
+
+def get_module_for_day(curriculum: dict, day: int) -> Optional[dict]:
+    """일차가 속한 모듈 가져오기 (없으면 None)"""
+    if isinstance(curriculum, Curriculum):
+        return curriculum.module_for_day(day)
+    for module in curriculum["modules"]:
+        if module["start_day"] <= day < module["start_day"] + module["duration_days"]:
+            return module
+    return None
+
+
+def _file_sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _load_snapshot(snapshot: Path) -> Optional[dict]:
+    """현재 형식 버전의 스냅샷 데이터 (없거나 읽을 수 없으면 None)"""
+    try:
+        with open(snapshot, "rb") as f:
+            data = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+        return None
+    return data
+
+
+def _read_snapshot(source: Path, snapshot: Path, data: Optional[dict]) -> Optional[Curriculum]:
+    """원본의 mtime/크기(불일치 시 해시)가 같을 때만 스냅샷 반환 (data: _load_snapshot 결과)"""
+    if data is None or data.get("source") != str(source):
+        return None
+
+    stat = source.stat()
+    if (data["mtime_ns"], data["size"]) == (stat.st_mtime_ns, stat.st_size):
+        return data["curriculum"]
+
+    # 체크아웃 등으로 mtime만 바뀐 경우 해시로 재확인
+    if data["sha256"] == _file_sha256(source):
+        _write_snapshot(source, snapshot, data["curriculum"], data["sha256"])
+        return data["curriculum"]
+    return None
+
+
+def _write_snapshot(source: Path, snapshot: Path, curriculum: Curriculum, sha256: str = None):
+    stat = source.stat()
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "source": str(source),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": sha256 or _file_sha256(source),
+        "curriculum": curriculum,
+    }
+    try:
+        snapshot.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=snapshot.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, snapshot)
+    except OSError as e:
+        print(f"⚠️ 커리큘럼 스냅샷 저장 실패: {e}")
+
+
+def curriculum_source(path: Path = None) -> Path:
+    """커리큘럼 원본 경로 (인자 → CURRICULUM_PATH 환경 변수 → data/curriculum.json)"""
+    return Path(path or os.environ.get("CURRICULUM_PATH") or CURRICULUM_PATH)
+
+
+def source_stamp(path: Path = None) -> Optional[tuple]:
+    """
+    커리큘럼 원본 변경 감지용 (mtime_ns, 크기)
+
+    샤드 디렉터리면 manifest와 샤드 파일 각각의 (이름, mtime_ns, 크기) 묶음이라
+    manifest를 다시 쓰지 않고 샤드 파일만 고쳐도 감지합니다. 원본이 없으면 None.
+    """
+    source = curriculum_source(path)
+    if source.is_dir():
+        try:
+            with os.scandir(source) as entries:
+                stamps = [(entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+                          for entry in entries if entry.name.endswith(".json") and entry.is_file()]
+        except OSError:
+            return None
+        if not any(name == MANIFEST_NAME for name, _, _ in stamps):
+            return None
+        return tuple(sorted(stamps))
+    try:
+        stat = source.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def snapshot_path(path: Path = None) -> Path:
+    """스냅샷 파일 경로 (인자 → CURRICULUM_SNAPSHOT_PATH 환경 변수 → 저장소/.cache/curriculum.pickle)"""
+    return Path(path or os.environ.get("CURRICULUM_SNAPSHOT_PATH") or SNAPSHOT_PATH)
+
+
+def load_curriculum(path: Path = None, use_snapshot: bool = None, previous: Curriculum = None,
+                    snapshot: Path = None) -> Curriculum:
+    """
+    커리큘럼 데이터 로드
+
+    Args:
+        path: curriculum.json 경로 또는 샤드 디렉터리
+            (기본: CURRICULUM_PATH 환경 변수, 없으면 data/curriculum.json)
+        use_snapshot: 컴파일된 스냅샷 사용 여부
+            (기본: CURRICULUM_SNAPSHOT 환경 변수, 없으면 사용)
+        previous: 메모리에 있는 이전 커리큘럼 (다시 읽을 때 용어 색인을 바뀐 일차만 갱신)
+        snapshot: 스냅샷 파일 경로
+            (기본: CURRICULUM_SNAPSHOT_PATH 환경 변수, 없으면 저장소/.cache/curriculum.pickle)
+
+    Returns:
+        Curriculum: 일차 인덱스가 포함된 커리큘럼
+            (샤드 디렉터리면 ShardedCurriculum)
+    """
+    source = curriculum_source(path)
+    if source.is_dir():
+        return ShardedCurriculum(source)
+
+    if use_snapshot is None:
+        use_snapshot = os.environ.get("CURRICULUM_SNAPSHOT", "true").lower() != "false"
+
+    previous = previous.term_index if previous is not None else None
+    snapshot = snapshot_path(snapshot)
+    if use_snapshot:
+        data = _load_snapshot(snapshot)
+        curriculum = _read_snapshot(source, snapshot, data)
+        if curriculum is not None:
+            return curriculum
+        if previous is None and data is not None and data.get("source") == str(source):
+            previous = data["curriculum"].term_index
+
+    with open(source, "r", encoding="utf-8") as f:
+        curriculum = Curriculum(json.load(f), term_index=previous)
+
+    if use_snapshot:
+        _write_snapshot(source, snapshot, curriculum)
+    return curriculum
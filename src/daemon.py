@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+상주 발송 데몬 (python main.py daemon)
+
+GitHub Actions cron은 실행마다 체크아웃, 패키지 설치, 인터프리터 시작, SMTP 로그인을
+새로 하고 모든 수신자에게 같은 UTC 시각에 보냅니다. 데몬은 한 프로세스에서
+커리큘럼, 렌더 캐시, 상태 저장소, 복습 스케줄러, SMTP 연결 풀을 메모리에 유지하고
+수신자마다 현지 아침(timezone, send_time)에 맞춰 발송합니다.
+
+- 발송 시각은 (다음 발송 UTC 시각, 시간대, 현지 시각) 슬롯 단위로 heap에 넣고
+  가장 이른 슬롯까지 잠듭니다. 같은 슬롯의 수신자는 한 번에 발송합니다.
+- 실행 키는 수신자 현지 날짜라 재시작해 같은 날 다시 보내도 발송함이 중복을 막습니다
+  (cron 실행은 서버 날짜를 쓰므로 데몬과 함께 돌리지 않습니다).
+- 최대 poll초마다 커리큘럼·명단 파일 변경을 확인해 재시작 없이 다시 읽습니다
+  (용어 색인은 바뀐 일차만 갱신, 렌더 캐시는 토픽 해시가 바뀐 일차만 다시 렌더링).
+- 다음 발송까지 SMTP_IDLE_TIMEOUT초보다 많이 남으면 유휴 SMTP 연결을 닫습니다
+  (서버가 유휴 세션을 끊기 전에 정리하고, 다음 발송에서 다시 로그인).
+"""
+
+import heapq
+import os
+import signal
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from curriculum import load_curriculum, source_stamp
+import main
+import metrics
+
+DEFAULT_TIMEZONE = "Asia/Seoul"
+DEFAULT_SEND_TIME = "08:00"
+
+Slot = Tuple[str, str]  # (IANA 시간대, 현지 "HH:MM")
+
+
+def parse_send_time(value: str) -> Tuple[int, int]:
+    """'HH:MM' → (시, 분)"""
+    hour, _, minute = value.partition(":")
+    hour, minute = int(hour), int(minute or 0)
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"잘못된 발송 시각: {value}")
+    return hour, minute
+
+
+def next_send(slot: Slot, now: datetime, grace: timedelta = timedelta(0)) -> Tuple[datetime, date]:
+    """
+    슬롯의 다음 발송 시각
+
+    오늘 현지 발송 시각이 grace 이내로 지났으면 지금 바로 보냅니다 (재시작·지연 시 놓친 발송).
+
+    Args:
+        slot: (시간대, 현지 발송 시각)
+        now: 현재 시각 (timezone-aware)
+        grace: 지난 발송을 따라잡을 허용 시간
+
+    Returns:
+        tuple: (발송 시각(UTC), 수신자 현지 발송일)
+    """
+    zone = ZoneInfo(slot[0])
+    hour, minute = parse_send_time(slot[1])
+    local_now = now.astimezone(zone)
+    for offset in (0, 1):
+        local_day = local_now.date() + timedelta(days=offset)
+        # 서머타임 전환으로 없는 시각은 fold=0 기준으로 정규화됨
+        at = datetime(local_day.year, local_day.month, local_day.day, hour, minute, tzinfo=zone)
+        if at >= local_now:
+            return at.astimezone(ZoneInfo("UTC")), local_day
+        if local_now - at <= grace:
+            return now.astimezone(ZoneInfo("UTC")), local_day
+    raise AssertionError("unreachable")
+
+
+def recipient_slot(recipient: dict, default_timezone: str, default_send_time: str) -> Slot:
+    """수신자의 발송 슬롯 (잘못된 시간대·시각은 기본값으로 대체)"""
+    timezone = recipient.get("timezone") or default_timezone
+    send_time = recipient.get("send_time") or default_send_time
+    try:
+        ZoneInfo(timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        print(f"⚠️ 알 수 없는 시간대 {timezone!r} ({recipient['email']}), {default_timezone} 사용")
+        timezone = default_timezone
+    try:
+        parse_send_time(send_time)
+    except ValueError:
+        print(f"⚠️ 잘못된 발송 시각 {send_time!r} ({recipient['email']}), {default_send_time} 사용")
+        send_time = default_send_time
+    return timezone, send_time
+
+
+class SendDaemon:
+    """수신자 현지 시각 기준 타이머 heap으로 발송하는 상주 프로세스"""
+
+    def __init__(self, sender_email: str, sender_password: str, default_timezone: str = DEFAULT_TIMEZONE,
+                 default_send_time: str = DEFAULT_SEND_TIME, poll: float = 60.0,
+                 grace: float = 3 * 3600, idle_timeout: float = 60.0):
+        """
+        Args:
+            sender_email: 보내는 사람
+            sender_password: SMTP 비밀번호
+            default_timezone: 명단에 timezone이 없는 수신자의 시간대
+            default_send_time: 명단에 send_time이 없는 수신자의 현지 발송 시각 (HH:MM)
+            poll: 커리큘럼·명단 변경 확인 간격(초)
+            grace: 시작·재시작 시 이미 지난 오늘 발송을 따라잡을 허용 시간(초)
+            idle_timeout: 다음 발송까지 이보다 오래 남으면 유휴 SMTP 연결을 닫음(초)
+        """
+        self.default_timezone = default_timezone
+        self.default_send_time = default_send_time
+        self.poll = poll
+        self.grace = timedelta(seconds=grace)
+        self.idle_timeout = idle_timeout
+
+        self.email_sender = main.create_sender(sender_email, sender_password)
+        self.email_sender.open_shared_pool(main.env_int("SMTP_CONCURRENCY", 3))
+        self.cache = main.get_render_cache()
+        self.store = main.get_state_store()
+        self.scheduler = main.get_review_scheduler()
+        self.curriculum = load_curriculum()
+        self._curriculum_stamp = source_stamp()
+        self.roster = []
+        self._slots = {}        # 슬롯 → 수신자 이메일 set (명단을 읽을 때 계산)
+        self._roster_stamp = None
+        self._heap = []         # [발송 UTC timestamp, 슬롯, 현지 발송일]
+        self._scheduled = set()  # heap에 있는 슬롯
+        self._stop = threading.Event()
+
+    def _roster_file_stamp(self) -> Optional[tuple]:
+        path = os.environ.get("RECIPIENTS_FILE")
+        if not path:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload_curriculum(self) -> bool:
+        """커리큘럼 원본이 바뀌었으면 다시 읽기 (용어 색인은 바뀐 일차만 갱신)"""
+        stamp = source_stamp()
+        if stamp == self._curriculum_stamp:
+            return False
+        try:
+            curriculum = load_curriculum(previous=self.curriculum)
+        except (OSError, ValueError) as e:
+            # 편집 중인 파일 등 읽을 수 없으면 이전 커리큘럼을 계속 사용하고 다음 확인 때 재시도
+            print(f"⚠️ 커리큘럼 다시 읽기 실패, 이전 버전 유지: {e}")
+            return False
+        self.curriculum = curriculum
+        self._curriculum_stamp = stamp
+        print("🔄 커리큘럼 변경 반영")
+        return True
+
+    def reload_roster(self, force: bool = False) -> bool:
+        """명단을 다시 읽고 새 슬롯을 heap에 추가 (RECIPIENTS_FILE이면 바뀌었을 때만)"""
+        stamp = self._roster_file_stamp()
+        if not force and (stamp is None or stamp == self._roster_stamp):
+            return False
+        try:
+            roster = main.load_roster()
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ 명단 다시 읽기 실패, 이전 명단 유지: {e}")
+            return False
+        slots = {}
+        for recipient in roster:
+            slot = recipient_slot(recipient, self.default_timezone, self.default_send_time)
+            slots.setdefault(slot, set()).add(recipient["email"])
+        self.roster = roster
+        self._slots = slots
+        self._roster_stamp = stamp
+        now = datetime.now(ZoneInfo("UTC"))
+        for slot in sorted(set(slots) - self._scheduled):
+            self._schedule(slot, now)
+        return True
+
+    def _schedule(self, slot: Slot, now: datetime, grace: timedelta = None):
+        at, local_day = next_send(slot, now, self.grace if grace is None else grace)
+        heapq.heappush(self._heap, [at.timestamp(), slot, local_day])
+        self._scheduled.add(slot)
+
+    def run_due(self) -> int:
+        """발송 시각이 된 슬롯 발송"""
+        sent = 0
+        while self._heap and self._heap[0][0] <= time.time():
+            _, slot, local_day = heapq.heappop(self._heap)
+            self._scheduled.discard(slot)
+            emails = self._slots.get(slot)
+            if not emails:
+                # 명단에서 사라진 슬롯은 다시 예약하지 않음 (수신자가 다시 생기면 reload_roster가 추가)
+                continue
+            print(f"⏰ {local_day} {slot[1]} ({slot[0]}) 발송: {len(emails)}명")
+            try:
+                with metrics.span("daemon.send"):
+                    main.send_lessons(self.curriculum, self.roster, local_day, self.email_sender,
+                                      self.store, self.scheduler, self.cache, emails)
+            except Exception as e:
+                # 한 슬롯의 오류로 데몬이 멈추지 않도록 기록만 하고 다음 날 다시 예약
+                print(f"❌ {slot[0]} {slot[1]} 발송 오류: {type(e).__name__}: {e}")
+            finally:
+                if self.scheduler is not None:
+                    self.scheduler.save()
+            sent += len(emails)
+            # 오늘 발송은 끝났으므로 따라잡기 없이 다음 발송일로 예약
+            self._schedule(slot, datetime.now(ZoneInfo("UTC")), grace=timedelta(0))
+        return sent
+
+    def next_wakeup(self) -> float:
+        """다음으로 깨어날 시각 (다음 발송과 변경 확인 중 이른 쪽)"""
+        wake = time.time() + self.poll
+        if self._heap:
+            wake = min(wake, self._heap[0][0])
+        return wake
+
+    def stop(self, *_):
+        """현재 발송을 마친 뒤 종료"""
+        self._stop.set()
+
+    def run(self) -> int:
+        """종료 신호를 받을 때까지 실행"""
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, self.stop)
+        self.reload_roster(force=True)
+        if not self.roster:
+            print("Error: 수신자 명단이 비어 있습니다.")
+            return 1
+        print(f"🕰️ 발송 데몬 시작: 수신자 {len(self.roster)}명, 발송 슬롯 {len(self._scheduled)}개")
+        self._report_next()
+
+        try:
+            while not self._stop.is_set():
+                self.reload_curriculum()
+                self.reload_roster()
+                if self.run_due():
+                    self._report_next()
+                if self._heap and self._heap[0][0] - time.time() > self.idle_timeout:
+                    self.email_sender.shared_pool.close()
+                self._stop.wait(max(0.0, self.next_wakeup() - time.time()))
+        finally:
+            self.email_sender.shared_pool.close()
+            if self.scheduler is not None:
+                self.scheduler.save()
+            if self.store is not None:
+                self.store.close()
+        print("👋 발송 데몬 종료")
+        return 0
+
+    def _report_next(self):
+        if self._heap:
+            at, slot, local_day = self._heap[0]
+            print(f"💤 다음 발송: {local_day} {slot[1]} ({slot[0]}), "
+                  f"UTC {datetime.fromtimestamp(at, ZoneInfo('UTC')):%Y-%m-%d %H:%M}")
+
+
+def run_daemon() -> int:
+    """환경 변수 설정으로 발송 데몬 실행"""
+    sender_email = os.environ.get("SENDER_EMAIL")
+    sender_password = os.environ.get("SENDER_PASSWORD")
+    if not all([sender_email, sender_password]):
+        print("Error: 필수 환경 변수가 설정되지 않았습니다.")
+        return 1
+    daemon = SendDaemon(
+        sender_email, sender_password,
+        default_timezone=os.environ.get("SEND_TIMEZONE") or DEFAULT_TIMEZONE,
+        default_send_time=os.environ.get("SEND_TIME") or DEFAULT_SEND_TIME,
+        poll=main.env_int("DAEMON_POLL", 60),
+        grace=main.env_int("DAEMON_CATCHUP_HOURS", 3) * 3600,
+        idle_timeout=main.env_int("SMTP_IDLE_TIMEOUT", 60),
+    )
+    return daemon.run()
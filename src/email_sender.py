@@ -3,25 +3,269 @@
 Gmail SMTP를 이용한 이메일 발송 모듈
 """
 
+import contextlib
+import queue
 import smtplib
+import ssl
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from email.header import Header
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from email.utils import formatdate
+from email.policy import compat32
+from email.utils import formatdate, make_msgid
+from typing import Callable, List, Optional
+
+import metrics
+
+
+DEFAULT_TEXT_CONTENT = "이 이메일은 HTML 형식입니다. HTML을 지원하는 이메일 클라이언트에서 확인해 주세요."
+
+# 사전 인코딩 템플릿 직렬화 정책 (SMTP 전송용 CRLF 줄바꿈)
+_SMTP_POLICY = compat32.clone(linesep="\r\n")
+
+# EmailSender가 보관할 최근 메시지 템플릿 수 (일차별 본문 하나씩)
+TEMPLATE_CACHE_SIZE = 128
+
+# 서버가 세션을 끊었음을 나타내는 응답 코드 (재연결 후 재시도 대상)
+RECONNECT_CODES = (421,)
+
+AUTH_ERROR = "인증 실패: Gmail 앱 비밀번호를 확인해 주세요."
+
+
+def is_temporary_error(error: Exception) -> bool:
+    """재시도할 가치가 있는 일시 오류(4xx, 연결 끊김)인지 판별"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+        return bool(codes) and all(400 <= code < 500 for code in codes)
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError))
+
+
+class SMTPConnectionPool:
+    """인증을 마친 SMTP 연결을 재사용하기 위한 소형 연결 풀
+
+    연결은 필요할 때 생성되며 반환된 연결은 다음 발송에 재사용됩니다.
+    하나의 연결로 max_messages 건을 보내면 새 연결로 교체합니다.
+    """
+
+    def __init__(self, connect, size: int = 3, max_messages: int = 100):
+        """
+        Args:
+            connect: 인증된 smtplib.SMTP 객체를 반환하는 함수
+            size: 최대 동시 연결 수
+            max_messages: 연결 하나당 최대 발송 건수
+        """
+        self._connect = connect
+        self.size = size
+        self.max_messages = max_messages
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def acquire(self) -> smtplib.SMTP:
+        """유휴 연결을 꺼내거나 새 연결 생성"""
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            server = self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._counts[id(server)] = 0
+        return server
+
+    def release(self, server: smtplib.SMTP, broken: bool = False):
+        """연결 반환 (끊어졌거나 발송 한도에 도달한 연결은 닫음)"""
+        with self._lock:
+            count = self._counts.get(id(server), 0) + (0 if broken else 1)
+            self._counts[id(server)] = count
+        if broken or count >= self.max_messages:
+            self._discard(server, quit_server=not broken)
+        else:
+            self._idle.put(server)
+        self._slots.release()
+
+    def _discard(self, server: smtplib.SMTP, quit_server: bool = True):
+        with self._lock:
+            self._counts.pop(id(server), None)
+        try:
+            if quit_server:
+                server.quit()
+            else:
+                server.close()
+        except Exception:
+            pass
+
+    def close(self):
+        """유휴 연결 모두 종료"""
+        while True:
+            try:
+                server = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(server)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MessageTemplate:
+    """
+    본문을 한 번만 인코딩해 두고 수신자별 헤더만 붙이는 메시지 템플릿
+
+    공통 헤더(Content-Type, MIME-Version, Subject, From)와 multipart 본문을
+    CRLF 줄바꿈 바이트로 미리 직렬화하고, render 시 To/Date/Message-ID 헤더만
+    만들어 그 사이에 끼워 넣습니다.
+    """
+
+    def __init__(self, body: MIMEMultipart, msgid_domain: str = None):
+        """
+        Args:
+            body: 수신자별 헤더가 없는 MIME 메시지 (EmailSender._build_body)
+            msgid_domain: Message-ID 도메인
+        """
+        raw = body.as_bytes(policy=_SMTP_POLICY)
+        headers, _, payload = raw.partition(b"\r\n\r\n")
+        self.headers = headers + b"\r\n"
+        self.body = b"\r\n" + payload
+        self.msgid_domain = msgid_domain
+
+    def render(self, to_email: str) -> bytes:
+        """수신자 헤더를 붙인 전체 메시지 바이트"""
+        if "\r" in to_email or "\n" in to_email:
+            raise ValueError(f"잘못된 수신자 주소: {to_email!r}")
+        to_header = to_email if to_email.isascii() else Header(to_email, "utf-8").encode()
+        return b"".join((
+            self.headers,
+            b"To: ", to_header.encode("ascii"),
+            b"\r\nDate: ", formatdate(localtime=True).encode("ascii"),
+            b"\r\nMessage-ID: ", make_msgid(domain=self.msgid_domain).encode("ascii"),
+            b"\r\n", self.body,
+        ))
 
 
 class EmailSender:
     """Gmail SMTP를 통한 이메일 발송 클래스"""
 
-    def __init__(self, sender_email: str, sender_password: str):
+    def __init__(self, sender_email: str, sender_password: str,
+                 smtp_server: str = "smtp.gmail.com", smtp_port: int = 587,
+                 starttls: bool = True, ssl_context: ssl.SSLContext = None):
         """
         Args:
             sender_email: 발신자 Gmail 주소
             sender_password: Gmail 앱 비밀번호 (2단계 인증 필요)
+            smtp_server: SMTP 서버 주소 (부하 테스트 시 로컬 서버)
+            smtp_port: SMTP 포트
+            starttls: STARTTLS 사용 여부
+            ssl_context: STARTTLS에 사용할 SSL 컨텍스트 (기본: smtplib 기본값)
         """
         self.sender_email = sender_email
         self.sender_password = sender_password
-        self.smtp_server = "smtp.gmail.com"
-        self.smtp_port = 587
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.starttls = starttls
+        self.ssl_context = ssl_context
+        self._templates = OrderedDict()
+        self._templates_lock = threading.Lock()
+        # 상주 프로세스(데몬)가 발송 사이에 유지하는 연결 풀 (없으면 발송마다 새로 생성)
+        self.shared_pool = None
+
+    def open_shared_pool(self, size: int = 3, max_messages: int = 100) -> SMTPConnectionPool:
+        """발송 호출 사이에 인증된 연결을 유지하는 공유 연결 풀 생성"""
+        if self.shared_pool is None:
+            self.shared_pool = SMTPConnectionPool(self._connect, size, max_messages)
+        return self.shared_pool
+
+    @contextlib.contextmanager
+    def connection_pool(self, size: int, max_messages: int = 100):
+        """공유 연결 풀이 있으면 그대로(닫지 않고), 없으면 이번 발송용 풀 생성"""
+        if self.shared_pool is not None:
+            yield self.shared_pool
+            return
+        with SMTPConnectionPool(self._connect, size, max_messages) as pool:
+            yield pool
+
+    @property
+    def msgid_domain(self) -> Optional[str]:
+        """Message-ID에 쓸 발신자 도메인"""
+        return self.sender_email.rpartition("@")[2] or None
+
+    def _build_body(self, subject: str, html_content: str, text_content: str = None) -> MIMEMultipart:
+        """수신자별 헤더(To, Date, Message-ID)를 뺀 HTML/텍스트 대체 본문 MIME 메시지"""
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = subject
+        msg["From"] = f"SWRO Learning <{self.sender_email}>"
+
+        # 텍스트 버전 (HTML을 지원하지 않는 클라이언트용)
+        if text_content is None:
+            text_content = DEFAULT_TEXT_CONTENT
+
+        part1 = MIMEText(text_content, "plain", "utf-8")
+        part2 = MIMEText(html_content, "html", "utf-8")
+
+        msg.attach(part1)
+        msg.attach(part2)
+        return msg
+
+    def _build_message(self, to_email: str, subject: str, html_content: str,
+                       text_content: str = None) -> MIMEMultipart:
+        """HTML/텍스트 대체 본문을 가진 MIME 메시지 구성"""
+        msg = self._build_body(subject, html_content, text_content)
+        msg["To"] = to_email
+        msg["Date"] = formatdate(localtime=True)
+        msg["Message-ID"] = make_msgid(domain=self.msgid_domain)
+        return msg
+
+    def build_template(self, subject: str, html_content: str,
+                       text_content: str = None) -> MessageTemplate:
+        """
+        같은 본문을 받는 수신자들이 공유할 사전 인코딩 메시지 템플릿
+
+        (제목, 본문)이 같으면 최근 템플릿을 재사용하므로 같은 일차의 수신자들은
+        본문 인코딩(UTF-8 → base64)을 한 번만 수행합니다.
+        """
+        key = (subject, html_content, text_content)
+        with self._templates_lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+                return template
+
+        template = MessageTemplate(self._build_body(subject, html_content, text_content), self.msgid_domain)
+        with self._templates_lock:
+            self._templates[key] = template
+            if len(self._templates) > TEMPLATE_CACHE_SIZE:
+                self._templates.popitem(last=False)
+        return template
+
+    def _connect(self) -> smtplib.SMTP:
+        """STARTTLS(설정 시) 및 로그인까지 마친 SMTP 연결 생성"""
+        with metrics.span("smtp.connect"):
+            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        try:
+            server.ehlo()
+            if self.starttls:
+                with metrics.span("smtp.starttls"):
+                    server.starttls(context=self.ssl_context)
+                    server.ehlo()
+            with metrics.span("smtp.login"):
+                server.login(self.sender_email, self.sender_password)
+        except Exception:
+            server.close()
+            raise
+        return server
 
     def send_html_email(self, to_email: str, subject: str, html_content: str,
                         text_content: str = None) -> bool:
@@ -39,46 +283,153 @@ class EmailSender:
         """
         try:
             # 메시지 구성
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = f"SWRO Learning <{self.sender_email}>"
-            msg["To"] = to_email
-            msg["Date"] = formatdate(localtime=True)
-
-            # 텍스트 버전 (HTML을 지원하지 않는 클라이언트용)
-            if text_content is None:
-                text_content = "이 이메일은 HTML 형식입니다. HTML을 지원하는 이메일 클라이언트에서 확인해 주세요."
-
-            part1 = MIMEText(text_content, "plain", "utf-8")
-            part2 = MIMEText(html_content, "html", "utf-8")
-
-            msg.attach(part1)
-            msg.attach(part2)
+            with metrics.span("smtp.build_message"):
+                payload = self.build_template(subject, html_content, text_content).render(to_email)
 
             # SMTP 연결 및 발송
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.ehlo()
-                server.starttls()
-                server.ehlo()
-                server.login(self.sender_email, self.sender_password)
-                server.sendmail(self.sender_email, to_email, msg.as_string())
+            started = time.perf_counter()
+            with self._connect() as server:
+                with metrics.span("smtp.data"):
+                    server.sendmail(self.sender_email, to_email, payload)
 
+            metrics.observe("message_bytes", len(payload))
+            metrics.record_recipient(to_email, True, len(payload), time.perf_counter() - started)
             print(f"📧 이메일 발송 완료: {to_email}")
             return True
 
-        except smtplib.SMTPAuthenticationError:
+        except smtplib.SMTPAuthenticationError as e:
+            metrics.record_recipient(to_email, False, error=str(e))
             print("❌ 인증 실패: Gmail 앱 비밀번호를 확인해 주세요.")
             print("   (Gmail 2단계 인증 활성화 후 앱 비밀번호 생성 필요)")
             return False
 
         except smtplib.SMTPException as e:
+            metrics.record_recipient(to_email, False, error=str(e))
             print(f"❌ SMTP 에러: {e}")
             return False
 
         except Exception as e:
+            metrics.record_recipient(to_email, False, error=str(e))
             print(f"❌ 이메일 발송 실패: {e}")
             return False
 
+    def build_payload(self, message: dict) -> bytes:
+        """메시지 dict를 SMTP로 보낼 MIME 바이트로 직렬화 (본문은 템플릿 공유, 이미 직렬화된 payload는 그대로)"""
+        if message.get("payload"):
+            return message["payload"]
+        template = self.build_template(message["subject"], message["html_content"], message.get("text_content"))
+        return template.render(message["to_email"])
+
+    def _send_pooled(self, pool: SMTPConnectionPool, message: dict) -> dict:
+        """
+        풀의 연결로 메시지 1건 발송 (세션이 끊겼으면 1회 재연결 후 재시도)
+
+        message에 "payload"(직렬화된 MIME 바이트)가 있으면 그대로 보냅니다.
+        """
+        to_email = message["to_email"]
+        payload = message.get("payload")
+        if not payload:
+            with metrics.span("smtp.build_message"):
+                payload = self.build_payload(message)
+
+        started = time.perf_counter()
+        try:
+            for attempt in range(2):
+                server = pool.acquire()
+                try:
+                    with metrics.span("smtp.data"):
+                        server.sendmail(self.sender_email, to_email, payload)
+                except smtplib.SMTPServerDisconnected:
+                    pool.release(server, broken=True)
+                    if attempt == 0:
+                        continue
+                    raise
+                except smtplib.SMTPRecipientsRefused:
+                    # 수신자만 거부된 것이므로 세션은 정상: 풀에 반환해 재사용
+                    pool.release(server)
+                    raise
+                except smtplib.SMTPResponseException as e:
+                    if e.smtp_code in RECONNECT_CODES:
+                        pool.release(server, broken=True)
+                        if attempt == 0:
+                            continue
+                    else:
+                        pool.release(server)
+                    raise
+                except Exception:
+                    pool.release(server, broken=True)
+                    raise
+                pool.release(server)
+                break
+        except Exception as e:
+            metrics.record_recipient(to_email, False, len(payload), time.perf_counter() - started, str(e))
+            raise
+
+        metrics.observe("message_bytes", len(payload))
+        metrics.record_recipient(to_email, True, len(payload), time.perf_counter() - started)
+        return {"to_email": to_email, "success": True, "error": None, "temporary": False}
+
+    def send_batch(self, messages: List[dict], pool_size: int = 3,
+                   max_messages_per_connection: int = 100,
+                   on_result: Optional[Callable[[dict], None]] = None) -> List[dict]:
+        """
+        여러 HTML 이메일을 연결 풀로 일괄 발송
+
+        연결마다 EHLO/STARTTLS/LOGIN은 한 번만 수행하고 여러 건을 보냅니다.
+        서버가 세션을 끊으면 새 연결로 자동 재시도합니다.
+
+        Args:
+            messages: send_html_email 인자와 같은 키를 가진 dict 목록
+                (to_email, subject, html_content, text_content(선택))
+                또는 직렬화된 MIME을 담은 dict (to_email, payload)
+            pool_size: 동시에 유지할 SMTP 연결 수
+            max_messages_per_connection: 연결 하나당 최대 발송 건수
+            on_result: 메시지마다 발송 직후 결과 dict로 호출되는 콜백 (선택)
+
+        Returns:
+            list: 수신자별 결과 dict (to_email, success, error, temporary), 입력 순서 유지
+                (인증 실패로 보내지 못한 메시지는 "auth": True)
+        """
+        if not messages:
+            return []
+
+        pool_size = max(1, min(pool_size, len(messages)))
+        auth_failed = threading.Event()
+
+        def send_one(message: dict) -> dict:
+            if auth_failed.is_set():
+                # 인증 실패 후에는 남은 메시지를 시도하지 않음 (모든 연결이 같은 계정으로 로그인)
+                result = {"to_email": message["to_email"], "success": False,
+                          "error": AUTH_ERROR, "temporary": False, "auth": True}
+                if on_result is not None:
+                    on_result(result)
+                return result
+            try:
+                result = self._send_pooled(pool, message)
+            except smtplib.SMTPAuthenticationError:
+                if not auth_failed.is_set():
+                    auth_failed.set()
+                    print(f"❌ {AUTH_ERROR} 남은 발송을 중단합니다.")
+                result = {"to_email": message["to_email"], "success": False,
+                          "error": AUTH_ERROR, "temporary": False, "auth": True}
+            except Exception as e:
+                result = {"to_email": message["to_email"], "success": False,
+                          "error": str(e), "temporary": is_temporary_error(e)}
+            if on_result is not None:
+                on_result(result)
+            return result
+
+        with self.connection_pool(pool_size, max_messages_per_connection) as pool:
+            with ThreadPoolExecutor(max_workers=pool_size) as executor:
+                results = list(executor.map(send_one, messages))
+
+        sent = sum(1 for r in results if r["success"])
+        print(f"📧 일괄 발송 완료: {sent}/{len(results)}건 성공")
+        for r in results:
+            if not r["success"]:
+                print(f"❌ 발송 실패 ({r['to_email']}): {r['error']}")
+        return results
+
     def send_test_email(self, to_email: str) -> bool:
         """테스트 이메일 발송"""
         subject = "[SWRO 학습] 테스트 메일"
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+메일 HTML 출력 최적화
+
+create_email_content 결과에서 페이지에 쓰이지 않는 CSS 규칙을 제거하고
+블록 태그 사이의 공백을 줄인 뒤, 최종 크기를 예산(Gmail은 본문이
+약 102KB를 넘으면 메시지를 잘라 표시)과 비교합니다.
+<pre>, <textarea>, 공백을 그대로 보여 주는 .formula 블록 안은 건드리지 않습니다.
+"""
+
+import re
+from typing import Optional
+
+# Gmail 메시지 잘림 기준 (HTML 본문 약 102KB)
+GMAIL_CLIP_BYTES = 102 * 1024
+
+_STYLE = re.compile(r"(<style[^>]*>)(.*?)(</style>)", re.S | re.I)
+_TOKEN = re.compile(r"(<!--.*?-->|<[^>]+>)", re.S)
+_TAG = re.compile(r"<(/?)([a-zA-Z][a-zA-Z0-9]*)")
+_CLASS_ATTR = re.compile(r"""\bclass\s*=\s*(?:"([^"]*)"|'([^']*)')""", re.I)
+_WHITESPACE = re.compile(r"\s+")
+_CSS_RULE = re.compile(r"([^{}]+)\{([^{}]*)\}")
+_CSS_SPACES = re.compile(r"\s*([{}:;,])\s*")
+_SIMPLE_SELECTOR = re.compile(r"^([a-zA-Z][a-zA-Z0-9]*|\*)?((?:\.[\w-]+)*)$")
+
+# 앞뒤 공백이 렌더링에 영향을 주지 않는 블록 수준 태그
+BLOCK_TAGS = frozenset(
+    "html head body title meta link style script div p h1 h2 h3 h4 h5 h6 ul ol li "
+    "table thead tbody tfoot tr td th pre blockquote hr br section header footer".split()
+)
+# 내부 공백을 그대로 유지할 태그와 클래스
+PRESERVE_TAGS = frozenset(("pre", "textarea", "script"))
+PRESERVE_CLASSES = frozenset(("formula",))
+
+
+def used_selectors(html: str) -> tuple:
+    """
+    문서에 쓰인 태그 이름과 클래스 이름
+
+    Returns:
+        tuple: (태그 이름 set, 클래스 이름 set)
+    """
+    tags = {m.group(2).lower() for m in _TAG.finditer(html) if not m.group(1)}
+    classes = set()
+    for m in _CLASS_ATTR.finditer(html):
+        classes.update((m.group(1) or m.group(2) or "").split())
+    return tags, classes
+
+
+def _selector_used(selector: str, tags: set, classes: set) -> bool:
+    """선택자의 모든 단순 선택자(태그·클래스)가 문서에 있으면 True (해석할 수 없으면 보존)"""
+    for compound in selector.replace(">", " ").replace("+", " ").replace("~", " ").split():
+        match = _SIMPLE_SELECTOR.match(compound)
+        if match is None:
+            return True  # 의사 클래스·속성 선택자 등은 보수적으로 유지
+        tag, class_chain = match.groups()
+        if tag and tag != "*" and tag.lower() not in tags:
+            return False
+        if any(name not in classes for name in class_chain.split(".")[1:]):
+            return False
+    return True
+
+
+def prune_css(css: str, html: str) -> str:
+    """
+    문서에서 쓰이지 않는 CSS 규칙을 제거하고 공백을 줄인 스타일시트
+
+    쉼표로 묶인 선택자는 쓰이는 것만 남기며, @media 등 중첩 규칙이 있으면 그대로 둡니다.
+    """
+    if "@" in css:
+        return _CSS_SPACES.sub(r"\1", css).strip()
+
+    tags, classes = used_selectors(html)
+    rules = []
+    for selectors, declarations in _CSS_RULE.findall(css):
+        kept = [s.strip() for s in selectors.split(",") if _selector_used(s.strip(), tags, classes)]
+        if kept:
+            rules.append(f"{','.join(kept)}{{{declarations.strip()}}}")
+    return _CSS_SPACES.sub(r"\1", "".join(rules))
+
+
+def _is_block(tag: Optional[str]) -> bool:
+    if tag is None:
+        return True  # 문서 처음·끝
+    m = _TAG.match(tag)
+    return m is not None and m.group(2).lower() in BLOCK_TAGS
+
+
+def _opens_preserved(tag: str) -> Optional[str]:
+    """공백 보존 영역을 여는 태그면 그 태그 이름 반환"""
+    m = _TAG.match(tag)
+    if m is None or m.group(1):
+        return None
+    name = m.group(2).lower()
+    if name in PRESERVE_TAGS:
+        return name
+    attr = _CLASS_ATTR.search(tag)
+    if attr and PRESERVE_CLASSES.intersection((attr.group(1) or attr.group(2) or "").split()):
+        return name
+    return None
+
+
+def minify_html(html: str) -> str:
+    """
+    렌더링 결과가 같도록 HTML 공백·주석 축소
+
+    - 블록 태그 앞뒤의 공백은 제거, 그 밖의 연속 공백은 한 칸으로
+    - 주석 제거 (조건부 주석 <!--[if ...]> 은 유지)
+    - <pre>, <textarea>, .formula 등 공백 보존 영역은 그대로 유지
+    """
+    tokens = _TOKEN.split(html)
+    out = []
+    preserved = None  # (태그 이름, 같은 태그 중첩 깊이)
+
+    for i, token in enumerate(tokens):
+        if not token:
+            continue
+        if i % 2 == 1:  # 태그 또는 주석
+            if token.startswith("<!--") and not token.startswith("<!--[if") and preserved is None:
+                continue
+            if preserved is not None:
+                name, depth = preserved
+                m = _TAG.match(token)
+                if m and m.group(2).lower() == name and not token.endswith("/>"):
+                    depth += -1 if m.group(1) else 1
+                preserved = (name, depth) if depth else None
+            else:
+                name = _opens_preserved(token)
+                if name:
+                    preserved = (name, 1)
+            out.append(token)
+            continue
+
+        if preserved is not None:
+            out.append(token)
+            continue
+
+        text = _WHITESPACE.sub(" ", token)
+        prev_tag = tokens[i - 1] if i > 0 else None
+        next_tag = tokens[i + 1] if i + 1 < len(tokens) else None
+        if _is_block(prev_tag):
+            text = text.lstrip()
+        if _is_block(next_tag):
+            text = text.rstrip()
+        if text:
+            out.append(text)
+    return "".join(out)
+
+
+def optimize_html(html: str) -> str:
+    """스타일시트의 미사용 규칙 제거 후 HTML 축소"""
+    def prune(match):
+        return match.group(1) + prune_css(match.group(2), body) + match.group(3)
+
+    body = _STYLE.sub("", html)
+    return minify_html(_STYLE.sub(prune, html))
+
+
+def check_size(html: str, budget: int = GMAIL_CLIP_BYTES, label: str = "") -> int:
+    """
+    HTML 크기를 예산과 비교해 초과 시 경고
+
+    Returns:
+        int: UTF-8 바이트 크기
+    """
+    size = len(html.encode("utf-8"))
+    if size > budget:
+        print(f"⚠️ {label} HTML 크기 {size / 1024:.1f}KB가 예산 {budget / 1024:.0f}KB를 넘습니다 "
+              f"(Gmail 등에서 잘려 보일 수 있음)")
+    return size
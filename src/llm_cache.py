@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+LLM 응답 디스크 캐시
+
+(모델, 프롬프트, 파라미터) 해시를 키로 응답 텍스트를 SQLite 파일에 저장합니다.
+TTL이 지난 항목은 무시되고, 항목 수가 max_entries를 넘으면
+가장 오래 사용되지 않은 항목부터 삭제합니다(LRU).
+요청 종류별 최근 응답 시간도 함께 저장해, 새 프로세스(cron 실행)도
+이전 실행의 p95로 hedge 시점을 정할 수 있습니다.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / ".cache" / "llm_cache.sqlite3"
+
+
+class LLMCache:
+    """TTL과 LRU 크기 제한을 가진 LLM 응답 캐시"""
+
+    def __init__(self, path: Path = None, ttl_seconds: float = 30 * 86400,
+                 max_entries: int = 2000, refresh: bool = False):
+        """
+        Args:
+            path: SQLite 파일 경로 (기본: 저장소/.cache/llm_cache.sqlite3)
+            ttl_seconds: 항목 유효 기간(초), None이면 만료 없음
+            max_entries: 최대 항목 수 (초과 시 LRU 삭제)
+            refresh: True면 캐시를 읽지 않고 새로 생성한 응답으로 덮어씀
+        """
+        self.path = Path(path or DEFAULT_CACHE_PATH)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS latencies ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, label TEXT NOT NULL,"
+            " seconds REAL NOT NULL, recorded_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS latencies_label ON latencies (label, id)")
+        self._conn.commit()
+
+    @classmethod
+    def from_env(cls) -> "LLMCache":
+        """
+        환경 변수로 캐시 생성
+
+        - LLM_CACHE_PATH: 캐시 파일 경로
+        - LLM_CACHE_TTL: 유효 기간(초)
+        - LLM_CACHE_MAX_ENTRIES: 최대 항목 수
+        - LLM_CACHE_REFRESH=true: 캐시를 무시하고 새로 생성
+        """
+        ttl = os.environ.get("LLM_CACHE_TTL")
+        max_entries = os.environ.get("LLM_CACHE_MAX_ENTRIES")
+        return cls(
+            path=os.environ.get("LLM_CACHE_PATH") or None,
+            ttl_seconds=float(ttl) if ttl else 30 * 86400,
+            max_entries=int(max_entries) if max_entries else 2000,
+            refresh=os.environ.get("LLM_CACHE_REFRESH", "false").lower() == "true",
+        )
+
+    @staticmethod
+    def make_key(model: str, messages: list, params: dict) -> str:
+        """요청 내용으로 캐시 키 생성"""
+        payload = json.dumps({"model": model, "messages": messages, "params": params},
+                             ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """유효한 캐시 응답 반환 (없거나 만료/refresh면 None)"""
+        if self.refresh:
+            self.misses += 1
+            return None
+
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.ttl_seconds is not None and now - row[1] > self.ttl_seconds):
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, value: str):
+        """응답 저장 후 만료 항목 및 LRU 초과분 삭제"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)", (key, value, now, now)
+            )
+            if self.ttl_seconds is not None:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+                )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def record_latency(self, label: str, seconds: float, keep: int = 200):
+        """요청 종류별 응답 시간 1건 저장 (종류마다 최근 keep건만 유지)"""
+        with self._lock:
+            self._conn.execute("INSERT INTO latencies (label, seconds, recorded_at) VALUES (?, ?, ?)",
+                               (label, seconds, time.time()))
+            self._conn.execute(
+                "DELETE FROM latencies WHERE label = ? AND id NOT IN ("
+                " SELECT id FROM latencies WHERE label = ? ORDER BY id DESC LIMIT ?)",
+                (label, label, keep)
+            )
+            self._conn.commit()
+
+    def latencies(self, label: str, limit: int = 200) -> list:
+        """저장된 최근 응답 시간 (오래된 순)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seconds FROM latencies WHERE label = ? ORDER BY id DESC LIMIT ?", (label, limit)
+            ).fetchall()
+        return [r[0] for r in reversed(rows)]
+
+    def stats(self) -> dict:
+        """캐시 적중/미스 통계"""
+        total = self.hits + self.misses
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": entries,
+        }
+
+    def close(self):
+        self._conn.close()
@@ -4,27 +4,96 @@ SWRO 해수담수화 플랜트 엔지니어 학습 메일 시스템
 90일 집중 과정으로 전문가 수준까지 도달
 """
 
+import argparse
+import itertools
 import json
 import os
-import re
-from datetime import datetime
-from pathlib import Path
+from datetime import date, datetime
+from html import escape
+from typing import Iterable, Iterator
 
+from curriculum import DATA_DIR, get_topic_for_day, load_curriculum, write_shards
 from email_sender import EmailSender
+from html_optimizer import GMAIL_CLIP_BYTES, check_size, optimize_html
+from markdown_renderer import render_markdown
+from render_cache import RenderCache
+import metrics
+import templates
 
+# create_email_content의 마크업/스타일을 바꾸면 올려서 렌더 캐시를 무효화
+TEMPLATE_VERSION = 9
 
-def load_curriculum() -> dict:
-    """커리큘럼 데이터 로드"""
-    curriculum_path = Path(__file__).parent.parent / "data" / "curriculum.json"
-    with open(curriculum_path, "r", encoding="utf-8") as f:
-        return json.load(f)
 
+def env_int(name: str, default: int = None) -> int:
+    """정수형 환경 변수 읽기 (없거나 비어 있으면 default)"""
+    value = os.environ.get(name, "").strip()
+    return int(value) if value else default
 
-def get_current_day(start_date: str) -> int:
-    """시작일로부터 현재 학습 일차 계산"""
-    start = datetime.strptime(start_date, "%Y-%m-%d")
-    today = datetime.now()
-    delta = (today - start).days + 1
+
+def deliver(email_sender: EmailSender, messages: list, on_result=None) -> list:
+    """
+    DELIVERY_MODE에 따라 메시지 발송
+
+    - sync (기본): 연결 풀을 이용한 일괄 발송
+    - async: 동시성 제한·쿼터·백오프를 적용한 비동기 발송
+      (SMTP_CONCURRENCY, SMTP_RATE_PER_MINUTE, SMTP_RATE_PER_DAY)
+
+    Args:
+        email_sender: 발송에 사용할 EmailSender
+        messages: 메시지 dict 목록 (to_email, subject, html_content 또는 payload)
+        on_result: 메시지마다 발송 직후 결과 dict로 호출되는 콜백 (선택)
+
+    Returns:
+        list: 수신자별 결과 dict (to_email, success, error, temporary)
+    """
+    mode = os.environ.get("DELIVERY_MODE", "sync").lower()
+    if mode == "async":
+        return get_delivery_engine(email_sender).run(messages, on_result)
+    return email_sender.send_batch(messages, pool_size=env_int("SMTP_CONCURRENCY", 3),
+                                   on_result=on_result)
+
+
+_delivery_engines = {}
+
+
+def get_delivery_engine(email_sender: EmailSender):
+    """
+    EmailSender별 비동기 발송 엔진 (프로세스 안에서 재사용)
+
+    일일 쿼터(SMTP_RATE_PER_DAY)는 엔진에 누적되므로 발송함 재시도 묶음이나
+    데몬의 여러 발송 슬롯에서도 하루 한도가 유지됩니다. 새 프로세스(cron 실행)는
+    발송함에 기록된 오늘 발송 완료 수로 시작합니다.
+    """
+    engine = _delivery_engines.get(id(email_sender))
+    if engine is not None and engine.sender is email_sender:
+        return engine
+    from async_delivery import AsyncDeliveryEngine
+
+    per_day = env_int("SMTP_RATE_PER_DAY")
+    sent_today = 0
+    if per_day is not None:
+        outbox = get_outbox()
+        if outbox is not None:
+            midnight = datetime.combine(date.today(), datetime.min.time()).timestamp()
+            try:
+                sent_today = outbox.delivered_since(midnight)
+            finally:
+                outbox.close()
+    engine = AsyncDeliveryEngine(
+        email_sender,
+        concurrency=env_int("SMTP_CONCURRENCY", 10),
+        per_minute=env_int("SMTP_RATE_PER_MINUTE"),
+        per_day=per_day,
+        sent_today=sent_today,
+    )
+    _delivery_engines[id(email_sender)] = engine
+    return engine
+
+
+def get_current_day(start_date: str, today: date = None) -> int:
+    """시작일로부터 현재 학습 일차 계산 (today: 기준 날짜, 기본: 오늘)"""
+    start = datetime.strptime(start_date, "%Y-%m-%d").date()
+    delta = ((today or datetime.now().date()) - start).days + 1
 
     max_days = 90  # 90일 과정
     if delta > max_days:
@@ -34,236 +103,1013 @@ def get_current_day(start_date: str) -> int:
     return delta
 
 
-def get_topic_for_day(curriculum: dict, day: int) -> dict:
-    """특정 일차의 학습 주제 가져오기"""
-    for module in curriculum["modules"]:
-        for topic in module.get("topics", []):
-            if topic["day"] == day:
-                return {"module": module, "topic": topic}
-    return None
-
-
 def generate_terms_section(terms: dict) -> str:
     """전문 용어 섹션 생성"""
     if not terms:
         return ""
     items = "".join(f'<div class="term"><strong>{term}:</strong> {desc}</div>' for term, desc in terms.items())
-    return f"<div class='section'><h2>📚 전문 용어</h2><div class='terms'>{items}</div></div>"
+    return templates.section("📚 전문 용어", f"<div class=\"terms\">{items}</div>")
 
 
-def markdown_to_html(text: str) -> str:
-    """간단한 마크다운을 HTML로 변환"""
-    if not text:
+def generate_ai_section(ai_content: dict) -> str:
+    """사전 생성된 AI 보충 설명·퀴즈 섹션 생성"""
+    if not ai_content:
         return ""
 
-    # 헤더 변환
-    text = re.sub(r'^## (.+)$', r'<h3>\1</h3>', text, flags=re.MULTILINE)
-    text = re.sub(r'^### (.+)$', r'<h4>\1</h4>', text, flags=re.MULTILINE)
+    parts = []
+    if ai_content.get("supplement"):
+        parts.append(f"<div class='ai-supplement'>{ai_content['supplement']}</div>")
 
-    # 굵은 글씨
-    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
+    quiz = ai_content.get("quiz")
+    if isinstance(quiz, dict) and quiz.get("question"):
+        options = "".join(f"<li>{option}</li>" for option in quiz.get("options", []))
+        parts.append(
+            f"<div class='quiz-item'><p><strong>Q.</strong> {quiz['question']}</p><ul>{options}</ul>"
+            f"<p class='quiz-answer'>💡 정답: {quiz.get('correct', '')} {quiz.get('explanation', '')}</p></div>"
+        )
 
-    # 코드 블록
-    text = re.sub(r'```\n?(.*?)\n?```', r'<pre class="code-block">\1</pre>', text, flags=re.DOTALL)
+    if not parts:
+        return ""
+    return templates.section("🤖 AI 보충 설명", "".join(parts), "section ai")
 
-    # 인라인 코드
-    text = re.sub(r'`(.+?)`', r'<code>\1</code>', text)
 
-    # 줄바꿈
-    text = text.replace('\n\n', '</p><p>')
-    text = text.replace('\n', '<br>')
+def markdown_to_html(text: str) -> str:
+    """간단한 마크다운을 HTML로 변환 (markdown_renderer 참고)"""
+    return render_markdown(text)
 
-    return f"<p>{text}</p>"
 
+def generate_quiz_section(quiz: list) -> str:
+    """커리큘럼 퀴즈 섹션 생성"""
+    items = "".join(
+        f'<div class="quiz-item"><p><strong>Q{i}.</strong> {q.get("q", q.get("question", ""))}</p>'
+        f'<p class="quiz-answer">💡 정답: {q.get("a", q.get("answer", ""))}</p></div>'
+        for i, q in enumerate(quiz or [], 1) if isinstance(q, dict)
+    )
+    return templates.section("🧠 오늘의 퀴즈", items, "section quiz") if items else ""
 
-def create_email_content(curriculum: dict, day: int, topic_data: dict) -> str:
-    """풍부한 학습 콘텐츠 이메일 생성"""
-    program_info = curriculum["program_info"]
-    max_days = program_info.get("duration_days", 90)
 
-    if not topic_data:
-        return f"<html><body><h1>Day {day} 콘텐츠 준비 중</h1></body></html>"
+def generate_review_section(reviews: list) -> str:
+    """간격 반복 복습 퀴즈 섹션 생성 (정답은 문항 목록 아래에 모아 표시)"""
+    if not reviews:
+        return ""
+    questions = "".join(f'<li><span class="review-day">Day {r["day"]}</span> {r["q"]}</li>' for r in reviews)
+    answers = " · ".join(f'{i}. {r["a"]}' for i, r in enumerate(reviews, 1))
+    return templates.section(
+        "🔁 복습 퀴즈",
+        f'<ol class="review">{questions}</ol><p class="quiz-answer review-answers">💡 정답: {answers}</p>',
+        "section quiz",
+    )
+
+
+def related_lessons(curriculum: dict, day: int) -> list:
+    """
+    같은 용어를 다룬 이전 일차 (커리큘럼 로드 시 만든 용어 색인 조회)
 
+    Returns:
+        list: (일차, 제목, 공통 용어 목록), RELATED_LESSONS(기본 5)개까지
+    """
+    term_index = getattr(curriculum, "term_index", None)
+    limit = env_int("RELATED_LESSONS", 5)
+    if term_index is None or limit <= 0:
+        return []
+    return term_index.related(day, limit)
+
+
+def generate_related_section(related: list) -> str:
+    """관련 이전 학습 섹션 생성"""
+    items = "".join(
+        f'<li><strong>Day {day}</strong> {title} <span class="related-terms">{", ".join(terms)}</span></li>'
+        for day, title, terms in related
+    )
+    return templates.section("🔗 관련 이전 학습", f'<ul class="related">{items}</ul>') if items else ""
+
+
+def lesson_fields(curriculum: dict, day: int, topic_data: dict, ai_content: dict = None,
+                  reviews: list = None) -> dict:
+    """학습 메일 본문 템플릿(LESSON_PAGE/LESSON_BODY)에 채울 값 (reviews: 복습 퀴즈 문항, 선택)"""
+    program_info = curriculum["program_info"]
     module = topic_data["module"]
     topic = topic_data["topic"]
-    progress_percent = (day / max_days) * 100
 
-    # 확장 콘텐츠 섹션 생성
-    detailed_section = ""
+    sections = [generate_terms_section(topic.get("technical_terms", {}))]
+    if topic.get("formula"):
+        sections.append(f'<div class="section"><h2>📐 공식 및 계산</h2><div class="formula">{topic["formula"]}</div></div>')
+    if topic.get("practical_tip"):
+        sections.append(f'<div class="section"><h2>💡 실무 팁</h2><div class="tip">{topic["practical_tip"]}</div></div>')
     if topic.get("detailed_explanation"):
-        detailed_section = f'''
-        <div class="section detailed">
-            <h2>📖 상세 학습 내용</h2>
-            <div class="detailed-content">
-                {markdown_to_html(topic["detailed_explanation"])}
-            </div>
-        </div>'''
-
-    exercises_section = ""
+        sections.append(
+            '<div class="section detailed"><h2>📖 상세 학습 내용</h2><div class="detailed-content">'
+            f'{markdown_to_html(topic["detailed_explanation"])}</div></div>'
+        )
     if topic.get("exercises"):
-        exercises_section = f'''
-        <div class="section exercises">
-            <h2>✏️ 연습 문제</h2>
-            <div class="exercises-content">
-                {markdown_to_html(topic["exercises"])}
-            </div>
-        </div>'''
-
-    quiz_section = ""
+        sections.append(
+            '<div class="section exercises"><h2>✏️ 연습 문제</h2><div class="exercises-content">'
+            f'{markdown_to_html(topic["exercises"])}</div></div>'
+        )
     if topic.get("quiz"):
-        quiz_items = ""
-        for i, q in enumerate(topic["quiz"], 1):
-            if isinstance(q, dict):
-                quiz_items += f'''
-                <div class="quiz-item">
-                    <p><strong>Q{i}.</strong> {q.get("q", q.get("question", ""))}</p>
-                    <p class="quiz-answer">💡 정답: {q.get("a", q.get("answer", ""))}</p>
-                </div>'''
-        if quiz_items:
-            quiz_section = f'''
-            <div class="section quiz">
-                <h2>🧠 오늘의 퀴즈</h2>
-                {quiz_items}
-            </div>'''
-
-    html_content = f'''<!DOCTYPE html>
-<html lang="ko">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>SWRO 학습 Day {day}</title>
-    <style>
-        body {{ font-family: 'Malgun Gothic', 'Apple SD Gothic Neo', sans-serif; line-height: 1.9; color: #333; max-width: 900px; margin: 0 auto; padding: 15px; background: #f0f4f8; }}
-        .container {{ background: white; padding: 25px; border-radius: 12px; box-shadow: 0 4px 20px rgba(0,0,0,0.1); }}
-        .header {{ background: linear-gradient(135deg, #0d47a1 0%, #1976d2 100%); color: white; padding: 30px; border-radius: 12px; margin-bottom: 25px; }}
-        .header h1 {{ margin: 0 0 10px 0; font-size: 26px; }}
-        .header .meta {{ opacity: 0.9; font-size: 15px; }}
-        .level-badge {{ display: inline-block; background: rgba(255,255,255,0.25); padding: 6px 16px; border-radius: 20px; margin-top: 12px; font-size: 13px; }}
-        .module-info {{ background: #e3f2fd; padding: 18px; border-radius: 10px; margin-bottom: 25px; border-left: 5px solid #1976d2; font-size: 15px; }}
-        .section {{ margin-bottom: 30px; padding: 20px; background: #fafafa; border-radius: 10px; }}
-        .section h2 {{ color: #0d47a1; font-size: 20px; margin: 0 0 18px 0; padding-bottom: 12px; border-bottom: 2px solid #1976d2; }}
-        .section h3 {{ color: #1565c0; font-size: 17px; margin: 20px 0 12px 0; }}
-        .section h4 {{ color: #1976d2; font-size: 15px; margin: 15px 0 10px 0; }}
-        .key-points {{ background: #fff; padding: 18px 22px; border-radius: 8px; border: 1px solid #e0e0e0; }}
-        .key-points ul {{ margin: 0; padding-left: 22px; }}
-        .key-points li {{ margin-bottom: 10px; }}
-        .terms {{ display: grid; gap: 12px; }}
-        .term {{ background: #fff8e1; padding: 14px 18px; border-radius: 8px; border-left: 4px solid #ffc107; }}
-        .term strong {{ color: #f57c00; }}
-        .formula {{ background: #e8f5e9; padding: 18px; border-radius: 8px; font-family: 'Consolas', 'Monaco', monospace; white-space: pre-wrap; border-left: 4px solid #4caf50; font-size: 14px; overflow-x: auto; }}
-        .tip {{ background: #e1f5fe; padding: 18px; border-radius: 8px; border-left: 4px solid #03a9f4; }}
-        .detailed-content {{ background: #fff; padding: 20px; border-radius: 8px; border: 1px solid #e0e0e0; }}
-        .detailed-content h3 {{ color: #1565c0; border-bottom: 1px solid #e0e0e0; padding-bottom: 8px; }}
-        .detailed-content h4 {{ color: #1976d2; }}
-        .detailed-content pre {{ background: #263238; color: #aed581; padding: 15px; border-radius: 6px; overflow-x: auto; }}
-        .exercises-content {{ background: #fff3e0; padding: 20px; border-radius: 8px; }}
-        .quiz-item {{ background: #fff; padding: 15px; border-radius: 8px; margin-bottom: 12px; border: 1px solid #e0e0e0; }}
-        .quiz-answer {{ color: #2e7d32; font-weight: 500; margin-top: 8px; }}
-        .code-block {{ background: #263238; color: #aed581; padding: 12px; border-radius: 6px; display: block; margin: 10px 0; }}
-        code {{ background: #eceff1; padding: 2px 6px; border-radius: 4px; font-size: 13px; }}
-        .progress {{ margin-top: 25px; }}
-        .progress-bar {{ background: #e0e0e0; border-radius: 10px; height: 24px; overflow: hidden; }}
-        .progress-fill {{ background: linear-gradient(90deg, #4caf50, #8bc34a); height: 100%; display: flex; align-items: center; justify-content: center; color: white; font-size: 12px; font-weight: bold; }}
-        .footer {{ margin-top: 30px; padding-top: 20px; border-top: 1px solid #e0e0e0; text-align: center; color: #757575; font-size: 13px; }}
-        table {{ width: 100%; border-collapse: collapse; margin: 15px 0; }}
-        th, td {{ border: 1px solid #e0e0e0; padding: 10px; text-align: left; }}
-        th {{ background: #f5f5f5; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>{topic['title']}</h1>
-            <div class="meta">Day {day} / {max_days} | 3개월 전문가 속성 과정</div>
-            <span class="level-badge">📚 {module['level']}</span>
-        </div>
-
-        <div class="module-info">
-            <strong>모듈 {module['module_id']}:</strong> {module['title']} ({module['duration_days']}일)
-        </div>
-
-        <div class="section">
-            <h2>🎯 오늘의 학습 목표</h2>
-            <p style="font-size: 16px; color: #424242;">{topic['content']}</p>
-        </div>
-
-        <div class="section">
-            <h2>📌 핵심 포인트</h2>
-            <div class="key-points">
-                <ul>
-                    {"".join(f'<li>{point}</li>' for point in topic['key_points'])}
-                </ul>
-            </div>
-        </div>
-
-        {generate_terms_section(topic.get('technical_terms', {}))}
-
-        {"<div class='section'><h2>📐 공식 및 계산</h2><div class='formula'>" + topic['formula'] + "</div></div>" if topic.get('formula') else ""}
-
-        {"<div class='section'><h2>💡 실무 팁</h2><div class='tip'>" + topic['practical_tip'] + "</div></div>" if topic.get('practical_tip') else ""}
-
-        {detailed_section}
-        {exercises_section}
-        {quiz_section}
-
-        <div class="progress">
-            <p><strong>전체 진행률</strong> (Day {day}/{max_days})</p>
-            <div class="progress-bar">
-                <div class="progress-fill" style="width: {progress_percent:.1f}%;">{progress_percent:.1f}%</div>
-            </div>
-        </div>
-
-        <div class="footer">
-            <p><strong>{program_info['title']}</strong></p>
-            <p>📧 매일 아침 발송되는 전문가 학습 메일</p>
-        </div>
-    </div>
-</body>
-</html>'''
-
-    return html_content
-
-
-def main():
-    """메인 실행 함수"""
-    recipient_email = os.environ.get("RECIPIENT_EMAIL")
+        sections.append(generate_quiz_section(topic["quiz"]))
+    if reviews:
+        sections.append(generate_review_section(reviews))
+    if ai_content:
+        sections.append(generate_ai_section(ai_content))
+    related = related_lessons(curriculum, day)
+    if related:
+        sections.append(generate_related_section(related))
+
+    return {
+        "topic_title": topic["title"],
+        "day": day,
+        "max_days": program_info.get("duration_days", 90),
+        "level": module["level"],
+        "module_id": module["module_id"],
+        "module_title": module["title"],
+        "module_days": module["duration_days"],
+        "objective": topic["content"],
+        "key_points": "".join([f"<li>{point}</li>" for point in topic["key_points"]]),
+        "sections": "\n".join(sections),
+    }
+
+
+def create_email_content(curriculum: dict, day: int, topic_data: dict,
+                         ai_content: dict = None, reviews: list = None, recipient: dict = None) -> str:
+    """
+    풍부한 학습 콘텐츠 이메일 생성
+
+    Args:
+        ai_content: 사전 생성된 AI 콘텐츠 (선택)
+        reviews: 수신자별 복습 퀴즈 문항 {"day", "q", "a"} 목록 (선택)
+        recipient: 개인화 정보 {"name", "progress_percent"} (선택, 없으면 일차 기준 진행률)
+    """
+    program_info = curriculum["program_info"]
+    max_days = program_info.get("duration_days", 90)
+    recipient = recipient or {}
+
+    if not topic_data:
+        return f"<html><body><h1>Day {day} 콘텐츠 준비 중</h1></body></html>"
+
+    greeting = ""
+    if recipient.get("name"):
+        greeting = f'<p class="greeting">👋 {escape(recipient["name"])}님, 오늘의 학습입니다</p>'
+    percent = recipient.get("progress_percent")
+    return templates.LESSON_PAGE.render(
+        title=f"SWRO 학습 Day {day}",
+        greeting=greeting,
+        percent=(day / max_days) * 100 if percent is None else percent,
+        program_title=program_info["title"],
+        footer_note="📧 매일 아침 발송되는 전문가 학습 메일",
+        **lesson_fields(curriculum, day, topic_data, ai_content, reviews),
+    )
+
+
+def day_range(start: int, end: int, max_days: int) -> list:
+    """start일부터 end일까지의 일차 목록 (end < start이면 과정 끝에서 1일차로 순환)"""
+    count = (end - start) % max_days + 1
+    return [(start - 1 + offset) % max_days + 1 for offset in range(count)]
+
+
+def render_days(curriculum: dict, start: int, end: int, ai_contents: dict = None) -> str:
+    """
+    여러 일차를 공용 머리말·스타일시트를 가진 모아보기 메일 하나로 렌더링
+
+    Args:
+        curriculum: 커리큘럼 데이터 (한 번 로드한 것을 그대로 사용)
+        start: 첫 일차
+        end: 마지막 일차 (start보다 작으면 과정 끝에서 순환)
+        ai_contents: {day: 사전 생성된 AI 콘텐츠} (선택)
+
+    Returns:
+        str: 모아보기 메일 HTML
+    """
+    program_info = curriculum["program_info"]
+    max_days = program_info.get("duration_days", 90)
+    days = day_range(start, end, max_days)
+
+    toc = []
+    lessons = []
+    for day in days:
+        topic_data = get_topic_for_day(curriculum, day)
+        if not topic_data:
+            continue
+        ai_content = (ai_contents or {}).get(day)
+        toc.append(f'<li><a href="#day-{day}">Day {day}: {topic_data["topic"]["title"]}</a></li>')
+        lessons.append(
+            f'<div class="digest-lesson" id="day-{day}">'
+            f'{templates.LESSON_BODY.render(**lesson_fields(curriculum, day, topic_data, ai_content))}</div>'
+        )
+
+    return templates.DIGEST_PAGE.render(
+        title=f"SWRO 학습 Day {days[0]}~{days[-1]} 모아보기",
+        start_day=days[0],
+        end_day=days[-1],
+        count=len(lessons),
+        toc="".join(toc),
+        lessons="\n".join(lessons),
+        day=days[-1],
+        max_days=max_days,
+        percent=min(days[-1] / max_days, 1) * 100,
+        program_title=program_info["title"],
+        footer_note="📬 놓친 학습을 한 번에 모아 보내 드립니다",
+    )
+
+
+def load_roster() -> list:
+    """
+    수신자 명단 로드
+
+    우선순위:
+    1. RECIPIENTS_FILE: JSON 파일 경로
+    2. RECIPIENTS: JSON 문자열 (GitHub Secrets용)
+    3. RECIPIENT_EMAIL + START_DATE: 단일 수신자
+
+    JSON 형식: [{"email": "a@example.com", "start_date": "2025-02-01", "name": "김철수",
+                 "timezone": "America/New_York", "send_time": "07:30"}, ...]
+    start_date가 없으면 START_DATE(없으면 오늘)를 사용합니다. name은 개인화 메일의 인사말에,
+    timezone(IANA 이름)과 send_time(현지 HH:MM)은 데몬 모드의 발송 시각에 씁니다.
+
+    Returns:
+        list: {"email", "start_date", "name", "timezone", "send_time"} dict 목록
+    """
+    default_start = os.environ.get("START_DATE") or datetime.now().strftime("%Y-%m-%d")
+
+    roster_file = os.environ.get("RECIPIENTS_FILE")
+    roster_json = os.environ.get("RECIPIENTS")
+    if roster_file:
+        with open(roster_file, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    elif roster_json:
+        entries = json.loads(roster_json)
+    elif os.environ.get("RECIPIENT_EMAIL"):
+        entries = [{"email": os.environ["RECIPIENT_EMAIL"]}]
+    else:
+        entries = []
+
+    return [
+        {"email": entry["email"], "start_date": entry.get("start_date") or default_start,
+         "name": entry.get("name"), "timezone": entry.get("timezone"), "send_time": entry.get("send_time")}
+        for entry in entries
+    ]
+
+
+def group_by_day(roster: list, today: date = None) -> dict:
+    """수신자를 현재 학습 일차별로 묶기 ({day: [email, ...]}, today: 기준 날짜)"""
+    groups = {}
+    for recipient in roster:
+        day = get_current_day(recipient["start_date"], today)
+        groups.setdefault(day, []).append(recipient["email"])
+    return groups
+
+
+def get_subject(day: int, topic_data: dict) -> str:
+    """메일 제목 생성"""
+    if topic_data:
+        return f"[SWRO Day {day}] {topic_data['topic']['title']}"
+    return f"[SWRO Day {day}] 학습 내용"
+
+
+def use_minify() -> bool:
+    """HTML_MINIFY=false가 아니면 출력 HTML 최적화"""
+    return os.environ.get("HTML_MINIFY", "true").lower() != "false"
+
+
+def get_render_cache():
+    """RENDER_CACHE=false가 아니면 렌더 캐시 반환"""
+    if os.environ.get("RENDER_CACHE", "true").lower() == "false":
+        return None
+    # 최적화 여부에 따라 출력이 다르므로 캐시 버전을 나눔
+    return RenderCache(TEMPLATE_VERSION if use_minify() else f"{TEMPLATE_VERSION}-raw")
+
+
+def use_ai() -> bool:
+    """USE_AI=true 여부"""
+    return os.environ.get("USE_AI", "false").lower() == "true"
+
+
+def create_pregenerator(api_key: str, retries: int = 3):
+    """
+    AI 콘텐츠 사전 생성기와 LLM 캐시 (openai 관련 모듈은 이때 처음 import)
+
+    Returns:
+        tuple: (AIPregenerator, LLMCache)
+    """
+    from content_generator import ContentGenerator, generate_quiz, generate_quizzes
+    from llm_cache import LLMCache
+    from pregenerate import AIPregenerator
+
+    cache = LLMCache.from_env()
+    generator = ContentGenerator(api_key, cache=cache)
+    pregenerator = AIPregenerator(
+        generator,
+        lambda topic: generate_quiz(topic, api_key, cache=cache),
+        workers=env_int("AI_WORKERS", 4),
+        retries=retries,
+        batch_quiz_fn=lambda topics: generate_quizzes(topics, api_key, cache=cache),
+    )
+    return pregenerator, cache
+
+
+def get_ai_contents(curriculum: dict, days) -> dict:
+    """
+    USE_AI=true일 때 일차별 AI 콘텐츠
+
+    사전 생성본을 우선 사용하고, 없는 일차들은 OPENAI_API_KEY로 한꺼번에 동시 생성합니다.
+    즉시 생성 전체에 AI_INLINE_BUDGET초(기본: AI_DEADLINE) 예산이 있어, 그 안에 끝나지 않은
+    일차는 AI 섹션 없이 발송합니다. USE_AI가 꺼져 있으면 AI 관련 모듈을 import하지 않습니다.
+
+    Returns:
+        dict: {일차: {"supplement", "quiz"}} (AI 콘텐츠가 없는 일차는 빠짐)
+    """
+    if not use_ai():
+        return {}
+    from pregenerate import load_ai_content
+
+    contents, missing = {}, {}
+    for day in days:
+        topic_data = get_topic_for_day(curriculum, day)
+        if not topic_data:
+            continue
+        ai_content = load_ai_content(curriculum, day, topic_data)
+        if ai_content is None:
+            missing[day] = topic_data
+        else:
+            contents[day] = ai_content
+
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if missing and api_key:
+        print(f"🤖 AI 콘텐츠 즉시 생성: {len(missing)}개 일차 (사전 생성본 없음)")
+        with metrics.span("ai.inline"):
+            contents.update(generate_ai_inline(curriculum, missing, api_key))
+    return contents
+
+
+def generate_ai_inline(curriculum: dict, topics: dict, api_key: str) -> dict:
+    """
+    발송 경로에서 여러 일차의 보충 설명·퀴즈를 하나의 예산 안에 동시 생성해 저장
+
+    동시에 생성하는 일차 수는 AI_INLINE_CONCURRENCY(기본 8)로 제한합니다.
+
+    Args:
+        curriculum: 커리큘럼 데이터
+        topics: {일차: 토픽 데이터} (사전 생성본이 없는 일차)
+        api_key: OpenAI API 키
+
+    Returns:
+        dict: {일차: {"supplement", "quiz"}} (예산 초과·실패한 일차는 빠짐)
+    """
+    import asyncio
+
+    from content_generator import AsyncContentGenerator
+    from llm_cache import LLMCache
+    from pregenerate import store_ai_content
+
+    budget = float(os.environ.get("AI_INLINE_BUDGET") or os.environ.get("AI_DEADLINE") or 20)
+
+    async def generate(cache: LLMCache) -> dict:
+        generator = AsyncContentGenerator(api_key, cache=cache)
+        semaphore = asyncio.Semaphore(max(1, env_int("AI_INLINE_CONCURRENCY", 8)))
+
+        async def generate_day(day: int) -> dict:
+            async with semaphore:
+                return await generator.generate_day(topics[day]["topic"])
+
+        tasks = {asyncio.ensure_future(generate_day(day)): day for day in sorted(topics)}
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=budget)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            await generator.close()
+        if pending:
+            print(f"⏱️ 즉시 생성 예산 {budget:.0f}초 초과: {len(pending)}개 일차는 AI 섹션 없이 발송")
+        return {tasks[task]: task.result() for task in done if task.exception() is None}
+
+    cache = LLMCache.from_env()
+    try:
+        generated = asyncio.run(generate(cache))
+    finally:
+        cache.close()
+
+    contents = {}
+    for day, content in generated.items():
+        store_ai_content(curriculum, day, topics[day], content["supplement"], content["quiz"])
+        if content["supplement"] or content["quiz"]:
+            contents[day] = content
+    return contents
+
+
+def render_lesson(curriculum: dict, day: int, topic_data: dict, cache: RenderCache = None,
+                  ai_content: dict = None, reviews: list = None, recipient: dict = None) -> str:
+    """
+    캐시가 있으면 캐시를 거쳐 학습 메일 HTML 생성
+
+    HTML_MINIFY=false가 아니면 미사용 CSS 제거·공백 축소를 거친 HTML을 반환합니다.
+    복습 퀴즈나 개인화 정보가 들어간 본문은 수신자마다 달라 디스크 캐시에 저장하지 않습니다.
+    """
+    minify = use_minify()
+
+    def render(c: dict, d: int, t: dict) -> str:
+        page = create_email_content(c, d, t, ai_content, reviews, recipient)
+        if minify:
+            with metrics.span("minify"):
+                page = optimize_html(page)
+        return page
+
+    with metrics.span("render"):
+        if cache is None or reviews or recipient:
+            return render(curriculum, day, topic_data)
+        # 관련 이전 학습은 다른 일차의 내용에 따라 바뀌므로 캐시 키에 포함
+        extra = {"ai_content": ai_content, "related": related_lessons(curriculum, day)}
+        return cache.render(curriculum, day, topic_data, render, extra=extra)
+
+
+def build_messages(curriculum: dict, groups: dict, cache: RenderCache = None, scheduler=None,
+                   today: date = None) -> list:
+    """
+    일차별로 본문을 한 번만 렌더링하고 같은 일차의 수신자에게 공유
+
+    복습 스케줄러가 있으면 수신자마다 복습 퀴즈를 고르고, 같은 일차·같은 복습 문항을
+    받는 수신자끼리 본문을 공유합니다.
+
+    Args:
+        curriculum: 커리큘럼 데이터
+        groups: group_by_day 결과
+        cache: 렌더 캐시 (선택)
+        scheduler: 복습 스케줄러 (get_review_scheduler, 선택)
+        today: 복습 문항을 고를 발송일 (발송 확인과 같은 날짜, 기본: 오늘)
+
+    Returns:
+        list: deliver에 전달할 메시지 dict 목록 (발송 기록용 day, size 포함)
+    """
+    if scheduler is not None:
+        from review_scheduler import resolve_reviews
+    today = today or datetime.now().date()
+    review_items = env_int("REVIEW_ITEMS", 3)
+
+    ai_contents = get_ai_contents(curriculum, groups)
+    messages = []
+    for day in sorted(groups):
+        topic_data = get_topic_for_day(curriculum, day)
+        title = topic_data["topic"]["title"] if topic_data else "콘텐츠 없음"
+
+        variants = {}
+        quiz_count = len(topic_data["topic"].get("quiz") or []) if topic_data else 0
+        for email in groups[day]:
+            items = ()
+            if scheduler is not None:
+                items = tuple(scheduler.select(email, day, quiz_count, today, review_items))
+            variants.setdefault(items, []).append(email)
+        reviewing = sum(len(emails) for items, emails in variants.items() if items)
+        note = f", 복습 {reviewing}명·{len(variants)}종" if reviewing else ""
+        print(f"📖 Day {day}: {title} ({len(groups[day])}명{note})")
+
+        subject = get_subject(day, topic_data)
+        ai_content = ai_contents.get(day)
+        for items, emails in variants.items():
+            reviews = resolve_reviews(curriculum, items) if items else None
+            email_content = render_lesson(curriculum, day, topic_data, cache, ai_content, reviews)
+            size = check_size(email_content, env_int("HTML_SIZE_BUDGET", GMAIL_CLIP_BYTES), f"Day {day}")
+            metrics.observe("html_bytes", size)
+            messages.extend(
+                {"to_email": email, "subject": subject, "html_content": email_content, "day": day, "size": size}
+                for email in emails
+            )
+    return messages
+
+
+def use_personalize() -> bool:
+    """PERSONALIZE=true이면 수신자마다 이름·개인 진행률을 넣은 본문 렌더링"""
+    return os.environ.get("PERSONALIZE", "false").lower() == "true"
+
+
+def build_personal_messages(curriculum: dict, groups: dict, profiles: dict, sender_email: str,
+                            scheduler=None, today: date = None) -> Iterator[dict]:
+    """
+    수신자마다 다른 본문(이름, 개인 진행률, 복습 문항)을 프로세스 풀에서 렌더링
+
+    AI 콘텐츠와 복습 문항 선택은 현재 프로세스에서 한 번씩 처리하고,
+    렌더링·HTML 최적화·MIME 직렬화는 RENDER_WORKERS개(기본: CPU 수) 워커가
+    RENDER_CHUNK명(기본 50)씩 나눠 처리합니다. 렌더링된 메시지는 목록으로 모으지 않고
+    바로 내보내므로 dispatch가 묶음 단위로 발송함에 저장·발송합니다.
+
+    Args:
+        curriculum: 커리큘럼 데이터
+        groups: 일차별 수신자 ({day: [email, ...]})
+        profiles: {email: {"name", "progress_percent"}}
+        sender_email: 보내는 사람
+        scheduler: 복습 스케줄러 (선택)
+        today: 복습 문항을 고를 발송일 (발송 확인과 같은 날짜, 기본: 오늘)
+
+    Yields:
+        dict: deliver에 전달할 메시지 (payload, day, size 포함, 입력 순서 유지)
+    """
+    from parallel_render import render_parallel
+
+    if scheduler is not None:
+        from review_scheduler import resolve_reviews
+    today = today or datetime.now().date()
+    review_items = env_int("REVIEW_ITEMS", 3)
+
+    ai_contents = get_ai_contents(curriculum, groups)
+    jobs = []
+    for day in sorted(groups):
+        topic_data = get_topic_for_day(curriculum, day)
+        title = topic_data["topic"]["title"] if topic_data else "콘텐츠 없음"
+        print(f"📖 Day {day}: {title} ({len(groups[day])}명, 개인화)")
+        subject = get_subject(day, topic_data)
+        quiz_count = len(topic_data["topic"].get("quiz") or []) if topic_data else 0
+        for email in groups[day]:
+            items = scheduler.select(email, day, quiz_count, today, review_items) if scheduler else ()
+            jobs.append({"to_email": email, "subject": subject, "day": day,
+                         "recipient": profiles.get(email) or {},
+                         "reviews": resolve_reviews(curriculum, items) if items else None})
+
+    for message in render_parallel(jobs, sender_email, ai_contents,
+                                   workers=env_int("RENDER_WORKERS"),
+                                   chunk_size=env_int("RENDER_CHUNK", 50)):
+        metrics.observe("html_bytes", message["size"])
+        yield message
+
+
+def prerender() -> int:
+    """전체 일차를 미리 렌더링해 캐시에 저장 (변경된 일차만 다시 생성)"""
+    cache = get_render_cache()
+    if cache is None:
+        print("Error: RENDER_CACHE=false 상태에서는 prerender를 실행할 수 없습니다.")
+        return 1
+
+    curriculum = load_curriculum()
+    max_days = curriculum["program_info"].get("duration_days", 90)
+    budget = env_int("HTML_SIZE_BUDGET", GMAIL_CLIP_BYTES)
+    sizes = {}
+    for day in range(1, max_days + 1):
+        html = render_lesson(curriculum, day, get_topic_for_day(curriculum, day), cache)
+        sizes[day] = check_size(html, budget, f"Day {day}")
+
+    largest = max(sizes, key=sizes.get)
+    over = sum(1 for size in sizes.values() if size > budget)
+    print(f"✅ 사전 렌더링 완료: 신규 {cache.misses}일, 재사용 {cache.hits}일 ({cache.cache_dir})")
+    print(f"📏 최대 HTML 크기: Day {largest} {sizes[largest] / 1024:.1f}KB / 예산 {budget / 1024:.0f}KB"
+          f" (초과 {over}일)")
+    return 0 if not over else 1
+
+
+def shard(output: str) -> int:
+    """현재 커리큘럼을 모듈별 샤드 형식으로 변환"""
+    curriculum = load_curriculum()
+    manifest_path = write_shards(curriculum, output)
+    print(f"✅ 샤드 생성 완료: {manifest_path}")
+    print(f"   사용: CURRICULUM_PATH={manifest_path.parent}")
+    return 0
+
+
+def pregenerate(days: int) -> int:
+    """명단 기준 다음 N일의 AI 보충 설명·퀴즈를 미리 생성"""
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        print("Error: OPENAI_API_KEY가 설정되지 않았습니다.")
+        return 1
+
+    from pregenerate import upcoming_days
+
+    curriculum = load_curriculum()
+    max_days = curriculum["program_info"].get("duration_days", 90)
+    roster = load_roster()
+    current_days = group_by_day(roster) if roster else [get_current_day(datetime.now().strftime("%Y-%m-%d"))]
+    target_days = upcoming_days(current_days, days, max_days)
+
+    pregenerator, cache = create_pregenerator(api_key)
+    results = pregenerator.run(curriculum, target_days)
+
+    done = sum(1 for r in results if r["status"] in ("generated", "cached"))
+    print(f"✅ AI 콘텐츠 사전 생성: {done}/{len(results)}일 완료 (LLM 캐시 {cache.stats()})")
+    return 0 if done == len(results) else 1
+
+
+def get_outbox():
+    """
+    영속 발송함 (OUTBOX=false이면 None)
+
+    OUTBOX_PATH로 SQLite 파일 위치를, OUTBOX_MAX_ATTEMPTS로 메시지당 최대 시도 횟수를,
+    OUTBOX_RETENTION_DAYS로 발송이 끝난 메시지의 보존 기간(일)을 지정합니다.
+    """
+    if os.environ.get("OUTBOX", "true").lower() == "false":
+        return None
+    from outbox import Outbox
+
+    return Outbox(os.environ.get("OUTBOX_PATH") or None,
+                  max_attempts=env_int("OUTBOX_MAX_ATTEMPTS", 5))
+
+
+def queued_recipients(run_key: str) -> set:
+    """발송함에 run_key로 이미 저장된 수신자 (발송함이 꺼져 있으면 빈 set)"""
+    outbox = get_outbox()
+    if outbox is None:
+        return set()
+    try:
+        return outbox.queued(run_key)
+    finally:
+        outbox.close()
+
+
+def get_review_scheduler():
+    """
+    복습 퀴즈 스케줄러 (REVIEW_ITEMS=0이면 None)
+
+    REVIEW_ITEMS로 메일당 최대 복습 문항 수(기본 3)를, REVIEW_STATE로 상태 파일 위치를 지정합니다.
+    """
+    if env_int("REVIEW_ITEMS", 3) <= 0:
+        return None
+    from review_scheduler import ReviewScheduler
+
+    return ReviewScheduler(os.environ.get("REVIEW_STATE") or None)
+
+
+def get_state_store():
+    """
+    수신자 진행 상태·발송 기록 저장소 (STATE_DB=false이면 None)
+
+    STATE_DB_PATH로 SQLite 파일 위치를 지정합니다.
+    """
+    if os.environ.get("STATE_DB", "true").lower() == "false":
+        return None
+    from state_store import StateStore
+
+    return StateStore(os.environ.get("STATE_DB_PATH") or None)
+
+
+def create_sender(sender_email: str, sender_password: str) -> EmailSender:
+    """SMTP_HOST/SMTP_PORT/SMTP_STARTTLS 설정을 반영한 EmailSender"""
+    return EmailSender(
+        sender_email, sender_password,
+        smtp_server=os.environ.get("SMTP_HOST") or "smtp.gmail.com",
+        smtp_port=env_int("SMTP_PORT", 587),
+        starttls=os.environ.get("SMTP_STARTTLS", "true").lower() != "false",
+    )
+
+
+def _chain(*callbacks):
+    """None이 아닌 콜백을 차례로 호출하는 콜백"""
+    callbacks = [cb for cb in callbacks if cb is not None]
+    if len(callbacks) == 1:
+        return callbacks[0]
+
+    def call(result):
+        for cb in callbacks:
+            cb(result)
+    return call
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[list]:
+    """items를 size개씩 묶은 목록"""
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def dispatch(email_sender: EmailSender, messages: Iterable[dict], run_key: str,
+             on_delivered=None, on_result=None) -> int:
+    """
+    메시지 발송 (발송함이 켜져 있으면 run_key로 멱등 저장 후 발송)
+
+    messages는 목록 대신 생성기여도 되며, SEND_CHUNK건(기본 500)씩 받아
+    발송함에 저장(발송함이 꺼져 있으면 바로 발송)하므로 전체를 메모리에 모으지 않습니다.
+
+    Args:
+        on_delivered: 발송 완료된 수신자 이메일을 받는 콜백 (선택)
+        on_result: 발송 시도마다 결과 dict로 호출되는 콜백 (선택)
+
+    Returns:
+        int: 종료 코드 (모두 발송되면 0)
+    """
+    chunk_size = max(1, env_int("SEND_CHUNK", 500))
+    outbox = get_outbox()
+    if outbox is None:
+        results = []
+        for chunk in _chunks(messages, chunk_size):
+            with metrics.span("deliver"):
+                results.extend(deliver(email_sender, chunk, on_result))
+        if on_delivered:
+            for r in results:
+                if r["success"]:
+                    on_delivered(r["to_email"])
+        failed = [r["to_email"] for r in results if not r["success"]]
+        if not failed:
+            print(f"✅ 학습 메일 발송 완료: {len(results)}명")
+            return 0
+        print(f"❌ 메일 발송 실패: {len(failed)}/{len(results)}명")
+        return 1
+
+    try:
+        queued = 0
+        for chunk in _chunks(messages, chunk_size):
+            with metrics.span("outbox.enqueue"):
+                queued += outbox.enqueue(run_key, chunk, email_sender.build_payload)
+        print(f"📮 발송함 저장: 신규 {queued}건 (실행 키 {run_key})")
+        with metrics.span("deliver"):
+            outbox.flush(lambda batch, record: deliver(email_sender, batch, _chain(record, on_result)),
+                         max_wait=env_int("OUTBOX_MAX_WAIT", 600))
+        retention = max(1, env_int("OUTBOX_RETENTION_DAYS", 7))
+        pruned = outbox.prune(datetime.now().timestamp() - retention * 86400)
+        if pruned:
+            print(f"🧹 보존 기간({retention}일)이 지난 발송함 메시지 {pruned}건 삭제")
+        summary = outbox.summary(run_key)
+        failed = outbox.failed(run_key)
+        if on_delivered:
+            for to_email in outbox.delivered(run_key):
+                on_delivered(to_email)
+    finally:
+        outbox.close()
+
+    for r in failed:
+        print(f"❌ 발송 실패 ({r['to_email']}, {r['attempts']}회 시도): {r['error']}")
+    if summary["pending"]:
+        print(f"⏳ 재시도 대기: {summary['pending']}건 (다음 실행에서 이어서 발송)")
+    if not failed and not summary["pending"]:
+        print(f"✅ 학습 메일 발송 완료: {summary['delivered']}명")
+        return 0
+    print(f"❌ 메일 발송 미완료: 실패 {len(failed)}건, 대기 {summary['pending']}건")
+    return 1
+
+
+def send() -> int:
+    """오늘의 학습 메일 발송"""
     sender_email = os.environ.get("SENDER_EMAIL")
     sender_password = os.environ.get("SENDER_PASSWORD")
-    start_date = os.environ.get("START_DATE", datetime.now().strftime("%Y-%m-%d"))
+    with metrics.span("load_roster"):
+        roster = load_roster()
 
-    if not all([recipient_email, sender_email, sender_password]):
+    if not all([roster, sender_email, sender_password]):
         print("Error: 필수 환경 변수가 설정되지 않았습니다.")
         return 1
 
-    curriculum = load_curriculum()
-    day = get_current_day(start_date)
-    print(f"📚 현재 학습 일차: Day {day}")
+    with metrics.span("load_curriculum"):
+        curriculum = load_curriculum()
 
-    topic_data = get_topic_for_day(curriculum, day)
+    store = get_state_store()
+    scheduler = get_review_scheduler()
+    try:
+        return send_lessons(curriculum, roster, datetime.now().date(), create_sender(sender_email, sender_password),
+                            store, scheduler, get_render_cache())
+    finally:
+        if scheduler is not None:
+            scheduler.save()
+        if store is not None:
+            store.close()
 
-    if topic_data:
-        print(f"📖 오늘의 주제: {topic_data['topic']['title']}")
-        subject = f"[SWRO Day {day}] {topic_data['topic']['title']}"
-    else:
-        print(f"📖 Day {day} 콘텐츠 없음")
-        subject = f"[SWRO Day {day}] 학습 내용"
 
-    email_content = create_email_content(curriculum, day, topic_data)
+def send_lessons(curriculum: dict, roster: list, today: date, email_sender: EmailSender,
+                 store=None, scheduler=None, cache: RenderCache = None, emails: set = None) -> int:
+    """
+    today 기준 학습 메일 생성·발송 (send와 데몬이 공유, 저장소·스케줄러 저장과 닫기는 호출자 담당)
 
-    email_sender = EmailSender(sender_email, sender_password)
-    success = email_sender.send_html_email(
-        to_email=recipient_email,
-        subject=subject,
-        html_content=email_content
-    )
+    Args:
+        curriculum: 커리큘럼
+        roster: 전체 명단 (상태 저장소 동기화에 사용)
+        today: 수신자 현지 기준 발송일 (실행 키)
+        email_sender: 발송에 사용할 EmailSender
+        store: 상태 저장소 (선택)
+        scheduler: 복습 스케줄러 (선택)
+        cache: 렌더 캐시 (선택)
+        emails: 이번에 보낼 수신자 (기본: 명단 전체)
+
+    Returns:
+        int: 종료 코드 (모두 발송되면 0)
+    """
+    max_days = curriculum["program_info"].get("duration_days", 90)
+    run_key = today.strftime("%Y-%m-%d")
+    targets = roster if emails is None else [r for r in roster if r["email"] in emails]
 
-    if success:
-        print(f"✅ 학습 메일 발송 완료: {recipient_email}")
+    with metrics.span("group_by_day"):
+        if store is None:
+            groups = group_by_day(targets, today)
+        else:
+            store.sync_roster(roster, today, max_days)
+            groups = store.groups_by_day(emails)
+    recipients = sum(len(group) for group in groups.values())
+    paused = f" (일시 중지 {len(targets) - recipients}명 제외)" if recipients < len(targets) else ""
+    print(f"📚 수신자 {recipients}명, 학습 일차 {len(groups)}종{paused}")
+    metrics.count("recipients", recipients)
+    if not groups:
         return 0
-    else:
-        print("❌ 메일 발송 실패")
+
+    # 같은 날 재실행: 발송함에 이미 저장된 수신자는 저장된 메시지를 그대로 보내므로
+    # 다시 만들지 않고 복습 문항도 고르지 않음 (발송 확인 시 오늘 퀴즈만 예약)
+    queued = queued_recipients(run_key)
+    carried = {email: day for day, emails in groups.items() for email in emails if email in queued}
+    if carried:
+        print(f"📮 발송함에 저장된 {len(carried)}명은 저장된 메시지로 이어서 발송")
+        groups = {day: [email for email in emails if email not in carried] for day, emails in groups.items()}
+        groups = {day: emails for day, emails in groups.items() if emails}
+        if scheduler is not None:
+            for email, day in carried.items():
+                topic_data = get_topic_for_day(curriculum, day)
+                quiz_count = len(topic_data["topic"].get("quiz") or []) if topic_data else 0
+                scheduler.select(email, day, quiz_count, today, 0)
+
+    messages = []
+    if groups:
+        if use_personalize():
+            # 렌더링은 dispatch가 메시지를 받아 가는 동안 진행 (목록으로 모으지 않음)
+            messages = build_personal_messages(curriculum, groups, personal_profiles(targets, store, max_days),
+                                               email_sender.sender_email, scheduler, today)
+        else:
+            with metrics.span("build_messages"):
+                messages = build_messages(curriculum, groups, cache, scheduler, today)
+
+    sent = {email: (day, None) for email, day in carried.items()}
+
+    def track(messages):
+        for m in messages:
+            sent[m["to_email"]] = (m["day"], m["size"])
+            yield m
+
+    def record(result: dict):
+        store.record_delivery(run_key, result, *sent.get(result["to_email"], (None, None)))
+
+    def confirm(to_email: str):
+        # 같은 실행 키의 다른 발송분(다른 시간대 수신자)은 건너뜀
+        if to_email in sent:
+            scheduler.confirm(to_email, today)
+
+    try:
+        return dispatch(email_sender, track(messages), run_key,
+                        on_delivered=confirm if scheduler is not None else None,
+                        on_result=record if store is not None else None)
+    finally:
+        if store is not None:
+            store.flush()
+
+
+def personal_profiles(roster: list, store, max_days: int) -> dict:
+    """
+    개인화 정보 {email: {"name", "progress_percent"}}
+
+    상태 저장소가 있으면 실제로 받은 일차 수로 개인 진행률을 계산하고,
+    없으면 진행률은 일차 기준(기본값)으로 둡니다.
+    """
+    delivered = store.delivered_days() if store is not None else {}
+    profiles = {}
+    for recipient in roster:
+        profile = {"name": recipient.get("name")}
+        if store is not None:
+            # 오늘 받을 일차까지 포함한 진행률
+            days = delivered.get(recipient["email"], 0) + 1
+            profile["progress_percent"] = min(days / max_days, 1) * 100
+        profiles[recipient["email"]] = profile
+    return profiles
+
+
+def report(run_key: str = None, days: int = 7) -> int:
+    """상태 저장소 기준 일차별 수신자 수, 최근 실행 발송 통계, 반복 실패 수신자 보고"""
+    store = get_state_store()
+    if store is None:
+        print("Error: STATE_DB=false 상태에서는 report를 실행할 수 없습니다.")
         return 1
 
+    try:
+        counts = store.day_counts()
+        print(f"📊 활성 수신자 {sum(counts.values())}명, 학습 일차 {len(counts)}종")
+        for day, count in sorted(counts.items()):
+            print(f"   Day {day:>3}: {count}명")
+        for email, since in store.paused():
+            print(f"⏸️ 일시 중지: {email} ({since}부터)")
+
+        run_key = run_key or store.last_run_key()
+        if run_key:
+            s = store.run_summary(run_key)
+            print(f"📧 실행 {run_key}: 시도 {s['attempts']}건, 발송 {s['delivered']}명, 실패 {s['failed']}명,"
+                  f" 평균 {s['avg_size'] / 1024:.1f}KB / 최대 {s['max_size'] / 1024:.1f}KB")
+        since = datetime.now().timestamp() - days * 86400
+        for email, failures, error in store.failing_recipients(since):
+            print(f"⚠️ 최근 {days}일 실패 {failures}회: {email} ({error})")
+    finally:
+        store.close()
+    return 0
+
+
+def adjust_recipient(action: str, email: str, days: int = 0) -> int:
+    """수신자 일시 중지·재개·일차 조정 (다음 발송 시 현재 일차에 반영)"""
+    store = get_state_store()
+    if store is None:
+        print("Error: STATE_DB=false 상태에서는 수신자 상태를 바꿀 수 없습니다.")
+        return 1
+
+    today = datetime.now().date()
+    try:
+        if action == "pause":
+            changed = store.pause(email, today)
+        elif action == "resume":
+            changed = store.resume(email, today)
+        else:
+            changed = store.shift(email, days)
+    finally:
+        store.close()
+
+    if not changed:
+        print(f"❌ 변경 없음: {email} (등록되지 않았거나 이미 {action} 상태)")
+        return 1
+    print(f"✅ {email}: {action}{f' {days:+d}일' if action == 'shift' else ''}")
+    return 0
+
+
+def catchup(start: int, end: int, recipients: list = None) -> int:
+    """
+    밀린 일차(start~end)를 모아보기 메일 한 통으로 발송
+
+    커리큘럼은 한 번만 로드하고 본문도 한 번만 렌더링해 모든 수신자에게 공유합니다.
+
+    Args:
+        start: 첫 일차
+        end: 마지막 일차
+        recipients: 수신자 이메일 목록 (없으면 명단 전체)
+    """
+    sender_email = os.environ.get("SENDER_EMAIL")
+    sender_password = os.environ.get("SENDER_PASSWORD")
+    recipients = recipients or [r["email"] for r in load_roster()]
+    if not all([recipients, sender_email, sender_password]):
+        print("Error: 필수 환경 변수가 설정되지 않았습니다.")
+        return 1
+
+    with metrics.span("load_curriculum"):
+        curriculum = load_curriculum()
+    max_days = curriculum["program_info"].get("duration_days", 90)
+    if not (1 <= start <= max_days and 1 <= end <= max_days):
+        print(f"Error: 일차는 1~{max_days} 범위여야 합니다.")
+        return 1
+
+    days = day_range(start, end, max_days)
+    ai_contents = get_ai_contents(curriculum, days)
+
+    with metrics.span("render"):
+        html = render_days(curriculum, start, end, ai_contents)
+        if use_minify():
+            html = optimize_html(html)
+    size = check_size(html, env_int("HTML_SIZE_BUDGET", GMAIL_CLIP_BYTES), f"Day {start}~{end} 모아보기")
+    print(f"📬 Day {start}~{end} 모아보기 ({len(days)}일, {size / 1024:.1f}KB) → {len(recipients)}명")
+
+    subject = f"[SWRO Day {start}~{end}] 밀린 학습 모아보기 ({len(days)}일)"
+    messages = [{"to_email": email, "subject": subject, "html_content": html} for email in recipients]
+    email_sender = create_sender(sender_email, sender_password)
+    return dispatch(email_sender, messages, f"catchup-{start}-{end}-{datetime.now().strftime('%Y-%m-%d')}")
+
+
+def main(argv: list = None) -> int:
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="SWRO 일일 학습 메일")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="모듈별 import·초기화 시간 보고 (발송하지 않음)")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("send", help="오늘의 학습 메일 발송 (기본)")
+    subparsers.add_parser("daemon", help="상주하며 수신자 현지 아침 시각에 맞춰 매일 발송")
+    subparsers.add_parser("prerender", help="전체 일차 HTML 사전 렌더링")
+    shard_parser = subparsers.add_parser("shard", help="커리큘럼을 모듈별 샤드로 변환")
+    shard_parser.add_argument("--output", default=str(DATA_DIR / "shards"), help="샤드 출력 디렉터리")
+    pregenerate_parser = subparsers.add_parser("pregenerate", help="다음 N일의 AI 콘텐츠 사전 생성")
+    pregenerate_parser.add_argument("--days", type=int, default=3, help="생성할 일수")
+    catchup_parser = subparsers.add_parser("catchup", help="밀린 일차를 모아보기 메일 한 통으로 발송")
+    catchup_parser.add_argument("--start", type=int, required=True, help="첫 일차")
+    catchup_parser.add_argument("--end", type=int, required=True, help="마지막 일차")
+    catchup_parser.add_argument("--to", nargs="+", help="수신자 이메일 (기본: 명단 전체)")
+    report_parser = subparsers.add_parser("report", help="수신자 진행 상태·발송 기록 보고")
+    report_parser.add_argument("--run", help="실행 키 (기본: 가장 최근 실행)")
+    report_parser.add_argument("--days", type=int, default=7, help="반복 실패를 집계할 기간(일)")
+    recipient_parser = subparsers.add_parser("recipient", help="수신자 일시 중지·재개·일차 조정")
+    recipient_parser.add_argument("action", choices=["pause", "resume", "shift"], help="작업")
+    recipient_parser.add_argument("email", help="수신자 이메일")
+    recipient_parser.add_argument("--days", type=int, default=1, help="shift할 일수 (음수면 뒤로)")
+    args = parser.parse_args(argv)
+
+    if args.profile_startup:
+        from startup_profile import profile_startup
+        return profile_startup()
+
+    metrics.configure_from_env()
+    try:
+        with metrics.span(args.command or "send"):
+            if args.command == "prerender":
+                return prerender()
+            if args.command == "shard":
+                return shard(args.output)
+            if args.command == "pregenerate":
+                return pregenerate(args.days)
+            if args.command == "catchup":
+                return catchup(args.start, args.end, args.to)
+            if args.command == "report":
+                return report(args.run, args.days)
+            if args.command == "recipient":
+                return adjust_recipient(args.action, args.email, args.days)
+            if args.command == "daemon":
+                from daemon import run_daemon
+                return run_daemon()
+            return send()
+    finally:
+        path = metrics.write()
+        if path:
+            print(f"📈 실행 지표 저장: {path}")
+
 
 if __name__ == "__main__":
     exit(main())
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+커리큘럼용 단일 패스 마크다운 렌더러
+
+지원 문법: ## / ### 헤더, **굵게**, `인라인 코드`, ``` 코드 블록,
+- / * / 1. 목록, | 표 |, 빈 줄로 구분되는 문단.
+텍스트를 줄 단위로 한 번만 훑으며 결과를 하나의 버퍼에 쌓습니다.
+코드 블록 내부에는 인라인 변환이나 줄바꿈 변환을 적용하지 않습니다.
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+
+CORPUS_PATH = Path(__file__).parent.parent / "data" / "markdown_corpus.json"
+
+_ESCAPE = {ord("&"): "&amp;", ord("<"): "&lt;", ord(">"): "&gt;"}
+_INLINE = re.compile(r"\*\*(.+?)\*\*|`([^`]+)`")
+_LIST_MARKERS = frozenset("-*0123456789")
+_LIST_ITEM = re.compile(r"\s*(?:([-*])|(\d+)\.)\s+(.*)")
+_TABLE_SEPARATOR = re.compile(r"\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?")
+
+
+def _escape(text: str) -> str:
+    if "&" in text or "<" in text or ">" in text:
+        return text.translate(_ESCAPE)
+    return text
+
+
+def _inline(text: str, out: list):
+    """HTML 이스케이프와 굵게/인라인 코드 변환을 한 번의 스캔으로 처리"""
+    if "*" not in text and "`" not in text:
+        out.append(_escape(text))
+        return
+    pos = 0
+    for m in _INLINE.finditer(text):
+        out.append(_escape(text[pos:m.start()]))
+        if m.group(1) is not None:
+            out.append("<strong>")
+            _inline(m.group(1), out)
+            out.append("</strong>")
+        else:
+            out.append("<code>")
+            out.append(_escape(m.group(2)))
+            out.append("</code>")
+        pos = m.end()
+    out.append(_escape(text[pos:]))
+
+
+def _table_cells(line: str) -> list:
+    return [cell.strip() for cell in line.strip().strip("|").split("|")]
+
+
+def render_markdown(text: str) -> str:
+    """
+    마크다운 텍스트를 HTML로 변환
+
+    Args:
+        text: 마크다운 텍스트
+
+    Returns:
+        str: HTML 조각 (빈 입력이면 빈 문자열)
+    """
+    if not text:
+        return ""
+
+    out = []
+    paragraph = []     # 현재 문단의 줄
+    list_tag = None    # 열려 있는 목록 태그 (ul/ol)
+    table = []         # 현재 표의 행
+    fence = None       # 코드 블록 내부 줄 (코드 블록 밖이면 None)
+
+    def close_blocks():
+        nonlocal list_tag
+        if paragraph:
+            out.append("<p>")
+            for i, line in enumerate(paragraph):
+                if i:
+                    out.append("<br>")
+                _inline(line, out)
+            out.append("</p>")
+            paragraph.clear()
+        if list_tag:
+            out.append(f"</{list_tag}>")
+            list_tag = None
+        if table:
+            _render_table(table, out)
+            table.clear()
+
+    for line in text.split("\n"):
+        stripped = line.strip()
+
+        if fence is not None:
+            if stripped.startswith("```"):
+                out.append('<pre class="code-block">')
+                out.append("\n".join(fence).translate(_ESCAPE))
+                out.append("</pre>")
+                fence = None
+            else:
+                fence.append(line)
+            continue
+
+        if stripped[:3] == "```":
+            close_blocks()
+            fence = []
+            rest = stripped[3:]
+            if rest.endswith("```"):
+                # 한 줄짜리 코드 블록
+                fence.append(rest[:-3])
+                out.append('<pre class="code-block">')
+                out.append("\n".join(fence).translate(_ESCAPE))
+                out.append("</pre>")
+                fence = None
+            continue
+
+        if not stripped:
+            close_blocks()
+            continue
+
+        if line.startswith(("## ", "### ")):
+            close_blocks()
+            tag = "h4" if line[2] == "#" else "h3"
+            out.append(f"<{tag}>")
+            _inline(line.split(" ", 1)[1].strip(), out)
+            out.append(f"</{tag}>")
+            continue
+
+        item = _LIST_ITEM.fullmatch(line) if stripped[0] in _LIST_MARKERS else None
+        if item:
+            tag = "ol" if item.group(2) else "ul"
+            if list_tag != tag:
+                close_blocks()
+                out.append(f"<{tag}>")
+                list_tag = tag
+            out.append("<li>")
+            _inline(item.group(3), out)
+            out.append("</li>")
+            continue
+
+        if stripped.startswith("|") and stripped.endswith("|") and len(stripped) > 1:
+            if not table:
+                close_blocks()
+            table.append(stripped)
+            continue
+
+        if list_tag or table:
+            close_blocks()
+        paragraph.append(line)
+
+    if fence is not None:
+        # 닫히지 않은 코드 블록은 끝까지 코드로 처리
+        out.append('<pre class="code-block">')
+        out.append("\n".join(fence).translate(_ESCAPE))
+        out.append("</pre>")
+    close_blocks()
+
+    return "".join(out)
+
+
+def _render_table(rows: list, out: list):
+    """표 렌더링 (두 번째 행이 구분선이면 첫 행을 헤더로 사용)"""
+    has_header = len(rows) > 1 and _TABLE_SEPARATOR.fullmatch(rows[1]) is not None
+    out.append("<table>")
+    for i, row in enumerate(rows):
+        if has_header and i == 1:
+            continue
+        cell_tag = "th" if has_header and i == 0 else "td"
+        out.append("<tr>")
+        for cell in _table_cells(row):
+            out.append(f"<{cell_tag}>")
+            _inline(cell, out)
+            out.append(f"</{cell_tag}>")
+        out.append("</tr>")
+    out.append("</table>")
+
+
+# ---------------------------------------------------------------------------
+# 회귀 코퍼스 검사 및 성능 비교
+#   python markdown_renderer.py            코퍼스 검사
+#   python markdown_renderer.py --update   커리큘럼에서 코퍼스 재생성
+#   python markdown_renderer.py --bench    기존 정규식 체인과 속도 비교 (일차·모아보기 분량 본문)
+# ---------------------------------------------------------------------------
+
+# 커리큘럼에 아직 없는 문법의 회귀 케이스
+_EXTRA_CASES = {
+    "fence-with-inline-markers": "설명\n\n```\nNDP = `P` - **π**\n\nline2\n```\n\n끝",
+    "ordered-list": "1. 첫째\n2. **둘째**\n3. `셋째`",
+    "table": "| 항목 | 값 |\n|---|---|\n| SDI | < 3 |\n| **SEC** | 3.2 kWh/m³ |",
+    "list-then-paragraph": "- a\n- b\n문단",
+}
+
+
+def _corpus_sources() -> dict:
+    curriculum = json.loads((CORPUS_PATH.parent / "curriculum.json").read_text(encoding="utf-8"))
+    sources = {}
+    for module in curriculum["modules"]:
+        for topic in module.get("topics", []):
+            for field in ("detailed_explanation", "exercises"):
+                if topic.get(field):
+                    sources[f"day{topic['day']:03d}-{field}"] = topic[field]
+    sources.update(_EXTRA_CASES)
+    return sources
+
+
+def _legacy_markdown_to_html(text: str) -> str:
+    """이전 정규식 체인 구현 (성능 비교용)"""
+    text = re.sub(r'^## (.+)$', r'<h3>\1</h3>', text, flags=re.MULTILINE)
+    text = re.sub(r'^### (.+)$', r'<h4>\1</h4>', text, flags=re.MULTILINE)
+    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
+    text = re.sub(r'```\n?(.*?)\n?```', r'<pre class="code-block">\1</pre>', text, flags=re.DOTALL)
+    text = re.sub(r'`(.+?)`', r'<code>\1</code>', text)
+    text = text.replace('\n\n', '</p><p>')
+    text = text.replace('\n', '<br>')
+    return f"<p>{text}</p>"
+
+
+def _check_corpus() -> int:
+    corpus = json.loads(CORPUS_PATH.read_text(encoding="utf-8"))
+    failed = [name for name, case in corpus.items()
+              if render_markdown(case["markdown"]) != case["html"]]
+    for name in failed:
+        print(f"❌ {name}")
+    print(f"{'✅' if not failed else '❌'} 마크다운 코퍼스 {len(corpus) - len(failed)}/{len(corpus)}건 일치")
+    return 1 if failed else 0
+
+
+def _update_corpus() -> int:
+    corpus = {name: {"markdown": text, "html": render_markdown(text)}
+              for name, text in sorted(_corpus_sources().items())}
+    CORPUS_PATH.write_text(json.dumps(corpus, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    print(f"✅ 마크다운 코퍼스 {len(corpus)}건 저장: {CORPUS_PATH}")
+    return 0
+
+
+def _bench_documents() -> dict:
+    """
+    실제 메일 본문 크기의 비교용 문서
+
+    코퍼스 조각은 수백 자라 호출 오버헤드가 대부분이므로, 조각을 모두 이은 한 일차 분량
+    본문과 모아보기 메일 크기(그 10배)로 비교합니다.
+    """
+    lesson = "\n\n".join(_corpus_sources().values())
+    return {"lesson": lesson, "catchup x10": "\n\n".join([lesson] * 10)}
+
+
+def _bench() -> int:
+    import statistics
+    import timeit
+
+    for name, text in _bench_documents().items():
+        number = max(10, 200_000 // len(text))
+        timings = {}
+        for label, fn in (("legacy re.sub", _legacy_markdown_to_html), ("single-pass", render_markdown)):
+            runs = [t / number * 1e6 for t in timeit.repeat(lambda: fn(text), number=number, repeat=15)]
+            timings[label] = (min(runs), statistics.median(runs))
+            print(f"{name:>12} {label:>14}: min {timings[label][0]:8.1f} µs, median {timings[label][1]:8.1f} µs "
+                  f"({len(text):,}자)")
+        ratio = timings["single-pass"][1] / timings["legacy re.sub"][1]
+        print(f"{name:>12} {'single/legacy':>14}: median 기준 {ratio:.2f}배")
+    return 0
+
+
+if __name__ == "__main__":
+    if "--update" in sys.argv:
+        exit(_update_corpus())
+    if "--bench" in sys.argv:
+        exit(_bench())
+    exit(_check_corpus())
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+단계별 실행 시간·발송 지표 수집
+
+커리큘럼 로드, 렌더링, AI 호출, SMTP 연결(TCP/STARTTLS/로그인), DATA 전송 등
+각 단계를 span으로 감싸 호출 수·누적 시간·최대 시간을 모으고,
+메시지 크기와 수신자별 발송 결과를 함께 기록합니다.
+
+METRICS_FILE이 설정된 경우에만 수집하며(설정되지 않으면 span은 아무것도 하지 않는
+공용 객체를 반환), 실행이 끝나면 JSON 또는 Prometheus textfile 형식으로 저장합니다.
+
+    METRICS_FILE=metrics.json python main.py
+    METRICS_FILE=/var/lib/node_exporter/swro.prom python main.py
+"""
+
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+_NULL_SPAN = nullcontext()
+
+_enabled = False
+_lock = threading.Lock()
+_spans = {}        # name → [호출 수, 누적 시간(초), 최대 시간(초)]
+_counters = {}     # name → 값
+_observations = {}  # name → [개수, 합계, 최댓값]
+_recipients = {}   # to_email → {success, bytes, seconds, error}
+
+
+class _Span:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.started
+        with _lock:
+            stat = _spans.get(self.name)
+            if stat is None:
+                _spans[self.name] = [1, elapsed, elapsed]
+            else:
+                stat[0] += 1
+                stat[1] += elapsed
+                if elapsed > stat[2]:
+                    stat[2] = elapsed
+        return False
+
+
+def enabled() -> bool:
+    """지표 수집 여부"""
+    return _enabled
+
+
+def configure(enable: bool = True):
+    """지표 수집 켜기/끄기 (켤 때 이전 기록은 지움)"""
+    global _enabled
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+        _observations.clear()
+        _recipients.clear()
+    _enabled = enable
+
+
+def configure_from_env():
+    """METRICS_FILE이 있으면 지표 수집 시작"""
+    configure(bool(os.environ.get("METRICS_FILE")))
+
+
+def span(name: str):
+    """
+    단계 실행 시간 측정 컨텍스트
+
+        with metrics.span("render"):
+            ...
+
+    수집이 꺼져 있으면 공용 nullcontext를 반환합니다.
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def timed(name: str):
+    """함수 실행 시간을 span으로 측정하는 데코레이터"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name: str, value: float = 1):
+    """카운터 증가"""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def observe(name: str, value: float):
+    """값 분포 기록 (개수, 합계, 최댓값)"""
+    if not _enabled:
+        return
+    with _lock:
+        stat = _observations.get(name)
+        if stat is None:
+            _observations[name] = [1, value, value]
+        else:
+            stat[0] += 1
+            stat[1] += value
+            if value > stat[2]:
+                stat[2] = value
+
+
+def record_recipient(to_email: str, success: bool, size: int = None,
+                     seconds: float = None, error: str = None):
+    """수신자별 발송 결과 기록 (같은 수신자는 시도 횟수 누적)"""
+    if not _enabled:
+        return
+    with _lock:
+        entry = _recipients.setdefault(to_email, {"attempts": 0})
+        entry["attempts"] += 1
+        entry.update(success=success, bytes=size, seconds=seconds, error=error)
+
+
+def snapshot() -> dict:
+    """현재까지의 지표 (JSON 직렬화 가능한 dict)"""
+    with _lock:
+        return {
+            "timestamp": time.time(),
+            "spans": {name: {"count": c, "seconds": round(total, 6), "max_seconds": round(peak, 6)}
+                      for name, (c, total, peak) in _spans.items()},
+            "counters": dict(_counters),
+            "observations": {name: {"count": c, "sum": total, "max": peak}
+                             for name, (c, total, peak) in _observations.items()},
+            "recipients": {email: dict(entry) for email, entry in _recipients.items()},
+        }
+
+
+def _metric_name(name: str) -> str:
+    return "".join(ch if ch.isalnum() else "_" for ch in name)
+
+
+def to_prometheus(data: dict, prefix: str = "swro") -> str:
+    """
+    Prometheus textfile 형식으로 변환
+
+    수신자별 기록은 레이블 수가 커지므로 성공/실패 합계로만 내보냅니다.
+    """
+    lines = [
+        f"# TYPE {prefix}_stage_seconds_total counter",
+        *(f'{prefix}_stage_seconds_total{{stage="{name}"}} {s["seconds"]}'
+          for name, s in data["spans"].items()),
+        f"# TYPE {prefix}_stage_calls_total counter",
+        *(f'{prefix}_stage_calls_total{{stage="{name}"}} {s["count"]}'
+          for name, s in data["spans"].items()),
+        f"# TYPE {prefix}_stage_seconds_max gauge",
+        *(f'{prefix}_stage_seconds_max{{stage="{name}"}} {s["max_seconds"]}'
+          for name, s in data["spans"].items()),
+    ]
+    for name, value in data["counters"].items():
+        metric = f"{prefix}_{_metric_name(name)}_total"
+        lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+    for name, o in data["observations"].items():
+        metric = f"{prefix}_{_metric_name(name)}"
+        lines += [f"# TYPE {metric} summary", f"{metric}_count {o['count']}",
+                  f"{metric}_sum {o['sum']}", f"# TYPE {metric}_max gauge", f"{metric}_max {o['max']}"]
+
+    recipients = data["recipients"].values()
+    lines += [
+        f"# TYPE {prefix}_recipients gauge",
+        f'{prefix}_recipients{{result="delivered"}} {sum(1 for r in recipients if r["success"])}',
+        f'{prefix}_recipients{{result="failed"}} {sum(1 for r in recipients if not r["success"])}',
+        f"# TYPE {prefix}_last_run_timestamp_seconds gauge",
+        f"{prefix}_last_run_timestamp_seconds {data['timestamp']:.0f}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def write(path: str = None, fmt: str = None) -> Path:
+    """
+    수집한 지표를 파일로 저장 (원자적 교체)
+
+    Args:
+        path: 저장 경로 (기본: METRICS_FILE)
+        fmt: "json" 또는 "prometheus" (기본: METRICS_FORMAT, 없으면 확장자 .prom이면 prometheus)
+
+    Returns:
+        Path: 저장된 파일 경로 (수집이 꺼져 있거나 경로가 없으면 None)
+    """
+    path = path or os.environ.get("METRICS_FILE")
+    if not _enabled or not path:
+        return None
+    path = Path(path)
+    fmt = fmt or os.environ.get("METRICS_FORMAT") or ("prometheus" if path.suffix == ".prom" else "json")
+
+    data = snapshot()
+    if fmt == "prometheus":
+        text = to_prometheus(data)
+    else:
+        text = json.dumps(data, ensure_ascii=False, indent=2) + "\n"
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+    return path
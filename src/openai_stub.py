@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+OpenAI 클라이언트 로컬 스텁
+
+네트워크 없이 AI 경로를 실행·점검하기 위한 가짜 클라이언트입니다.
+chat.completions, files, batches 중 이 프로젝트가 쓰는 부분만 흉내 냅니다.
+OPENAI_STUB=true이면 content_generator.get_client가 이 스텁을,
+create_async_client가 비동기 스텁(응답 지연·스트리밍 지원)을 반환합니다.
+"""
+
+import asyncio
+import itertools
+import json
+import re
+from types import SimpleNamespace
+from typing import Callable, Optional, Union
+
+_DAY_PATTERN = re.compile(r"\[Day (\d+)\]")
+
+
+def default_responder(model: str, messages: list, params: dict) -> str:
+    """프롬프트 형식에 맞는 결정적인 가짜 응답 생성"""
+    prompt = messages[-1]["content"]
+    quiz = {
+        "question": "스텁 퀴즈: SWRO의 일반적인 SEC 범위는?",
+        "options": ["A. 2.5~4 kWh/m³", "B. 10~15 kWh/m³", "C. 8~12 kWh/m³", "D. 0.5~1 kWh/m³"],
+        "correct": "A",
+        "explanation": "스텁 응답입니다.",
+    }
+    if params.get("response_format", {}).get("type") == "json_object":
+        days = [int(d) for d in _DAY_PATTERN.findall(prompt)]
+        if days:
+            return json.dumps({"quizzes": [dict(quiz, day=day) for day in days]}, ensure_ascii=False)
+        return json.dumps(quiz, ensure_ascii=False)
+    return "<p>스텁 AI 응답입니다.</p>"
+
+
+def _completion(content: str):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class _Completions:
+    def __init__(self, client):
+        self._client = client
+
+    def create(self, model: str, messages: list, **params):
+        self._client.calls.append({"model": model, "messages": messages, "params": params})
+        return _completion(self._client.responder(model, messages, params))
+
+
+class _Files:
+    def __init__(self):
+        self._files = {}
+        self._ids = itertools.count(1)
+
+    def create(self, file, purpose: str):
+        if isinstance(file, tuple):
+            data = file[1]
+        else:
+            data = file.read()
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        file_id = f"file-stub-{next(self._ids)}"
+        self._files[file_id] = data
+        return SimpleNamespace(id=file_id, purpose=purpose)
+
+    def content(self, file_id: str):
+        return SimpleNamespace(text=self._files[file_id])
+
+
+class _Batches:
+    """배치 요청을 즉시 처리하는 스텁 (status는 바로 completed)"""
+
+    def __init__(self, client):
+        self._client = client
+        self._batches = {}
+        self._ids = itertools.count(1)
+
+    def create(self, input_file_id: str, endpoint: str, completion_window: str, **kwargs):
+        lines = []
+        for line in self._client.files.content(input_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            body = dict(request["body"])
+            model = body.pop("model")
+            messages = body.pop("messages")
+            content = self._client.responder(model, messages, body)
+            lines.append(json.dumps({
+                "custom_id": request["custom_id"],
+                "response": {"status_code": 200, "body": {"choices": [{"message": {"content": content}}]}},
+            }, ensure_ascii=False))
+
+        output = self._client.files.create(file=("output.jsonl", "\n".join(lines)), purpose="batch_output")
+        batch = SimpleNamespace(id=f"batch-stub-{next(self._ids)}", status="completed",
+                                endpoint=endpoint, output_file_id=output.id)
+        self._batches[batch.id] = batch
+        return batch
+
+    def retrieve(self, batch_id: str):
+        return self._batches[batch_id]
+
+
+class StubOpenAIClient:
+    """openai.OpenAI 대신 쓰는 로컬 스텁 클라이언트"""
+
+    def __init__(self, responder: Optional[Callable[[str, list, dict], str]] = None):
+        """
+        Args:
+            responder: (model, messages, params) → 응답 텍스트 함수
+                (기본: default_responder)
+        """
+        self.responder = responder or default_responder
+        self.calls = []
+        self.chat = SimpleNamespace(completions=_Completions(self))
+        self.files = _Files()
+        self.batches = _Batches(self)
+
+
+class _AsyncStream:
+    """스트리밍 응답 스텁 (chunk.choices[0].delta.content)"""
+
+    def __init__(self, content: str, chunk_size: int = 20):
+        self._parts = [content[i:i + chunk_size] for i in range(0, len(content), chunk_size)]
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for part in self._parts:
+            await asyncio.sleep(0)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=part))])
+
+    async def close(self):
+        pass
+
+
+class _AsyncCompletions:
+    def __init__(self, client):
+        self._client = client
+
+    async def create(self, model: str, messages: list, stream: bool = False, **params):
+        self._client.calls.append({"model": model, "messages": messages, "params": params, "stream": stream})
+        latency = self._client.latency
+        await asyncio.sleep(latency() if callable(latency) else latency)
+        content = self._client.responder(model, messages, params)
+        return _AsyncStream(content) if stream else _completion(content)
+
+
+class AsyncStubOpenAIClient:
+    """openai.AsyncOpenAI 대신 쓰는 로컬 스텁 클라이언트 (chat.completions만 지원)"""
+
+    def __init__(self, responder: Optional[Callable[[str, list, dict], str]] = None,
+                 latency: Union[float, Callable[[], float]] = 0.0):
+        """
+        Args:
+            responder: (model, messages, params) → 응답 텍스트 함수 (기본: default_responder)
+            latency: 응답 지연(초) 또는 호출마다 지연을 반환하는 함수 (꼬리 지연 재현용)
+        """
+        self.responder = responder or default_responder
+        self.latency = latency
+        self.calls = []
+        self.chat = SimpleNamespace(completions=_AsyncCompletions(self))
+
+    async def close(self):
+        pass
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+영속 발송함 (outbox)
+
+렌더링된 MIME 메시지를 발송 전에 SQLite 파일에 저장하고,
+SMTP 서버가 수락한 메시지는 즉시 delivered로 표시합니다.
+각 메시지는 (실행 키, 수신자) 멱등 키를 가지므로 같은 날 재실행하면
+이미 발송된 수신자는 건너뛰고 남은 메시지만 이어서 보냅니다.
+일시 오류는 지수 백오프로 재시도하고, 영구 오류는 failed로 남깁니다.
+일일 발송 한도에 걸리거나 SMTP 인증 실패로 보내지 못한 메시지는 시도 횟수를 늘리지 않고
+pending으로 남겨 다음 실행에서 이어서 보냅니다.
+발송이 끝난(delivered/failed) 메시지는 본문(payload)을 바로 비우고,
+보존 기간이 지나면 prune으로 행을 삭제합니다.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List
+
+DEFAULT_OUTBOX_PATH = Path(__file__).parent.parent / ".state" / "outbox.sqlite3"
+
+PENDING = "pending"
+DELIVERED = "delivered"
+FAILED = "failed"
+
+
+class Outbox:
+    """SQLite 기반 영속 발송함"""
+
+    def __init__(self, path: Path = None, max_attempts: int = 5,
+                 base_delay: float = 30.0, max_delay: float = 1800.0):
+        """
+        Args:
+            path: SQLite 파일 경로 (기본: 저장소/.state/outbox.sqlite3)
+            max_attempts: 메시지당 최대 발송 시도 횟수
+            base_delay: 첫 재시도 대기 시간(초, 시도마다 2배)
+            max_delay: 재시도 대기 시간 상한(초)
+        """
+        self.path = Path(path or DEFAULT_OUTBOX_PATH)
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            " id TEXT PRIMARY KEY,"
+            " run_key TEXT NOT NULL,"
+            " to_email TEXT NOT NULL,"
+            " subject TEXT,"
+            " payload BLOB NOT NULL,"
+            " status TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " next_attempt_at REAL NOT NULL,"
+            " last_error TEXT,"
+            " created_at REAL NOT NULL,"
+            " delivered_at REAL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def message_id(run_key: str, to_email: str) -> str:
+        """(실행 키, 수신자) 멱등 키"""
+        return hashlib.sha256(f"{run_key}\n{to_email.lower()}".encode("utf-8")).hexdigest()
+
+    def enqueue(self, run_key: str, messages: List[dict], build_payload: Callable[[dict], bytes]) -> int:
+        """
+        메시지를 발송함에 저장 (같은 멱등 키가 이미 있으면 건너뜀)
+
+        Args:
+            run_key: 실행 키 (예: 발송 날짜)
+            messages: deliver에 넘기는 메시지 dict 목록
+            build_payload: 메시지 dict를 MIME 바이트로 만드는 함수
+
+        Returns:
+            int: 새로 저장된 메시지 수
+        """
+        now = time.time()
+        with self._lock:
+            existing = {row[0] for row in self._conn.execute(
+                "SELECT id FROM outbox WHERE run_key = ?", (run_key,)
+            )}
+            rows = []
+            for message in messages:
+                key = self.message_id(run_key, message["to_email"])
+                if key in existing:
+                    continue
+                existing.add(key)
+                rows.append((key, run_key, message["to_email"], message.get("subject"),
+                             build_payload(message), PENDING, now, now))
+            self._conn.executemany(
+                "INSERT INTO outbox (id, run_key, to_email, subject, payload, status,"
+                " next_attempt_at, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def _due(self, now: float) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, to_email, payload FROM outbox"
+                " WHERE status = ? AND next_attempt_at <= ? ORDER BY created_at",
+                (PENDING, now)
+            ).fetchall()
+
+    def _next_due_at(self):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT MIN(next_attempt_at) FROM outbox WHERE status = ?", (PENDING,)
+            ).fetchone()[0]
+
+    def record(self, message_id: str, result: dict):
+        """발송 결과 기록 (성공 즉시 delivered, 일시 오류는 백오프 후 재시도 예약)"""
+        if result.get("quota") or result.get("auth"):
+            # 보내지 않은 메시지(일일 한도·인증 실패)이므로 상태·시도 횟수를 그대로 둠
+            return
+        now = time.time()
+        with self._lock:
+            if result["success"]:
+                # 다시 보낼 일이 없으므로 본문(수신자 주소·렌더링된 메일)은 보관하지 않음
+                self._conn.execute(
+                    "UPDATE outbox SET status = ?, attempts = attempts + 1, delivered_at = ?,"
+                    " last_error = NULL, payload = X'' WHERE id = ?", (DELIVERED, now, message_id)
+                )
+            else:
+                attempts = self._conn.execute(
+                    "SELECT attempts FROM outbox WHERE id = ?", (message_id,)
+                ).fetchone()[0] + 1
+                retry = result.get("temporary") and attempts < self.max_attempts
+                delay = min(self.max_delay, self.base_delay * (2 ** (attempts - 1)))
+                self._conn.execute(
+                    "UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?,"
+                    " payload = CASE WHEN ? THEN payload ELSE X'' END WHERE id = ?",
+                    (PENDING if retry else FAILED, attempts, now + delay, result.get("error"), retry, message_id)
+                )
+            self._conn.commit()
+
+    def flush(self, send_fn: Callable, max_wait: float = 600.0) -> dict:
+        """
+        발송 대기 중인 메시지를 모두 발송
+
+        재시도 예약 시각까지 기다리되, 다음 재시도가 max_wait초보다 멀면
+        남은 메시지는 다음 실행으로 넘깁니다.
+
+        Args:
+            send_fn: (messages, on_result)를 받아 결과 목록을 반환하는 발송 함수
+                (main.deliver와 같은 시그니처, 결과에 "quota"나 "auth"가 있으면 발송을 멈춤)
+            max_wait: 재시도를 위해 이번 실행에서 기다릴 최대 시간(초)
+
+        Returns:
+            dict: 상태별 메시지 수 (delivered, pending, failed)
+        """
+        deadline = time.time() + max_wait
+        while True:
+            now = time.time()
+            due = self._due(now)
+            if due:
+                ids = {}
+                batch = []
+                for message_id, to_email, payload in due:
+                    # 같은 수신자의 다른 실행 분은 다음 묶음에서 발송
+                    if to_email in ids:
+                        continue
+                    ids[to_email] = message_id
+                    batch.append({"to_email": to_email, "payload": payload})
+                results = send_fn(batch, lambda result: self.record(ids[result["to_email"]], result))
+                if any(r.get("quota") for r in results):
+                    print(f"🚫 일일 발송 한도 도달, 남은 {self.summary()[PENDING]}건은 다음 실행에서 발송")
+                    break
+                if any(r.get("auth") for r in results):
+                    print(f"🚫 SMTP 인증 실패, 남은 {self.summary()[PENDING]}건은 다음 실행에서 발송")
+                    break
+                continue
+
+            next_due = self._next_due_at()
+            if next_due is None or next_due > deadline:
+                break
+            wait = max(0.0, next_due - now)
+            print(f"⏳ 일시 오류 메시지 {wait:.0f}초 후 재시도")
+            time.sleep(wait)
+
+        return self.summary()
+
+    def summary(self, run_key: str = None) -> dict:
+        """상태별 메시지 수"""
+        query = "SELECT status, COUNT(*) FROM outbox"
+        params = ()
+        if run_key is not None:
+            query += " WHERE run_key = ?"
+            params = (run_key,)
+        with self._lock:
+            counts = dict(self._conn.execute(query + " GROUP BY status", params).fetchall())
+        return {status: counts.get(status, 0) for status in (DELIVERED, PENDING, FAILED)}
+
+    def delivered(self, run_key: str) -> List[str]:
+        """run_key에서 발송 완료된 수신자 목록"""
+        with self._lock:
+            rows = self._conn.execute("SELECT to_email FROM outbox WHERE status = ? AND run_key = ?",
+                                      (DELIVERED, run_key)).fetchall()
+        return [r[0] for r in rows]
+
+    def queued(self, run_key: str) -> set:
+        """run_key로 이미 저장된 수신자 (상태 무관, 다시 enqueue해도 건너뜀)"""
+        with self._lock:
+            rows = self._conn.execute("SELECT to_email FROM outbox WHERE run_key = ?", (run_key,)).fetchall()
+        return {r[0] for r in rows}
+
+    def delivered_since(self, since: float) -> int:
+        """since(UNIX 시각) 이후 발송 완료된 메시지 수 (일일 발송 한도 집계용)"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM outbox WHERE status = ? AND delivered_at >= ?",
+                                      (DELIVERED, since)).fetchone()[0]
+
+    def failed(self, run_key: str = None) -> List[dict]:
+        """failed 상태 메시지 목록 (to_email, attempts, last_error)"""
+        query = "SELECT to_email, attempts, last_error FROM outbox WHERE status = ?"
+        params = [FAILED]
+        if run_key is not None:
+            query += " AND run_key = ?"
+            params.append(run_key)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [{"to_email": r[0], "attempts": r[1], "error": r[2]} for r in rows]
+
+    def prune(self, older_than: float) -> int:
+        """
+        보존 기간이 지난 발송 완료·실패 메시지 삭제 (pending은 남김)
+
+        Args:
+            older_than: 이 UNIX 시각보다 먼저 저장된 메시지를 삭제
+
+        Returns:
+            int: 삭제된 메시지 수
+        """
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM outbox WHERE status != ? AND created_at < ?", (PENDING, older_than)
+            ).rowcount
+            self._conn.commit()
+            if deleted:
+                # 캐시로 보존되는 파일 크기를 줄이기 위해 빈 페이지 반환
+                self._conn.execute("VACUUM")
+        return deleted
+
+    def close(self):
+        self._conn.close()
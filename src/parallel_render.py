@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+수신자별 개인화 메일의 병렬 렌더링 (프로세스 풀)
+
+이름·개인 진행률·복습 문항이 들어간 본문은 수신자마다 달라 일차별로 공유할 수 없고,
+create_email_content와 HTML 최적화는 GIL에 묶인 순수 Python 문자열 작업이라
+스레드로는 빨라지지 않습니다. 수신자 작업을 chunk 단위로 프로세스 풀에 나눠
+렌더링·HTML 최적화·MIME 직렬화까지 워커에서 처리하고, 결과는 입력 순서대로
+chunk가 끝나는 대로 흘려보냅니다.
+
+워커는 시작할 때 커리큘럼(스냅샷)과 일차별 AI 콘텐츠를 한 번만 읽습니다.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List
+
+# 워커 프로세스의 전역 상태 (_init_worker에서 채움)
+_worker = {}
+
+
+def _init_worker(sender_email: str, ai_contents: Dict[int, dict]):
+    """워커 초기화: 커리큘럼 로드, MIME 직렬화용 EmailSender 생성"""
+    from curriculum import load_curriculum
+    from email_sender import EmailSender
+
+    _worker["curriculum"] = load_curriculum()
+    _worker["sender"] = EmailSender(sender_email, "")
+    _worker["ai_contents"] = ai_contents
+
+
+def _render_chunk(jobs: List[dict]) -> List[dict]:
+    """작업 chunk 렌더링 → 발송용 메시지 dict 목록 (payload, day, size 포함)"""
+    from curriculum import get_topic_for_day
+    from html_optimizer import GMAIL_CLIP_BYTES, check_size
+    from main import env_int, render_lesson
+
+    curriculum = _worker["curriculum"]
+    sender = _worker["sender"]
+    budget = env_int("HTML_SIZE_BUDGET", GMAIL_CLIP_BYTES)
+    messages = []
+    for job in jobs:
+        day, to_email = job["day"], job["to_email"]
+        page = render_lesson(curriculum, day, get_topic_for_day(curriculum, day), None,
+                             _worker["ai_contents"].get(day), job.get("reviews"), job.get("recipient"))
+        size = check_size(page, budget, f"{to_email} Day {day}")
+        payload = sender.build_payload({"to_email": to_email, "subject": job["subject"], "html_content": page})
+        messages.append({"to_email": to_email, "subject": job["subject"], "payload": payload,
+                         "day": day, "size": size})
+    return messages
+
+
+def render_parallel(jobs: List[dict], sender_email: str, ai_contents: Dict[int, dict] = None,
+                    workers: int = None, chunk_size: int = 50) -> Iterator[dict]:
+    """
+    개인화 메일을 프로세스 풀에서 렌더링해 입력 순서대로 반환
+
+    Args:
+        jobs: {"to_email", "subject", "day", "recipient"(선택), "reviews"(선택)} 목록
+        sender_email: 보내는 사람 (From, Message-ID 도메인)
+        ai_contents: {일차: 사전 생성된 AI 콘텐츠}
+        workers: 워커 프로세스 수 (기본: CPU 수, 1이면 현재 프로세스에서 처리)
+        chunk_size: 워커에 한 번에 넘길 수신자 수
+
+    Yields:
+        dict: deliver에 넘길 메시지 (to_email, subject, payload, day, size)
+    """
+    ai_contents = ai_contents or {}
+    workers = max(1, workers or os.cpu_count() or 1)
+    chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+    workers = min(workers, len(chunks))
+
+    if workers <= 1:
+        _init_worker(sender_email, ai_contents)
+        for chunk in chunks:
+            yield from _render_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(sender_email, ai_contents)) as executor:
+        # map은 입력 순서를 유지하며, 앞선 chunk가 끝나는 대로 결과를 돌려줌
+        for messages in executor.map(_render_chunk, chunks):
+            yield from messages
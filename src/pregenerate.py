@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+다가오는 학습 일차의 AI 콘텐츠 사전 생성
+
+발송 전에 AI 보충 설명과 퀴즈를 스레드 풀에서 미리 생성해
+.cache/ai/에 저장합니다. 발송 시에는 저장된 결과만 읽으므로
+아침 발송이 OpenAI API 응답을 기다리지 않습니다.
+"""
+
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional
+
+from curriculum import get_topic_for_day
+from render_cache import topic_digest
+
+AI_CONTENT_DIR = Path(__file__).parent.parent / ".cache" / "ai"
+
+
+def ai_content_path(day: int, directory: Path = None) -> Path:
+    """일차별 AI 콘텐츠 파일 경로"""
+    return Path(directory or AI_CONTENT_DIR) / f"day{day:03d}.json"
+
+
+def load_ai_content(curriculum: dict, day: int, topic_data: dict,
+                    directory: Path = None) -> Optional[dict]:
+    """
+    사전 생성된 AI 콘텐츠 읽기
+
+    토픽 내용이 생성 이후 바뀌었으면(해시 불일치) None을 반환합니다.
+
+    Returns:
+        dict: {"supplement": str|None, "quiz": dict|None} 또는 None
+    """
+    if not topic_data:
+        return None
+    try:
+        with open(ai_content_path(day, directory), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("digest") != topic_digest(curriculum, topic_data):
+        return None
+    return {"supplement": data.get("supplement"), "quiz": data.get("quiz")}
+
+
+def _save_ai_content(path: Path, data: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def store_ai_content(curriculum: dict, day: int, topic_data: dict, supplement: Optional[str],
+                     quiz: Optional[dict], directory: Path = None):
+    """생성된 AI 콘텐츠 저장 (둘 다 없으면 저장하지 않음)"""
+    if not (supplement or quiz):
+        return
+    _save_ai_content(ai_content_path(day, directory), {
+        "day": day,
+        "digest": topic_digest(curriculum, topic_data),
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "supplement": supplement,
+        "quiz": quiz,
+    })
+
+
+def upcoming_days(current_days: Iterable[int], count: int, max_days: int) -> list:
+    """현재 일차들로부터 다음 count일 (과정 끝에서는 1일차로 순환)"""
+    days = set()
+    for current in current_days:
+        for offset in range(count):
+            days.add((current - 1 + offset) % max_days + 1)
+    return sorted(days)
+
+
+class AIPregenerator:
+    """AI 보충 설명·퀴즈를 병렬로 미리 생성하는 작업기"""
+
+    def __init__(self, generator, quiz_fn, workers: int = 4, retries: int = 3,
+                 base_delay: float = 5.0, directory: Path = None, batch_quiz_fn=None):
+        """
+        Args:
+            generator: ContentGenerator (generate_supplement 사용)
+            quiz_fn: topic을 받아 퀴즈 dict(실패 시 None)를 반환하는 함수
+            workers: 동시 생성 스레드 수
+            retries: 실패 시 재시도 횟수
+            base_delay: 재시도 대기 시간(초, 지수 증가)
+            directory: 저장 디렉터리 (기본: 저장소/.cache/ai)
+            batch_quiz_fn: 토픽 목록을 받아 {day: 퀴즈}를 반환하는 묶음 생성 함수 (선택)
+        """
+        self.generator = generator
+        self.quiz_fn = quiz_fn
+        self.workers = workers
+        self.retries = retries
+        self.base_delay = base_delay
+        self.directory = Path(directory or AI_CONTENT_DIR)
+        self.batch_quiz_fn = batch_quiz_fn
+        self._prefetched_quizzes = {}
+
+    def _generate_day(self, curriculum: dict, day: int) -> dict:
+        """하루치 AI 콘텐츠 생성 (빠진 항목만 백오프하며 재시도)"""
+        topic_data = get_topic_for_day(curriculum, day)
+        if not topic_data:
+            return {"day": day, "status": "skipped"}
+
+        existing = load_ai_content(curriculum, day, topic_data, self.directory) or {}
+        supplement = existing.get("supplement")
+        quiz = existing.get("quiz")
+        if supplement and quiz:
+            return {"day": day, "status": "cached"}
+
+        topic = topic_data["topic"]
+        quiz = quiz or self._prefetched_quizzes.get(day)
+        for attempt in range(self.retries + 1):
+            if not supplement:
+                supplement = self.generator.generate_supplement(topic)
+            if not quiz:
+                quiz = self.quiz_fn(topic)
+            if supplement and quiz:
+                break
+            if attempt < self.retries:
+                time.sleep(self.base_delay * (2 ** attempt))
+
+        store_ai_content(curriculum, day, topic_data, supplement, quiz, self.directory)
+        status = "generated" if supplement and quiz else ("partial" if supplement or quiz else "failed")
+        return {"day": day, "status": status}
+
+    def _prefetch_quizzes(self, curriculum: dict, days: list):
+        """퀴즈가 없는 일차들을 묶음 요청 한 번으로 먼저 생성"""
+        topics = []
+        for day in days:
+            topic_data = get_topic_for_day(curriculum, day)
+            if not topic_data:
+                continue
+            existing = load_ai_content(curriculum, day, topic_data, self.directory) or {}
+            if not existing.get("quiz"):
+                topics.append(topic_data["topic"])
+        if topics:
+            self._prefetched_quizzes = self.batch_quiz_fn(topics)
+
+    def run(self, curriculum: dict, days: Iterable[int]) -> list:
+        """
+        여러 일차의 AI 콘텐츠를 스레드 풀에서 생성
+
+        Returns:
+            list: 일차별 결과 dict (day, status: generated/partial/failed/cached/skipped)
+        """
+        days = list(days)
+        if self.batch_quiz_fn is not None:
+            self._prefetch_quizzes(curriculum, days)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(lambda day: self._generate_day(curriculum, day), days))
+
+        for r in results:
+            if r["status"] in ("partial", "failed"):
+                print(f"⚠️ Day {r['day']} AI 콘텐츠 생성 {r['status']}")
+        return results
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+렌더링된 학습 메일 HTML의 디스크 캐시
+
+캐시 항목은 (일차, 토픽 내용 해시, 템플릿 버전)으로 식별됩니다.
+토픽 하나가 수정되면 해당 일차의 해시만 바뀌므로 그 날짜만 다시 렌더링됩니다.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Optional
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / ".cache" / "lessons"
+
+
+def topic_digest(curriculum: dict, topic_data: dict, extra: dict = None) -> str:
+    """렌더링 결과에 영향을 주는 데이터(프로그램 정보, 모듈, 토픽, 추가 콘텐츠)의 해시"""
+    module = {k: v for k, v in topic_data["module"].items() if k != "topics"}
+    payload = {"program_info": curriculum["program_info"], "module": module, "topic": topic_data["topic"]}
+    if extra:
+        payload["extra"] = extra
+    payload = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """일차별 렌더링 결과를 파일로 저장하는 캐시"""
+
+    def __init__(self, template_version: str, cache_dir: Path = None):
+        """
+        Args:
+            template_version: 템플릿 버전 (템플릿 변경 시 전체 무효화)
+            cache_dir: 캐시 디렉터리 (기본: 저장소/.cache/lessons)
+        """
+        self.template_version = str(template_version)
+        self.cache_dir = Path(cache_dir or os.environ.get("RENDER_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        self.hits = 0
+        self.misses = 0
+        self._memory = {}  # 일차 → (해시, HTML): 상주 프로세스에서 파일을 다시 읽지 않도록
+
+    def _path(self, day: int, digest: str) -> Path:
+        return self.cache_dir / f"day{day:03d}-{digest[:16]}-t{self.template_version}.html"
+
+    def get(self, day: int, digest: str) -> Optional[str]:
+        """캐시된 HTML 읽기 (메모리 → 파일 순, 없으면 None)"""
+        entry = self._memory.get(day)
+        if entry is not None and entry[0] == digest:
+            return entry[1]
+        try:
+            html = self._path(day, digest).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        self._memory[day] = (digest, html)
+        return html
+
+    def put(self, day: int, digest: str, html: str):
+        """HTML 저장 후 같은 일차·같은 템플릿 변형의 오래된 항목 삭제"""
+        self._memory[day] = (digest, html)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(day, digest)
+
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(html)
+        os.replace(tmp, path)
+
+        # 같은 템플릿 버전의 다른 변형(예: -t9와 -t9-raw)은 HTML_MINIFY 설정에 따라
+        # 번갈아 쓰이므로 남기고, 같은 변형의 이전 해시와 이전 템플릿 버전만 삭제
+        version = self.template_version.split("-", 1)[0]
+        for stale in self.cache_dir.glob(f"day{day:03d}-*.html"):
+            tag = stale.stem.rsplit("-t", 1)[-1]
+            if stale != path and (tag == self.template_version or tag.split("-", 1)[0] != version):
+                stale.unlink(missing_ok=True)
+
+    def render(self, curriculum: dict, day: int, topic_data: dict,
+               render_fn: Callable[[dict, int, dict], str], extra: dict = None) -> str:
+        """
+        캐시에서 HTML을 읽거나, 없으면 render_fn으로 렌더링 후 저장
+
+        Args:
+            curriculum: 커리큘럼 데이터
+            day: 학습 일차
+            topic_data: get_topic_for_day 결과
+            render_fn: (curriculum, day, topic_data)를 받는 렌더링 함수
+            extra: 렌더링에 함께 들어가는 추가 콘텐츠 (캐시 키에 포함)
+
+        Returns:
+            str: 이메일 HTML
+        """
+        if not topic_data:
+            return render_fn(curriculum, day, topic_data)
+
+        digest = topic_digest(curriculum, topic_data, extra)
+        html = self.get(day, digest)
+        if html is not None:
+            self.hits += 1
+            return html
+
+        self.misses += 1
+        html = render_fn(curriculum, day, topic_data)
+        try:
+            self.put(day, digest, html)
+        except OSError as e:
+            print(f"⚠️ 렌더 캐시 저장 실패 (Day {day}): {e}")
+        return html
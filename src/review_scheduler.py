@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+퀴즈 간격 반복(spaced repetition) 스케줄러
+
+수신자마다 (복습 예정일, 일차, 퀴즈 번호, 단계) 항목을 heap으로 유지하고,
+발송할 때 예정일이 지난 항목을 가장 오래된 것부터 k개 꺼내 복습 블록에 넣습니다
+(수신자당 O(k log n)). 발송이 확인된 항목만 다음 단계 간격(1, 3, 7, 14, 30, 60일)으로
+다시 넣고, 실패·보류된 항목은 그대로 되돌려 다음 발송에서 다시 고릅니다.
+마지막 단계까지 복습한 항목은 큐에서 빠집니다.
+
+상태는 .state/reviews.json에 저장하며, 워크플로우가 .state를 실행 간 캐시로 유지합니다.
+"""
+
+import heapq
+import json
+import os
+import tempfile
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from curriculum import get_topic_for_day
+
+DEFAULT_STATE_PATH = Path(__file__).parent.parent / ".state" / "reviews.json"
+
+# 단계별 다음 복습까지의 간격(일)
+REVIEW_INTERVALS = (1, 3, 7, 14, 30, 60)
+
+STATE_VERSION = 1
+
+
+class ReviewScheduler:
+    """수신자별 복습 예정 heap"""
+
+    def __init__(self, path: Path = None, intervals: Tuple[int, ...] = REVIEW_INTERVALS):
+        """
+        Args:
+            path: 상태 파일 경로 (기본: 저장소/.state/reviews.json)
+            intervals: 단계별 복습 간격(일)
+        """
+        self.path = Path(path or DEFAULT_STATE_PATH)
+        self.intervals = tuple(intervals)
+        self._recipients = {}  # email → {"heap": [[due, day, index, stage], ...], "confirmed": 서수 날짜}
+        self._pending = {}     # email → (꺼낸 항목 목록, 오늘 일차, 오늘 퀴즈 수)
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 복습 상태 읽기 실패, 새로 시작합니다: {e}")
+            return
+        if data.get("version") == STATE_VERSION:
+            self._recipients = data.get("recipients", {})
+
+    def select(self, email: str, day: int, quiz_count: int, today: date, k: int) -> List[Tuple[int, int]]:
+        """
+        오늘 복습할 항목을 예정일이 이른 순으로 최대 k개 선택
+
+        선택한 항목은 confirm 또는 release 전까지 큐에서 빠져 있습니다.
+        같은 날 이미 발송이 확인된 수신자에게는 고르지 않습니다.
+
+        Args:
+            email: 수신자
+            day: 오늘 학습 일차 (발송 확인 시 이 일차의 퀴즈를 큐에 추가)
+            quiz_count: 오늘 일차의 퀴즈 수
+            today: 발송일
+            k: 최대 복습 항목 수
+
+        Returns:
+            list: (일차, 퀴즈 번호) 목록
+        """
+        self.release(email)
+        state = self._recipients.get(email)
+        ordinal = today.toordinal()
+        if state is None or state["confirmed"] == ordinal:
+            # 처음 받는 수신자이거나 오늘 메일이 이미 발송된 경우(같은 날 재실행)
+            self._pending[email] = ([], day, quiz_count)
+            return []
+        heap = state["heap"]
+
+        taken, shown = [], []
+        while heap and len(shown) < k and heap[0][0] <= ordinal:
+            entry = heapq.heappop(heap)
+            taken.append(entry)
+            # 같은 일차를 다시 배우는 날(과정 순환)에는 본문 퀴즈가 복습을 대신함
+            if entry[1] != day:
+                shown.append((entry[1], entry[2]))
+        self._pending[email] = (taken, day, quiz_count)
+        return shown
+
+    def confirm(self, email: str, today: date):
+        """발송 확인: 복습한 항목은 다음 단계로, 오늘 일차의 퀴즈는 첫 단계로 예약"""
+        taken, day, quiz_count = self._pending.pop(email, ((), None, 0))
+        state = self._recipients.setdefault(email, {"heap": [], "confirmed": None})
+        heap = state["heap"]
+        ordinal = today.toordinal()
+
+        for _, item_day, index, stage in taken:
+            if stage + 1 < len(self.intervals):
+                heapq.heappush(heap, [ordinal + self.intervals[stage + 1], item_day, index, stage + 1])
+
+        # 같은 날 다시 실행해도 오늘 퀴즈를 중복 예약하지 않음
+        if day is not None and state["confirmed"] != ordinal:
+            scheduled = {(entry[1], entry[2]) for entry in heap}
+            for index in range(quiz_count):
+                if (day, index) not in scheduled:
+                    heapq.heappush(heap, [ordinal + self.intervals[0], day, index, 0])
+        state["confirmed"] = ordinal
+
+    def release(self, email: str):
+        """발송되지 않은 선택 항목을 원래 예정일로 되돌림"""
+        taken, _, _ = self._pending.pop(email, ((), None, 0))
+        if taken:
+            heap = self._recipients[email]["heap"]
+            for entry in taken:
+                heapq.heappush(heap, entry)
+
+    def queued(self, email: str) -> int:
+        """수신자의 복습 대기 항목 수"""
+        state = self._recipients.get(email)
+        return len(state["heap"]) if state else 0
+
+    def save(self):
+        """보류 항목을 되돌린 뒤 상태 저장 (원자적 교체)"""
+        for email in list(self._pending):
+            self.release(email)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": STATE_VERSION, "recipients": self._recipients}, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+
+def resolve_reviews(curriculum: dict, items: List[Tuple[int, int]]) -> List[Dict]:
+    """
+    (일차, 퀴즈 번호) 목록을 문항으로 변환 (커리큘럼에서 사라진 문항은 제외)
+
+    Args:
+        curriculum: 커리큘럼 데이터
+        items: ReviewScheduler.select 결과
+
+    Returns:
+        list: {"day", "q", "a"} 목록
+    """
+    reviews = []
+    for day, index in items:
+        topic_data = get_topic_for_day(curriculum, day)
+        quiz = (topic_data or {}).get("topic", {}).get("quiz") or []
+        if index < len(quiz) and isinstance(quiz[index], dict):
+            q = quiz[index]
+            reviews.append({"day": day, "q": q.get("q", q.get("question", "")), "a": q.get("a", q.get("answer", ""))})
+    return reviews
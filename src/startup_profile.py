@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+콜드 스타트 프로파일 (main.py --profile-startup)
+
+새 인터프리터를 `python -X importtime`으로 띄워 main을 import하고,
+발송 경로의 초기화(명단·커리큘럼 로드, 일차별 그룹화, 렌더링, 첫 메시지 직렬화)를
+SMTP 연결 없이 실행한 뒤 모듈별 import 시간과 단계별 초기화 시간을 보고합니다.
+현재 환경 변수(USE_AI, DELIVERY_MODE, OUTBOX 등)가 그대로 반영됩니다.
+"""
+
+import contextlib
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def _probe():
+    """자식 프로세스: 발송 경로를 네트워크 없이 실행하고 단계별 시간을 JSON으로 출력"""
+    stages = []
+
+    def stage(name, fn):
+        started = time.perf_counter()
+        result = fn()
+        stages.append((name, time.perf_counter() - started))
+        return result
+
+    main = stage("import main", lambda: __import__("main"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        roster = stage("load_roster", main.load_roster) or [
+            {"email": "probe@example.com", "start_date": time.strftime("%Y-%m-%d")}
+        ]
+        curriculum = stage("load_curriculum", main.load_curriculum)
+        groups = stage("group_by_day", lambda: main.group_by_day(roster))
+        messages = stage("build_messages",
+                         lambda: main.build_messages(curriculum, groups, main.get_render_cache()))
+        sender = stage("create_sender", lambda: main.create_sender(
+            os.environ.get("SENDER_EMAIL") or "probe@example.com", ""))
+        stage("build_payload", lambda: sender.build_payload(messages[0]))
+        if os.environ.get("OUTBOX", "true").lower() != "false":
+            stage("import outbox", lambda: __import__("outbox"))
+        if os.environ.get("DELIVERY_MODE", "sync").lower() == "async":
+            stage("import async_delivery", lambda: __import__("async_delivery"))
+    print(json.dumps(stages))
+
+
+def parse_importtime(stderr: str) -> list:
+    """
+    -X importtime 출력 파싱
+
+    Returns:
+        list: (모듈 이름, 자체 시간(초), 누적 시간(초), 중첩 깊이) 목록
+    """
+    rows = []
+    for line in stderr.splitlines():
+        m = _IMPORTTIME.match(line)
+        if m:
+            rows.append((m.group(4), int(m.group(1)) / 1e6, int(m.group(2)) / 1e6, len(m.group(3)) // 2))
+    return rows
+
+
+def profile_startup(top: int = 15) -> int:
+    """콜드 스타트 프로파일 실행 및 보고"""
+    env = dict(os.environ)
+    # 프로파일 중에는 AI 즉시 생성(네트워크 호출)을 하지 않음
+    env.pop("OPENAI_API_KEY", None)
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import startup_profile; startup_profile._probe()"],
+        cwd=SRC_DIR, env=env, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        print(proc.stderr[-2000:])
+        print("❌ 시작 프로파일 실패")
+        return 1
+
+    # 프로파일러 자신(startup_profile)과 그 의존성은 보고에서 제외
+    imports = parse_importtime(proc.stderr)
+    probe_end = next((i for i, r in enumerate(imports) if r[0] == "startup_profile"), -1)
+    imports = imports[probe_end + 1:]
+    stages = json.loads(proc.stdout.strip().splitlines()[-1])
+    local = {path.stem for path in SRC_DIR.glob("*.py")}
+
+    print(f"⏱️ 콜드 스타트 프로파일 (인터프리터 시작 포함 {wall * 1000:.0f}ms)")
+    total = sum(r[2] for r in imports if r[3] == 0)
+    print(f"   전체 import {total * 1000:.1f}ms ({len(imports)}개 모듈)")
+
+    print(f"\n📦 프로젝트 모듈이 직접 import한 외부 모듈 상위 {top}개 (누적)")
+    external = []
+    for i, (name, own, cumulative, depth) in enumerate(imports):
+        # importtime 출력은 자식이 부모보다 먼저 나오므로 다음의 한 단계 얕은 행이 부모
+        parent = next((r[0] for r in imports[i + 1:] if r[3] == depth - 1), None)
+        if parent in local and name not in local:
+            external.append((cumulative, name, parent))
+    for cumulative, name, parent in sorted(external, reverse=True)[:top]:
+        print(f"   {cumulative * 1000:8.1f}ms  {name} ← {parent}")
+
+    print("\n🧩 프로젝트 모듈 (자체 / 누적)")
+    for name, own, cumulative, _ in sorted((r for r in imports if r[0] in local), key=lambda r: -r[2]):
+        print(f"   {own * 1000:7.1f}ms / {cumulative * 1000:7.1f}ms  {name}")
+
+    print("\n🚀 발송 경로 초기화 단계")
+    for name, seconds in stages:
+        print(f"   {seconds * 1000:8.1f}ms  {name}")
+
+    heavy = [name for name in ("openai", "asyncio", "sqlite3", "httpx") if any(r[0] == name for r in imports)]
+    print(f"\n🔎 로드된 무거운 의존성: {', '.join(heavy) if heavy else '없음'}")
+    return 0
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+수신자 진행 상태·발송 기록 저장소 (SQLite, WAL 모드)
+
+실행 간에 다음 정보를 유지합니다.
+- recipients: 수신자, 시작일, 일차 조정(day_offset), 일시 중지 기간, 현재 일차
+- deliveries: 발송 시도마다 실행 키, 일차, 성공 여부, 오류, 메시지 크기
+
+명단 동기화와 현재 일차 갱신, 발송 기록은 수신자마다 트랜잭션을 열지 않고
+chunk_size건씩 한 트랜잭션으로 묶어 씁니다. (active, current_day) 인덱스로
+"N일차 수신자" 조회와 일차별 그룹화를 명단 전체를 훑지 않고 처리합니다.
+"""
+
+import sqlite3
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+DEFAULT_STATE_DB_PATH = Path(__file__).parent.parent / ".state" / "state.sqlite3"
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS recipients ("
+    " email TEXT PRIMARY KEY,"
+    " start_date TEXT NOT NULL,"
+    " day_offset INTEGER NOT NULL DEFAULT 0,"
+    " paused_since TEXT,"
+    " paused_days INTEGER NOT NULL DEFAULT 0,"
+    " current_day INTEGER,"
+    " active INTEGER NOT NULL DEFAULT 1,"
+    " updated_at REAL)",
+    "CREATE INDEX IF NOT EXISTS recipients_day ON recipients (active, current_day, email)",
+    "CREATE TABLE IF NOT EXISTS deliveries ("
+    " id INTEGER PRIMARY KEY,"
+    " run_key TEXT NOT NULL,"
+    " email TEXT NOT NULL,"
+    " day INTEGER,"
+    " success INTEGER NOT NULL,"
+    " temporary INTEGER NOT NULL DEFAULT 0,"
+    " error TEXT,"
+    " size INTEGER,"
+    " sent_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS deliveries_run ON deliveries (run_key, success)",
+    "CREATE INDEX IF NOT EXISTS deliveries_email ON deliveries (email, sent_at)",
+)
+
+
+def course_day(start_date: str, today: date, max_days: int,
+               day_offset: int = 0, paused_days: int = 0) -> int:
+    """
+    시작일·일차 조정·일시 중지 일수를 반영한 현재 학습 일차 (main.get_current_day와 같은 순환 규칙)
+
+    Returns:
+        int: 1 ~ max_days
+    """
+    delta = (today - date.fromisoformat(start_date)).days + 1 + day_offset - paused_days
+    if delta > max_days:
+        return (delta - 1) % max_days + 1
+    return max(delta, 1)
+
+
+class StateStore:
+    """SQLite 기반 수신자 진행 상태·발송 기록 저장소"""
+
+    def __init__(self, path: Path = None, chunk_size: int = 500):
+        """
+        Args:
+            path: SQLite 파일 경로 (기본: 저장소/.state/state.sqlite3)
+            chunk_size: 한 트랜잭션에 묶어 쓸 최대 행 수
+        """
+        self.path = Path(path or DEFAULT_STATE_DB_PATH)
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self._pending_deliveries = []
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+
+    def _write_chunks(self, sql: str, rows: List[tuple]):
+        """rows를 chunk_size건씩 한 트랜잭션으로 기록"""
+        for i in range(0, len(rows), self.chunk_size):
+            with self._conn:
+                self._conn.executemany(sql, rows[i:i + self.chunk_size])
+
+    def sync_roster(self, roster: List[dict], today: date, max_days: int) -> int:
+        """
+        명단을 반영하고 모든 수신자의 현재 일차 갱신
+
+        명단에 없는 수신자는 비활성으로 표시하며 진행 상태는 그대로 둡니다.
+
+        Args:
+            roster: load_roster 결과 ({"email", "start_date"} 목록)
+            today: 기준 날짜
+            max_days: 과정 일수
+
+        Returns:
+            int: 활성 수신자 수
+        """
+        now = time.time()
+        with self._lock:
+            self._write_chunks(
+                "INSERT INTO recipients (email, start_date, active, updated_at) VALUES (?, ?, 1, ?)"
+                " ON CONFLICT(email) DO UPDATE SET start_date = excluded.start_date, active = 1,"
+                " updated_at = excluded.updated_at",
+                [(r["email"], r["start_date"], now) for r in roster],
+            )
+            emails = {r["email"] for r in roster}
+            inactive = [(now, email) for (email,) in
+                        self._conn.execute("SELECT email FROM recipients WHERE active = 1") if email not in emails]
+            self._write_chunks("UPDATE recipients SET active = 0, updated_at = ? WHERE email = ?", inactive)
+
+            rows = self._conn.execute(
+                "SELECT email, start_date, day_offset, paused_since, paused_days FROM recipients WHERE active = 1"
+            ).fetchall()
+            updates = []
+            for email, start_date, day_offset, paused_since, paused_days in rows:
+                if paused_since:
+                    paused_days += (today - date.fromisoformat(paused_since)).days
+                updates.append((course_day(start_date, today, max_days, day_offset, paused_days), email))
+            self._write_chunks("UPDATE recipients SET current_day = ? WHERE email = ?", updates)
+        return len(rows)
+
+    def groups_by_day(self, emails: Optional[Set[str]] = None) -> Dict[int, List[str]]:
+        """
+        일시 중지되지 않은 활성 수신자를 현재 일차별로 묶기 ({day: [email, ...]}, group_by_day와 같은 형식)
+
+        Args:
+            emails: 이 수신자들만 포함 (기본: 전체)
+        """
+        groups = {}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT current_day, email FROM recipients"
+                " WHERE active = 1 AND paused_since IS NULL ORDER BY current_day"
+            ).fetchall()
+        for day, email in rows:
+            if emails is None or email in emails:
+                groups.setdefault(day, []).append(email)
+        return groups
+
+    def recipients_on_day(self, day: int) -> List[str]:
+        """현재 day일차인 활성 수신자 (일시 중지 포함)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT email FROM recipients WHERE active = 1 AND current_day = ? ORDER BY email", (day,)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def pause(self, email: str, today: date) -> bool:
+        """발송 일시 중지 (중지 기간 동안 일차가 진행되지 않음)"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE recipients SET paused_since = ?, updated_at = ? WHERE email = ? AND paused_since IS NULL",
+                (today.isoformat(), time.time(), email),
+            )
+        return cursor.rowcount > 0
+
+    def resume(self, email: str, today: date) -> bool:
+        """일시 중지 해제 (중지했던 일수만큼 일차를 늦춤)"""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT paused_since FROM recipients WHERE email = ?", (email,)).fetchone()
+            if not row or not row[0]:
+                return False
+            paused = (today - date.fromisoformat(row[0])).days
+            self._conn.execute(
+                "UPDATE recipients SET paused_since = NULL, paused_days = paused_days + ?, updated_at = ?"
+                " WHERE email = ?", (paused, time.time(), email),
+            )
+        return True
+
+    def shift(self, email: str, days: int) -> bool:
+        """일차 조정 (양수면 앞으로, 음수면 뒤로)"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE recipients SET day_offset = day_offset + ?, updated_at = ? WHERE email = ?",
+                (days, time.time(), email),
+            )
+        return cursor.rowcount > 0
+
+    def record_delivery(self, run_key: str, result: dict, day: int = None, size: int = None):
+        """
+        발송 시도 1건 기록 (chunk_size건이 모이면 한 트랜잭션으로 기록)
+
+        Args:
+            run_key: 실행 키
+            result: deliver 결과 dict (to_email, success, error, temporary)
+            day: 학습 일차
+            size: 메시지 크기(바이트)
+        """
+        row = (run_key, result["to_email"], day, int(bool(result["success"])),
+               int(bool(result.get("temporary"))), result.get("error"), size, time.time())
+        with self._lock:
+            self._pending_deliveries.append(row)
+            if len(self._pending_deliveries) >= self.chunk_size:
+                self._flush_deliveries()
+
+    def _flush_deliveries(self):
+        rows, self._pending_deliveries = self._pending_deliveries, []
+        self._write_chunks(
+            "INSERT INTO deliveries (run_key, email, day, success, temporary, error, size, sent_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows,
+        )
+
+    def flush(self):
+        """버퍼에 남은 발송 기록 저장"""
+        with self._lock:
+            self._flush_deliveries()
+
+    def delivered_days(self) -> Dict[str, int]:
+        """수신자별로 발송에 성공한 서로 다른 일차 수 (개인 진행률 계산용)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT email, COUNT(DISTINCT day) FROM deliveries WHERE success = 1 GROUP BY email"
+            ).fetchall()
+        return dict(rows)
+
+    def day_counts(self) -> Dict[int, int]:
+        """일차별 활성 수신자 수"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT current_day, COUNT(*) FROM recipients WHERE active = 1 GROUP BY current_day"
+            ).fetchall()
+        return dict(rows)
+
+    def paused(self) -> List[tuple]:
+        """일시 중지된 활성 수신자 (email, 중지 시작일)"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT email, paused_since FROM recipients WHERE active = 1 AND paused_since IS NOT NULL"
+                " ORDER BY paused_since"
+            ).fetchall()
+
+    def last_run_key(self) -> Optional[str]:
+        """가장 최근 발송 기록의 실행 키"""
+        with self._lock:
+            row = self._conn.execute("SELECT run_key FROM deliveries ORDER BY sent_at DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def run_summary(self, run_key: str) -> dict:
+        """
+        실행 한 번의 발송 통계
+
+        Returns:
+            dict: attempts, delivered, failed(최종 실패 수신자 수), avg_size, max_size
+        """
+        with self._lock:
+            attempts, delivered, avg_size, max_size = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT CASE WHEN success THEN email END), AVG(size), MAX(size)"
+                " FROM deliveries WHERE run_key = ?", (run_key,)
+            ).fetchone()
+            failed = self._conn.execute(
+                "SELECT COUNT(DISTINCT email) FROM deliveries WHERE run_key = ? AND success = 0"
+                " AND email NOT IN (SELECT email FROM deliveries WHERE run_key = ? AND success = 1)",
+                (run_key, run_key),
+            ).fetchone()[0]
+        return {"attempts": attempts, "delivered": delivered, "failed": failed,
+                "avg_size": avg_size or 0, "max_size": max_size or 0}
+
+    def failing_recipients(self, since: float, min_failures: int = 2) -> List[tuple]:
+        """since 이후 min_failures회 이상 실패한 수신자 (email, 실패 횟수, 마지막 오류)"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT email, COUNT(*), (SELECT error FROM deliveries d2"
+                "  WHERE d2.email = d.email AND d2.success = 0 ORDER BY sent_at DESC LIMIT 1)"
+                " FROM deliveries d WHERE success = 0 AND sent_at >= ? GROUP BY email HAVING COUNT(*) >= ?"
+                " ORDER BY COUNT(*) DESC", (since, min_failures),
+            ).fetchall()
+
+    def close(self):
+        """남은 기록을 저장하고 WAL을 본 파일에 합친 뒤 닫기 (.state 캐시에 파일 하나만 남도록)"""
+        self.flush()
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.close()
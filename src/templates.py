@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+이메일 HTML 템플릿
+
+페이지 골격과 공용 스타일시트는 프로세스당 한 번만 컴파일하고,
+렌더링 시에는 섹션 조각(용어, 공식, 팁, 퀴즈, 진행률 등)만 채워 넣습니다.
+학습 메일(main.create_email_content), 모아보기 메일(main.render_days),
+AI 생성 메일(ContentGenerator)이 함께 사용합니다.
+"""
+
+import re
+
+# 학습 메일과 AI 메일이 공유하는 스타일시트
+STYLESHEET = """
+body { font-family: 'Malgun Gothic', 'Apple SD Gothic Neo', sans-serif; line-height: 1.9; color: #333; max-width: 900px; margin: 0 auto; padding: 15px; background: #f0f4f8; }
+.container { background: white; padding: 25px; border-radius: 12px; box-shadow: 0 4px 20px rgba(0,0,0,0.1); }
+.header { background: linear-gradient(135deg, #0d47a1 0%, #1976d2 100%); color: white; padding: 30px; border-radius: 12px; margin-bottom: 25px; }
+.header h1 { margin: 0 0 10px 0; font-size: 26px; }
+.header .greeting { margin: 0 0 8px 0; font-size: 15px; opacity: 0.95; }
+.header .meta { opacity: 0.9; font-size: 15px; }
+.level-badge { display: inline-block; background: rgba(255,255,255,0.25); padding: 6px 16px; border-radius: 20px; margin-top: 12px; font-size: 13px; }
+.ai-badge { display: inline-block; background: #007bff; color: white; padding: 3px 10px; border-radius: 3px; font-size: 12px; margin-top: 12px; }
+.module-info { background: #e3f2fd; padding: 18px; border-radius: 10px; margin-bottom: 25px; border-left: 5px solid #1976d2; font-size: 15px; }
+.section { margin-bottom: 30px; padding: 20px; background: #fafafa; border-radius: 10px; }
+.section h2 { color: #0d47a1; font-size: 20px; margin: 0 0 18px 0; padding-bottom: 12px; border-bottom: 2px solid #1976d2; }
+.section h3 { color: #1565c0; font-size: 17px; margin: 20px 0 12px 0; }
+.section h4 { color: #1976d2; font-size: 15px; margin: 15px 0 10px 0; }
+.objective { font-size: 16px; color: #424242; }
+.key-points { background: #fff; padding: 18px 22px; border-radius: 8px; border: 1px solid #e0e0e0; }
+.key-points ul { margin: 0; padding-left: 22px; }
+.key-points li { margin-bottom: 10px; }
+.terms { display: grid; gap: 12px; }
+.term { background: #fff8e1; padding: 14px 18px; border-radius: 8px; border-left: 4px solid #ffc107; }
+.term strong { color: #f57c00; }
+.formula { background: #e8f5e9; padding: 18px; border-radius: 8px; font-family: 'Consolas', 'Monaco', monospace; white-space: pre-wrap; border-left: 4px solid #4caf50; font-size: 14px; overflow-x: auto; }
+.tip { background: #e1f5fe; padding: 18px; border-radius: 8px; border-left: 4px solid #03a9f4; }
+.detailed-content { background: #fff; padding: 20px; border-radius: 8px; border: 1px solid #e0e0e0; }
+.detailed-content h3 { color: #1565c0; border-bottom: 1px solid #e0e0e0; padding-bottom: 8px; }
+.detailed-content h4 { color: #1976d2; }
+.detailed-content pre { background: #263238; color: #aed581; padding: 15px; border-radius: 6px; overflow-x: auto; }
+.exercises-content { background: #fff3e0; padding: 20px; border-radius: 8px; }
+.quiz-item { background: #fff; padding: 15px; border-radius: 8px; margin-bottom: 12px; border: 1px solid #e0e0e0; }
+.ai-supplement { background: #f3e5f5; padding: 18px; border-radius: 8px; border-left: 4px solid #8e24aa; margin-bottom: 12px; }
+.related { margin: 0; padding-left: 22px; }
+.related li { margin-bottom: 8px; }
+.related-terms { color: #757575; font-size: 13px; }
+.review { margin: 0 0 8px 0; padding-left: 22px; }
+.review li { margin-bottom: 8px; }
+.review-day { display: inline-block; background: #e3f2fd; color: #0d47a1; padding: 1px 8px; border-radius: 10px; font-size: 12px; margin-right: 6px; }
+.quiz-answer { color: #2e7d32; font-weight: 500; margin-top: 8px; }
+.code-block { background: #263238; color: #aed581; padding: 12px; border-radius: 6px; display: block; margin: 10px 0; }
+code { background: #eceff1; padding: 2px 6px; border-radius: 4px; font-size: 13px; }
+.digest-intro { background: #e3f2fd; padding: 20px 25px; border-radius: 12px; margin-bottom: 25px; }
+.digest-intro h1 { color: #0d47a1; font-size: 24px; margin: 0 0 8px 0; }
+.digest-toc { margin: 12px 0 0 0; padding-left: 22px; }
+.digest-lesson { padding-bottom: 30px; margin-bottom: 30px; border-bottom: 3px dashed #90caf9; }
+.progress { margin-top: 25px; }
+.progress-bar { background: #e0e0e0; border-radius: 10px; height: 24px; overflow: hidden; }
+.progress-fill { background: linear-gradient(90deg, #4caf50, #8bc34a); height: 100%; display: flex; align-items: center; justify-content: center; color: white; font-size: 12px; font-weight: bold; }
+.footer { margin-top: 30px; padding-top: 20px; border-top: 1px solid #e0e0e0; text-align: center; color: #757575; font-size: 13px; }
+table { width: 100%; border-collapse: collapse; margin: 15px 0; }
+th, td { border: 1px solid #e0e0e0; padding: 10px; text-align: left; }
+th { background: #f5f5f5; }
+""".strip()
+
+_PLACEHOLDER = re.compile(r"\{\{(\w+(?::[^{}]*)?)\}\}")
+
+
+class PageTemplate:
+    """{{name}} 또는 {{name:형식}} 자리표시자를 가진 HTML 골격
+
+    생성 시 골격을 키워드 인자를 받는 f-string 함수로 한 번만 컴파일합니다.
+    고정 텍스트(스타일시트 포함)는 상수로 묶이므로 render는
+    자리표시자 값만 끼워 넣어 문자열 하나를 만듭니다.
+    """
+
+    def __init__(self, source: str, **static):
+        """
+        Args:
+            source: {{name}} 자리표시자를 포함한 HTML
+            **static: 컴파일 시점에 한 번만 채울 값 (예: 스타일시트)
+        """
+        parts = _PLACEHOLDER.split(source)
+        # split 결과: [고정, 이름, 고정, 이름, ..., 고정]
+        namespace = {}
+        pieces = []
+        self.fields = []
+        for i, part in enumerate(parts):
+            if i % 2 == 1 and part not in static:
+                field = part.split(":", 1)[0]
+                if field not in self.fields:
+                    self.fields.append(field)
+                pieces.append("{" + part + "}")
+                continue
+            text = static[part] if i % 2 == 1 else part
+            if text:
+                name = f"_s{len(namespace)}"
+                namespace[name] = str(text)
+                pieces.append("{" + name + "}")
+
+        params = ", ".join(f"{field}=''" for field in self.fields)
+        code = f"def render(*, {params}):\n    return f'{''.join(pieces)}'\n" if params \
+            else f"def render():\n    return f'{''.join(pieces)}'\n"
+        exec(compile(code, "<PageTemplate>", "exec"), namespace)
+        # render(**values): 자리표시자를 채운 HTML 반환 (빠진 값은 빈 문자열)
+        self.render = namespace["render"]
+
+
+_DOCUMENT = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>{{title}}</title>
+<style>
+{{stylesheet}}
+</style>
+</head>
+<body>
+<div class="container">
+{{content}}
+<div class="progress"><p><strong>전체 진행률</strong> (Day {{day}}/{{max_days}})</p><div class="progress-bar"><div class="progress-fill" style="width: {{percent:.1f}}%;">{{percent:.1f}}%</div></div></div>
+<div class="footer"><p><strong>{{program_title}}</strong></p><p>{{footer_note}}</p></div>
+</div>
+</body>
+</html>"""
+
+
+def compile_page(content: str) -> PageTemplate:
+    """공용 문서 골격·스타일시트에 본문 마크업을 넣어 템플릿 컴파일"""
+    return PageTemplate(_DOCUMENT.replace("{{content}}", content), stylesheet=STYLESHEET)
+
+
+# 학습 메일 본문: 고정 섹션은 골격에 포함, 선택 섹션은 {{sections}} 조각으로 채움
+_LESSON_CONTENT = """<div class="header">{{greeting}}<h1>{{topic_title}}</h1><div class="meta">Day {{day}} / {{max_days}} | 3개월 전문가 속성 과정</div><span class="level-badge">📚 {{level}}</span></div>
+<div class="module-info"><strong>모듈 {{module_id}}:</strong> {{module_title}} ({{module_days}}일)</div>
+<div class="section"><h2>🎯 오늘의 학습 목표</h2><p class="objective">{{objective}}</p></div>
+<div class="section"><h2>📌 핵심 포인트</h2><div class="key-points"><ul>{{key_points}}</ul></div></div>
+{{sections}}"""
+
+# 학습 메일 (main.create_email_content)
+LESSON_PAGE = compile_page(_LESSON_CONTENT)
+
+# 모아보기 메일에 들어가는 일차별 본문 조각 (문서 골격 없음)
+LESSON_BODY = PageTemplate(_LESSON_CONTENT)
+
+# 밀린 학습 모아보기 메일 (main.render_days): 공용 머리말·목차 뒤에 일차별 본문을 이어 붙임
+DIGEST_PAGE = compile_page("""<div class="digest-intro"><h1>📬 밀린 학습 모아보기</h1><p>Day {{start_day}} ~ Day {{end_day}} ({{count}}일)</p><ol class="digest-toc">{{toc}}</ol></div>
+{{lessons}}""")
+
+# AI 생성 메일 (ContentGenerator.generate_daily_content)
+AI_PAGE = compile_page("""<div class="header"><h1>Day {{day}} - {{module_title}}</h1><span class="ai-badge">AI Generated Content</span></div>
+<div class="section">{{ai_content}}</div>""")
+
+
+def section(title: str, inner: str, css_class: str = "section") -> str:
+    """제목(h2)이 있는 섹션 조각"""
+    return f'<div class="{css_class}"><h2>{title}</h2>{inner}</div>'
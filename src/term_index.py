@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+커리큘럼 용어 역색인 (용어 → 일차)
+
+각 토픽의 제목, technical_terms, key_points, formula 텍스트를 토큰으로 나눠
+토큰 → 일차 posting 목록을 만들고, 커리큘럼 전체의 technical_terms 이름(SDI, NDP,
+SEC, 역세척 등)을 어휘로 삼아 용어별 등장 일차를 미리 계산합니다.
+학습 메일의 "관련 이전 학습" 섹션은 오늘 일차의 용어마다 dict 조회 한 번으로
+이전 일차를 찾습니다.
+
+토큰화는 한국어를 고려해 영문·숫자 단어는 그대로(소문자), 한글은 띄어쓰기와
+조사 결합에 관계없이 찾을 수 있도록 글자 unigram과 bigram으로 나눕니다.
+커리큘럼이 바뀌면 일차별 내용 해시를 비교해 바뀐 일차의 posting과
+그 일차가 관련된 용어만 다시 계산합니다.
+"""
+
+import bisect
+import hashlib
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+
+_HANGUL_RUN = re.compile(r"[가-힣]+")
+_WORD = re.compile(r"[^\W_가-힣]+")
+_SPACES = re.compile(r"\s+")
+
+# 색인하는 토픽 필드
+INDEXED_FIELDS = ("title", "technical_terms", "key_points", "formula")
+
+
+def tokenize(text: str, query: bool = False) -> set:
+    """
+    한국어 n-gram 토큰화
+
+    Args:
+        text: 원문
+        query: True면 용어 검색용 (두 글자 이상 한글은 bigram만 사용)
+
+    Returns:
+        set: 영문·숫자 단어(소문자)와 한글 unigram/bigram
+    """
+    text = text.casefold()
+    tokens = set(_WORD.findall(text))
+    for run in _HANGUL_RUN.findall(text):
+        bigrams = {run[i:i + 2] for i in range(len(run) - 1)}
+        if query and bigrams:
+            tokens |= bigrams
+        else:
+            tokens.update(run)
+            tokens |= bigrams
+    return tokens
+
+
+def _compact(text: str) -> str:
+    """부분 문자열 확인용 정규화 (소문자, 공백 제거)"""
+    return _SPACES.sub("", text.casefold())
+
+
+def _topic_text(topic: dict) -> str:
+    terms = topic.get("technical_terms") or {}
+    parts = [topic.get("title", ""), *terms.keys(), *map(str, terms.values()),
+             *map(str, topic.get("key_points") or []), topic.get("formula") or ""]
+    return "\n".join(parts)
+
+
+def _topic_digest(topic: dict) -> str:
+    payload = json.dumps({k: topic.get(k) for k in INDEXED_FIELDS}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _invert(term_days: dict) -> dict:
+    """용어 → 일차 표를 일차 → 용어(이름순) 표로 변환"""
+    day_terms = {}
+    for term in sorted(term_days, key=str.casefold):
+        for day in term_days[term]:
+            day_terms.setdefault(day, []).append(term)
+    return {day: tuple(terms) for day, terms in day_terms.items()}
+
+
+class TermIndex:
+    """용어 → 등장 일차 역색인 (Curriculum 스냅샷에 함께 저장)"""
+
+    def __init__(self):
+        self.term_days = {}   # 용어 → 등장 일차 (오름차순 tuple)
+        self.day_terms = {}   # 일차 → 그 일차에 등장하는 용어 tuple
+        self.titles = {}      # 일차 → 토픽 제목
+        self._postings = {}   # 토큰 → 일차 set
+        self._day_tokens = {}  # 일차 → 토큰 frozenset
+        self._day_text = {}   # 일차 → 정규화된 본문
+        self._digests = {}    # 일차 → 색인 필드 해시
+        self._defined = {}    # 일차 → 그 일차 technical_terms의 용어 이름
+        self._related = {}    # (일차, limit) → related 결과 (update 시 비움)
+
+    def update(self, topics: Dict[int, dict]) -> int:
+        """
+        바뀐 일차만 다시 색인
+
+        Args:
+            topics: {일차: 토픽}
+
+        Returns:
+            int: 추가·변경·삭제된 일차 수
+        """
+        removed = set(self._digests) - set(topics)
+        changed = {day for day, topic in topics.items() if self._digests.get(day) != _topic_digest(topic)}
+        if not removed and not changed:
+            return 0
+
+        for day in removed | changed:
+            self._remove_day(day)
+        for day in changed:
+            self._add_day(day, topics[day])
+
+        old_vocabulary = set(self.term_days)
+        vocabulary = self._vocabulary()
+        touched = removed | changed
+        affected = set(vocabulary) - old_vocabulary
+        affected.update(term for term in old_vocabulary & set(vocabulary)
+                        if touched.intersection(self.term_days[term])
+                        or any(self._matches(term, day) for day in changed))
+
+        for term in old_vocabulary - set(vocabulary):
+            del self.term_days[term]
+        for term in affected:
+            self.term_days[term] = self._find(term)
+
+        self.day_terms = _invert(self.term_days)
+        self._related = {}
+        return len(touched)
+
+    def _add_day(self, day: int, topic: dict):
+        text = _topic_text(topic)
+        tokens = frozenset(tokenize(text))
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(day)
+        self._day_tokens[day] = tokens
+        self._day_text[day] = _compact(text)
+        self._digests[day] = _topic_digest(topic)
+        self._defined[day] = list((topic.get("technical_terms") or {}).keys())
+        self.titles[day] = topic.get("title", "")
+
+    def _remove_day(self, day: int):
+        for token in self._day_tokens.pop(day, ()):
+            days = self._postings.get(token)
+            if days is not None:
+                days.discard(day)
+                if not days:
+                    del self._postings[token]
+        for table in (self._day_text, self._digests, self._defined, self.titles):
+            table.pop(day, None)
+
+    def _vocabulary(self) -> List[str]:
+        """전체 technical_terms 이름 (대소문자·공백만 다른 이름은 먼저 나온 일차의 표기로 통일)"""
+        seen = {}
+        for day in sorted(self._defined):
+            for term in self._defined[day]:
+                if _compact(term):
+                    seen.setdefault(_compact(term), term)
+        return list(seen.values())
+
+    def _matches(self, term: str, day: int) -> bool:
+        tokens = self._day_tokens.get(day, ())
+        return (all(token in tokens for token in tokenize(term, query=True))
+                and _compact(term) in self._day_text[day])
+
+    def _find(self, term: str) -> Tuple[int, ...]:
+        """posting 교집합으로 후보 일차를 좁힌 뒤 원문에서 확인"""
+        postings = sorted((self._postings.get(token, set()) for token in tokenize(term, query=True)), key=len)
+        if not postings:
+            return ()
+        candidates = set(postings[0]).intersection(*postings[1:])
+        needle = _compact(term)
+        return tuple(sorted(day for day in candidates if needle in self._day_text[day]))
+
+    def related(self, day: int, limit: int = 5) -> List[Tuple[int, str, List[str]]]:
+        """
+        같은 용어를 다룬 이전 일차
+
+        Args:
+            day: 기준 일차
+            limit: 최대 개수
+
+        Returns:
+            list: (일차, 제목, 공통 용어 목록) — 공통 용어가 많은 순, 같으면 가까운 일차 순
+                (용어마다 가장 가까운 이전 일차 limit개 중에서 고름)
+        """
+        cached = self._related.get((day, limit))
+        if cached is not None:
+            return cached
+
+        shared = {}
+        for term in self.day_terms.get(day, ()):
+            # 용어마다 가장 가까운 이전 일차 limit개만 보므로 용어당 비용은 일정
+            days = self.term_days[term]
+            end = bisect.bisect_left(days, day)
+            for earlier in days[max(0, end - limit):end]:
+                shared.setdefault(earlier, []).append(term)
+        ranked = sorted(shared.items(), key=lambda item: (-len(item[1]), -item[0]))[:limit]
+        result = self._related[day, limit] = [(d, self.titles.get(d, ""), terms) for d, terms in ranked]
+        return result
+
+    def to_manifest(self) -> dict:
+        """샤드 manifest에 넣을 조회용 색인 (posting 제외)"""
+        return {"terms": {term: list(days) for term, days in self.term_days.items()},
+                "titles": {str(day): title for day, title in self.titles.items()}}
+
+    @classmethod
+    def from_manifest(cls, data: Optional[dict]) -> "TermIndex":
+        """to_manifest 결과로 조회 전용 색인 생성"""
+        index = cls()
+        data = data or {}
+        index.titles = {int(day): title for day, title in data.get("titles", {}).items()}
+        index.term_days = {term: tuple(days) for term, days in data.get("terms", {}).items()}
+        index.day_terms = _invert(index.term_days)
+        return index
+
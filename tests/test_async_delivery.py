@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+비동기 발송 엔진 재사용 테스트
+
+main.get_delivery_engine은 엔진을 프로세스 안에서 재사용하므로 run(asyncio.run)이
+여러 번 불려도 쿼터·토큰 버킷이 동작해야 합니다.
+
+    python -m unittest discover tests
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from async_delivery import AsyncDeliveryEngine, TokenBucket  # noqa: E402
+from email_sender import EmailSender  # noqa: E402
+from smtp_sink import SMTPSink  # noqa: E402
+
+
+def make_messages(count: int, prefix: str) -> list:
+    return [{"to_email": f"{prefix}{i}@example.com", "subject": "test", "html_content": "<p>test</p>"}
+            for i in range(count)]
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_acquire_in_two_event_loops(self):
+        bucket = TokenBucket(50, 1)
+
+        async def acquire_all():
+            await asyncio.gather(*(bucket.acquire() for _ in range(5)))
+
+        asyncio.run(acquire_all())
+        asyncio.run(acquire_all())
+
+
+class AsyncDeliveryEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.sink = SMTPSink().start()
+        self.sender = EmailSender("test@example.com", "password", "127.0.0.1", self.sink.port, starttls=False)
+
+    def tearDown(self):
+        self.sink.stop()
+
+    def test_run_twice_keeps_rate_and_daily_quota(self):
+        engine = AsyncDeliveryEngine(self.sender, concurrency=3, per_minute=60, per_day=6)
+        # 용량 1의 빠른 버킷으로 교체해 run마다 잠금 경합이 생기게 함
+        engine.limiter._minute = TokenBucket(50, 1)
+
+        first = engine.run(make_messages(4, "a"))
+        second = engine.run(make_messages(4, "b"))
+
+        self.assertTrue(all(r["success"] for r in first))
+        self.assertEqual([r["success"] for r in second].count(True), 2)
+        self.assertTrue(all(r.get("quota") for r in second if not r["success"]))
+        self.assertEqual(engine.limiter.sent_today, 6)
+        self.assertEqual(engine.limiter._reserved, 0)
+        self.assertEqual(self.sink.stats.get("messages"), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()